@@ -0,0 +1,281 @@
+"""
+폴더의 촬영본을 GUI 없이 나이 변환 → 포즈 파이프라인으로 일괄 처리.
+부하 테스트, 프롬프트 변경 후 재처리, 보관된 촬영본 재생성용.
+
+    python batch_run.py captures/ --out batch_out --mode both --concurrency 3
+    # 로컬 대역으로: REPLICATE_BASE_URL=http://127.0.0.1:8798 REPLICATE_API_TOKEN=x python batch_run.py ...
+
+출력 (항목 = <파일명>__<모드>):
+    batch_out/<항목>/aged.<ext>, pose_<i>.<ext>, result.json (단계별 시간/오류)
+    batch_out/timings.jsonl  (항목이 끝날 때마다 한 줄)
+이미 끝난 항목은 건너뛰고, 중간에 끊긴 항목은 남은 단계(나이 변환/빠진 포즈)만 이어서 실행.
+"""
+
+import os, sys, glob, json, time, hashlib, argparse, threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from replicate_tasks import POSE_PROMPTS, run_age, run_pose
+from session_store import guess_ext
+from setting import write_bytes_atomic
+from tracing import percentile, tracer
+
+IMAGE_PATTERNS = ("*.png", "*.jpg", "*.jpeg")
+
+
+def _find(item_dir: str, stem: str):
+    hits = glob.glob(os.path.join(item_dir, stem + ".*"))
+    hits = [h for h in hits if not h.endswith(".tmp")]
+    return hits[0] if hits else None
+
+
+def _to_png(data: bytes) -> bytes:
+    """run_age 는 PNG data URI 로 보내므로 JPEG 입력은 PNG로 바꿔서"""
+    if guess_ext(data) == "png":
+        return data
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+    from PyQt5.QtGui import QImage
+
+    img = QImage.fromData(data)
+    if img.isNull():
+        raise ValueError("이미지를 읽을 수 없습니다")
+    ba = QByteArray()
+    buf = QBuffer(ba)
+    buf.open(QIODevice.WriteOnly)
+    img.save(buf, "PNG")
+    buf.close()
+    return bytes(ba)
+
+
+class BatchItem:
+    """입력 파일 1개 × 모드 1개"""
+
+    def __init__(self, src: str, mode: str, out_dir: str, prompts):
+        self.src = src
+        self.mode = mode
+        self.name = f"{os.path.splitext(os.path.basename(src))[0]}__{mode}"
+        self.dir = os.path.join(out_dir, self.name)
+        self.prompts = prompts
+        self.result_path = os.path.join(self.dir, "result.json")
+        self.result = {}
+        self.capture = None
+        self.aged = None  # bytes (재시작 시 디스크에서)
+        self.poses_left = 0
+        self.lock = threading.Lock()
+        self.t0 = None
+
+    def load(self) -> bool:
+        """처리할 게 남았으면 True. 입력이 바뀌었으면 처음부터."""
+        with open(self.src, "rb") as f:
+            raw = f.read()
+        sha = hashlib.sha256(raw).hexdigest()
+        os.makedirs(self.dir, exist_ok=True)
+        try:
+            with open(self.result_path, "r", encoding="utf-8") as f:
+                self.result = json.load(f)
+        except (OSError, ValueError):
+            self.result = {}
+        prompts_sha = hashlib.sha256("\n".join(self.prompts).encode("utf-8")).hexdigest()[:16]
+        if self.result.get("source_sha") != sha or self.result.get("prompts_sha") != prompts_sha:
+            # 입력이나 프롬프트가 바뀌면 처음부터 (이전 결과 파일은 덮어씀)
+            for old in glob.glob(os.path.join(self.dir, "pose_*")) + glob.glob(os.path.join(self.dir, "aged.*")):
+                os.remove(old)
+            self.result = {"source": self.src, "source_sha": sha, "mode": self.mode, "prompts_sha": prompts_sha}
+        if self.result.get("status") == "done":
+            return False
+        self.result.pop("errors", None)  # 이번 실행의 오류만 남김
+        self.capture = raw
+        aged_path = _find(self.dir, "aged")
+        if aged_path and "age_s" in self.result:
+            with open(aged_path, "rb") as f:
+                self.aged = f.read()
+        return True
+
+    def missing_poses(self):
+        return [i for i in range(len(self.prompts)) if not _find(self.dir, f"pose_{i}")]
+
+    def save(self):
+        write_bytes_atomic(self.result_path, json.dumps(self.result, ensure_ascii=False, indent=1).encode("utf-8"))
+
+
+class BatchRunner:
+    """
+    API 호출 단위 작업을 스레드 풀 하나(= 동시성)에서 실행.
+    입력은 생성기로 조금씩 읽어서 진행 중 항목 수를 제한 (폴더가 커도 메모리 일정).
+    """
+
+    def __init__(self, out_dir: str, concurrency: int = 3, prompts=None, seed: int = 42):
+        self.out_dir = os.path.abspath(out_dir)
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.concurrency = max(1, concurrency)
+        self.prompts = list(prompts or POSE_PROMPTS)
+        self.seed = seed
+        self.pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        self.slots = threading.BoundedSemaphore(self.concurrency * 2)  # 진행 중 항목 수 한도
+        self.timings_path = os.path.join(self.out_dir, "timings.jsonl")
+        self._log_lock = threading.Lock()
+        self.done = []  # 완료 항목 총 시간
+        self.failed = 0
+        self.skipped = 0
+        self._idle = threading.Condition()
+        self._active = 0
+
+    def run(self, items):
+        try:
+            for item in items:
+                try:
+                    todo = item.load()
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ {item.src}: {e}")
+                    self.failed += 1
+                    continue
+                if not todo:
+                    self.skipped += 1
+                    continue
+                self.slots.acquire()
+                with self._idle:
+                    self._active += 1
+                item.t0 = time.monotonic()
+                if item.aged is None:
+                    self.pool.submit(self._age, item)
+                else:
+                    self._start_poses(item)
+            with self._idle:
+                self._idle.wait_for(lambda: self._active == 0)
+        except KeyboardInterrupt:
+            print("\n중단 — 진행 중인 호출은 버리고, 끝난 단계는 저장돼 있어 다시 실행하면 이어서 처리합니다.")
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        self.pool.shutdown()
+
+    # --- 단계 ---
+    def _age(self, item: BatchItem):
+        t = time.monotonic()
+        try:
+            with tracer.bind(item.name):
+                url = run_age(_to_png(item.capture), item.mode, self.seed)
+            r = requests.get(url, timeout=(5, 120))
+            r.raise_for_status()
+            item.aged = r.content
+            write_bytes_atomic(os.path.join(item.dir, "aged." + guess_ext(item.aged)), item.aged)
+        except Exception as e:
+            item.result.setdefault("errors", []).append(f"[age] {e}")
+            self._finish(item, "failed")
+            return
+        item.result["age_s"] = round(time.monotonic() - t, 3)
+        item.save()
+        self._start_poses(item)
+
+    def _start_poses(self, item: BatchItem):
+        missing = item.missing_poses()
+        if not missing:
+            self._finish(item, "done")
+            return
+        item.poses_left = len(missing)
+        for i in missing:
+            self.pool.submit(self._pose, item, i)
+
+    def _pose(self, item: BatchItem, index: int):
+        t = time.monotonic()
+        try:
+            with tracer.bind(item.name, index=index):
+                data = run_pose([item.aged, item.capture], item.prompts[index], self.seed)
+            write_bytes_atomic(os.path.join(item.dir, f"pose_{index}.{guess_ext(data)}"), data)
+            with item.lock:
+                item.result.setdefault("pose_s", {})[str(index)] = round(time.monotonic() - t, 3)
+        except Exception as e:
+            with item.lock:
+                item.result.setdefault("errors", []).append(f"[pose {index}] {e}")
+        with item.lock:
+            item.poses_left -= 1
+            last = item.poses_left == 0
+            if not last:
+                item.save()
+        if last:
+            self._finish(item, "done" if not item.missing_poses() else "partial")
+
+    def _finish(self, item: BatchItem, status: str):
+        item.result["status"] = status
+        item.result["run_s"] = round(time.monotonic() - item.t0, 3)
+        item.save()
+        line = {
+            "item": item.name,
+            "status": status,
+            "run_s": item.result["run_s"],
+            "age_s": item.result.get("age_s"),
+            "pose_s": item.result.get("pose_s", {}),
+            "t": time.time(),
+        }
+        with self._log_lock:
+            with open(self.timings_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            if status == "done":
+                self.done.append(item.result["run_s"])
+            else:
+                self.failed += 1
+        print(f"{'✅' if status == 'done' else '⚠️'} {item.name} {status} {item.result['run_s']:.1f}s")
+        self.slots.release()
+        with self._idle:
+            self._active -= 1
+            self._idle.notify_all()
+
+    def summary(self) -> dict:
+        return {
+            "done": len(self.done),
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "p50_s": round(percentile(self.done, 0.5), 3),
+            "p95_s": round(percentile(self.done, 0.95), 3),
+        }
+
+
+def iter_items(in_dir: str, modes, out_dir: str, prompts, limit: int = 0):
+    n = 0
+    for path in sorted(
+        p for pat in IMAGE_PATTERNS for p in glob.glob(os.path.join(in_dir, pat))
+    ):
+        for mode in modes:
+            yield BatchItem(path, mode, out_dir, prompts)
+            n += 1
+            if limit and n >= limit:
+                return
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="촬영본 폴더 일괄 AI 처리 (나이 변환 → 포즈)")
+    ap.add_argument("input", help="촬영본 폴더 (png/jpg)")
+    ap.add_argument("--out", default="batch_out")
+    ap.add_argument("--mode", choices=("past", "future", "both"), default="past")
+    ap.add_argument("--concurrency", type=int, default=3, help="동시에 돌리는 Replicate 호출 수")
+    ap.add_argument("--prompts", help="포즈 프롬프트 파일 (한 줄에 하나, 기본: replicate_tasks.POSE_PROMPTS)")
+    ap.add_argument("--limit", type=int, default=0, help="앞에서부터 N개 항목만")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args(argv)
+
+    if not os.environ.get("REPLICATE_API_TOKEN"):
+        from setting import FileController
+
+        token = FileController().load_json().get("REPLICATE_API_TOKEN", "")
+        if token:
+            os.environ["REPLICATE_API_TOKEN"] = token
+
+    prompts = None
+    if args.prompts:
+        with open(args.prompts, "r", encoding="utf-8") as f:
+            prompts = [line.strip() for line in f if line.strip()]
+
+    modes = ("past", "future") if args.mode == "both" else (args.mode,)
+    runner = BatchRunner(args.out, args.concurrency, prompts, args.seed)
+    t = time.monotonic()
+    try:
+        runner.run(iter_items(args.input, modes, runner.out_dir, runner.prompts, args.limit))
+    except KeyboardInterrupt:
+        return 130
+    s = runner.summary()
+    s["wall_s"] = round(time.monotonic() - t, 3)
+    print(json.dumps(s, ensure_ascii=False))
+    return 0 if not s["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
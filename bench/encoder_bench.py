@@ -0,0 +1,106 @@
+"""
+업로드 인코더 벤치마크.
+샘플 합성 이미지마다 목표 크기/포맷별로 bytes, 인코딩 시간, SSIM을 출력.
+
+    python bench/encoder_bench.py [이미지 ...] [--targets 200,400,800] [--json out.json]
+"""
+
+import os, sys, glob, json, time, argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QGuiApplication, QImage
+from upload_encoder import AdaptiveEncoder
+
+_APP = None  # 이미지 플러그인 로드용 QGuiApplication (main 에서 생성, 끝까지 유지)
+
+
+def to_gray(img: QImage) -> np.ndarray:
+    g = img.convertToFormat(QImage.Format_Grayscale8)
+    ptr = g.constBits()
+    ptr.setsize(g.sizeInBytes())
+    arr = np.frombuffer(ptr, np.uint8).reshape(g.height(), g.bytesPerLine())
+    return arr[:, : g.width()].astype(np.float64)
+
+
+def _box_mean(x: np.ndarray, k: int) -> np.ndarray:
+    """k×k 균일 창 평균 (적분 영상, valid 영역)"""
+    c = np.cumsum(np.cumsum(np.pad(x, ((1, 0), (1, 0))), axis=0), axis=1)
+    return (c[k:, k:] - c[:-k, k:] - c[k:, :-k] + c[:-k, :-k]) / (k * k)
+
+
+def ssim(a: np.ndarray, b: np.ndarray, k: int = 8) -> float:
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mu_a, mu_b = _box_mean(a, k), _box_mean(b, k)
+    var_a = _box_mean(a * a, k) - mu_a**2
+    var_b = _box_mean(b * b, k) - mu_b**2
+    cov = _box_mean(a * b, k) - mu_a * mu_b
+    s = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / (
+        (mu_a**2 + mu_b**2 + c1) * (var_a + var_b + c2)
+    )
+    return float(s.mean())
+
+
+def downscale(img: QImage, max_side: int = 1080) -> QImage:
+    if max(img.width(), img.height()) <= max_side:
+        return img
+    return img.scaled(max_side, max_side, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ap = argparse.ArgumentParser()
+    ap.add_argument("images", nargs="*")
+    ap.add_argument("--targets", default="200,400,800", help="목표 크기(KB), 쉼표 구분")
+    ap.add_argument("--max-side", type=int, default=1080)
+    ap.add_argument("--json", default="")
+    args = ap.parse_args()
+
+    global _APP
+    _APP = QGuiApplication.instance() or QGuiApplication(sys.argv)
+
+    paths = args.images or sorted(glob.glob(os.path.join(root, "img", "*.png")))
+    targets = [int(t) * 1024 for t in args.targets.split(",") if t.strip()]
+
+    rows = []
+    print(f"{'image':<22}{'target':>8}{'fmt':>6}{'q':>4}{'bytes':>10}{'ms':>9}{'ssim':>8}")
+    for path in paths:
+        src = QImage(path)
+        if src.isNull():
+            continue
+        img = downscale(src, args.max_side).convertToFormat(QImage.Format_RGB32)
+        ref = to_gray(img)
+        for target in targets:
+            for try_webp in (False, True):
+                enc = AdaptiveEncoder(try_webp=try_webp)  # 설정 캐시 없이 매번 탐색
+                if try_webp and "WEBP" not in enc.formats:
+                    continue
+                t0 = time.perf_counter()
+                data, fmt, q = enc.encode(img, target)
+                ms = (time.perf_counter() - t0) * 1000
+                out = QImage.fromData(data)
+                row = {
+                    "image": os.path.basename(path),
+                    "target": target,
+                    "fmt": fmt,
+                    "quality": q,
+                    "bytes": len(data),
+                    "encode_ms": round(ms, 2),
+                    "ssim": round(ssim(ref, to_gray(out)), 4),
+                }
+                rows.append(row)
+                print(
+                    f"{row['image'][:21]:<22}{target // 1024:>7}K{fmt:>6}{q:>4}"
+                    f"{row['bytes']:>10}{row['encode_ms']:>9.1f}{row['ssim']:>8.4f}"
+                )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
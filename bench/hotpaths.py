@@ -0,0 +1,272 @@
+"""
+이미지 핫패스 마이크로벤치마크 (offscreen Qt, 카메라/네트워크 없음).
+실제 코드(main.py / replicate_tasks.py / qr.py)를 그대로 부르고, 입력만 부스 크기로 합성.
+
+    python bench/hotpaths.py                               # 측정만
+    python bench/hotpaths.py --save bench/baseline.json    # 기준값 저장
+    python bench/hotpaths.py --check bench/baseline.json   # 기준 대비 느려진 항목이 있으면 exit 1
+    python bench/hotpaths.py -k compose,qr --repeat 50     # 일부만
+
+기준값은 기계마다 다르므로 같은 부스(같은 PC)에서 저장/비교할 것.
+"""
+
+import os, sys, gc, json, time, types, random, argparse, platform
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cv2
+import numpy as np
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import Qt, QSize, QT_VERSION_STR
+from PyQt5.QtGui import QPixmap
+
+WEBCAM = (1280, 720)  # 촬영 페이지 카메라
+WEBCAM_HD = (1920, 1080)
+POSE = (1024, 1536)  # Replicate 포즈 결과 (세로)
+LABEL = QSize(960, 540)  # lbl_webcam 대략 크기
+SLOT = QSize(400, 600)  # pick2 / 선택 슬롯 라벨
+
+_APP = None  # QApplication 은 측정 내내 살아 있어야 함 (main 에서 생성)
+
+
+def synth_bgr(w: int, h: int, seed: int = 0) -> np.ndarray:
+    """그라데이션 + 블록 노이즈 (완전 평탄하면 PNG/JPEG 가 비현실적으로 빨라짐)"""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 200, w, dtype=np.float32)
+    y = np.linspace(0, 200, h, dtype=np.float32)[:, None]
+    base = np.dstack([x + y * 0, y + x * 0, (x + y) / 2])
+    blocks = rng.normal(0, 25, (h // 8 + 1, w // 8 + 1, 3)).astype(np.float32)
+    blocks = cv2.resize(blocks, (w, h), interpolation=cv2.INTER_LINEAR)
+    fine = rng.normal(0, 6, (h, w, 3)).astype(np.float32)
+    return np.clip(base + blocks + fine, 0, 255).astype(np.uint8)
+
+
+def png_bytes(bgr: np.ndarray) -> bytes:
+    ok, buf = cv2.imencode(".png", bgr)
+    return buf.tobytes()
+
+
+class FixedCapture:
+    """_draw_frame 용 cap: 같은 프레임을 막힘 없이 반환 (카메라 대기 시간은 빼고 변환만 측정)"""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def read(self):
+        return True, self.frame
+
+
+class Case:
+    def __init__(self, name: str, fn, setup=None):
+        self.name = name
+        self.fn = fn  # fn(state) 를 측정
+        self.setup = setup  # 매 반복 전에 (측정 제외) → state
+
+
+def build_cases():
+    import main
+    import metrics
+    from image_cache import ScaledPixmapCache
+    from frame_catalog import FrameCatalog
+    from replicate_tasks import shrink_image_bytes
+    from qr import QRCODE
+
+    MW = main.MainWindow
+    cam = synth_bgr(*WEBCAM, seed=1)
+    cam_hd = synth_bgr(*WEBCAM_HD, seed=2)
+    cam_png = png_bytes(cam)
+    cam_hd_png = png_bytes(cam_hd)
+    pose_pix = [main.cv2_to_qpixmap(synth_bgr(*POSE, seed=s)) for s in (3, 4)]
+    pose_png = png_bytes(synth_bgr(*POSE, seed=3))
+
+    def fresh_pose():
+        """_load_session 처럼 결과 bytes 에서 매번 새 QPixmap (cacheKey 도 매번 다름)"""
+        pm = QPixmap()
+        pm.loadFromData(pose_png)
+        return pm
+
+    # MainWindow 전체를 띄우지 않고 메서드가 쓰는 속성만 가진 가짜 self 로 호출
+    label = QtWidgets.QLabel()
+    label.resize(LABEL)
+    draw_self = types.SimpleNamespace(
+        cap=FixedCapture(cam), lbl_webcam=label, _frame_meter=metrics.FrameMeter(30), _last_frame_bgr=None
+    )
+    draw_hd_self = types.SimpleNamespace(
+        cap=FixedCapture(cam_hd), lbl_webcam=label, _frame_meter=metrics.FrameMeter(30), _last_frame_bgr=None
+    )
+
+    catalog = FrameCatalog(QSize(1181, 1748))
+    compose_self = types.SimpleNamespace(
+        frame_catalog=catalog,
+        frame_boxes_norm=catalog.boxes_norm(),
+        final_slots=list(pose_pix),
+        CANVAS_W=1181,
+        CANVAS_H=1748,
+    )
+    if len(catalog):
+        catalog.template(0)  # 템플릿 디코딩은 첫 방문 1회라 측정에서 제외
+    canvas = MW._compose_frame(compose_self, 0) if len(catalog) else QPixmap(1181, 1748)
+    if canvas.isNull():
+        canvas = QPixmap(1181, 1748)
+        canvas.fill(Qt.white)
+    canvas_small = QRCODE._downscale(canvas, 1080)
+
+    slot = QtWidgets.QLabel()
+    slot.resize(SLOT)
+    warm_self = types.SimpleNamespace(pix_cache=ScaledPixmapCache())
+    cand = ("bench", "cand", 0)  # _enter_pick2_page 와 같은 (세션, 종류, 인덱스) 식별자
+
+    rnd = random.Random(0)
+    urls = [f"https://booth.local/s/{rnd.getrandbits(64):016x}.jpg" for _ in range(64)]
+
+    return [
+        Case("cv2_to_qpixmap/webcam", lambda s: main.cv2_to_qpixmap(cam)),
+        Case("cv2_to_qpixmap/webcam_hd", lambda s: main.cv2_to_qpixmap(cam_hd)),
+        Case("cv2_to_qpixmap/pose", lambda s: main.cv2_to_qpixmap(s), setup=lambda: synth_bgr(*POSE, seed=3)),
+        Case("draw_frame/webcam", lambda s: MW._draw_frame(draw_self)),
+        Case("draw_frame/webcam_hd", lambda s: MW._draw_frame(draw_hd_self)),
+        Case("shrink_image_bytes/webcam", lambda s: shrink_image_bytes(cam_png, 1024, 85)),
+        Case("shrink_image_bytes/webcam_hd", lambda s: shrink_image_bytes(cam_hd_png, 1024, 85)),
+        Case("compose_frame/canvas", lambda s: MW._compose_frame(compose_self, 0)),
+        Case("qr_downscale/canvas", lambda s: QRCODE._downscale(canvas, 1080)),
+        Case("save_qpixmap/canvas_jpg85", lambda s: QRCODE._save_qpixmap(canvas_small, "JPG", 85)),
+        Case("save_qpixmap/canvas_png", lambda s: QRCODE._save_qpixmap(canvas_small, "PNG")),
+        # 캐시 안 타도록 매번 새 URL + 빈 캐시
+        Case(
+            "make_qr_image/480",
+            lambda s: QRCODE.make_qr_image(s[0], s[1], 480),
+            setup=lambda: (types.SimpleNamespace(_qr_images={}), rnd.choice(urls)),
+        ),
+        # 둘 다 새 QPixmap: cold = 빈 캐시, warm = 같은 세션 후보를 다시 그릴 때 (pick2 재방문)
+        Case(
+            "set_pix_to_label/cold",
+            lambda s: MW._set_pix_to_label(s[0], slot, s[1], cand),
+            setup=lambda: (types.SimpleNamespace(pix_cache=ScaledPixmapCache()), fresh_pose()),
+        ),
+        Case(
+            "set_pix_to_label/warm",
+            lambda s: MW._set_pix_to_label(warm_self, slot, s, cand),
+            setup=fresh_pose,
+        ),
+    ]
+
+
+def run_case(case: Case, repeat: int, warmup: int) -> dict:
+    from tracing import percentile  # 트레이스 리포트와 같은 보간 백분위
+
+    for _ in range(warmup):
+        case.fn(case.setup() if case.setup else None)
+    gc.collect()
+    times = []
+    for _ in range(repeat):
+        state = case.setup() if case.setup else None
+        t0 = time.perf_counter()
+        case.fn(state)
+        times.append((time.perf_counter() - t0) * 1000)
+    return {
+        "n": repeat,
+        "median_ms": round(percentile(times, 0.5), 4),
+        "p90_ms": round(percentile(times, 0.9), 4),
+        "min_ms": round(min(times), 4),
+    }
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "qt": QT_VERSION_STR,
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, floor_ms: float):
+    """median 이 기준보다 tolerance 비율 이상 + floor_ms 이상 느려지면 회귀"""
+    regressions = []
+    rows = []
+    for name, cur in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            rows.append((name, cur["median_ms"], None, None, "new"))
+            continue
+        b, c = base["median_ms"], cur["median_ms"]
+        ratio = c / b if b > 0 else float("inf")
+        status = "ok"
+        if c > b * (1 + tolerance) and c - b > floor_ms:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif c < b * (1 - tolerance) and b - c > floor_ms:
+            status = "faster"
+        rows.append((name, c, b, ratio, status))
+    return rows, regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="이미지 핫패스 벤치마크")
+    ap.add_argument("-k", "--only", default="", help="이름에 포함된 항목만 (쉼표 구분)")
+    ap.add_argument("--repeat", type=int, default=30)
+    ap.add_argument("--warmup", type=int, default=3)
+    ap.add_argument("--save", default="", help="결과를 기준값 JSON 으로 저장")
+    ap.add_argument("--check", default="", help="기준값 JSON 과 비교")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="허용 비율 (0.15 = 15%% 느려질 때까지)")
+    ap.add_argument("--floor-ms", type=float, default=0.05, help="이보다 작은 차이는 무시")
+    args = ap.parse_args(argv)
+
+    global _APP
+    os.chdir(ROOT)  # frame_catalog.json / img/ 는 작업 폴더 기준
+    _APP = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    cases = build_cases()
+    keys = [k.strip() for k in args.only.split(",") if k.strip()]
+    if keys:
+        cases = [c for c in cases if any(k in c.name for k in keys)]
+
+    results = {}
+    print(f"{'case':<32}{'median':>10}{'p90':>10}{'min':>10}")
+    for case in cases:
+        r = run_case(case, args.repeat, args.warmup)
+        results[case.name] = r
+        print(f"{case.name:<32}{r['median_ms']:>10.3f}{r['p90_ms']:>10.3f}{r['min_ms']:>10.3f}")
+
+    code = 0
+    if args.check:
+        with open(args.check, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("machine") != machine_info():
+            print("⚠️ 기준값과 다른 환경에서 측정됨 (비교가 부정확할 수 있음)")
+        rows, regressions = compare(results, baseline, args.tolerance, args.floor_ms)
+        print(f"\n{'case':<32}{'now':>10}{'base':>10}{'ratio':>8}  status")
+        for name, c, b, ratio, status in rows:
+            if b is None:
+                print(f"{name:<32}{c:>10.3f}{'-':>10}{'-':>8}  {status}")
+            else:
+                print(f"{name:<32}{c:>10.3f}{b:>10.3f}{ratio:>8.2f}  {status}")
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+            code = 1
+        else:
+            print(f"\n✅ no regressions over {args.tolerance:.0%}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "machine": machine_info(),
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"💾 baseline → {args.save}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Replicate API 로컬 대역 (google/nano-banana, runwayml/gen4-image 등 모델 이름은 상관없음).
+POST /v1/models/<owner>/<name>/predictions 에 지정한 지연만큼 잡아두었다가 succeeded 로 응답,
+출력은 입력 이미지(data URI 또는 이 서버가 준 파일 URL)를 그대로 돌려줌.
+동시 처리 수를 세어서 /stats 로 보여줌 → 서비스/배치의 동시성 한도 확인용.
+
+    python bench/replicate_standin.py --port 8798 --latency 3 --jitter 1
+    REPLICATE_BASE_URL=http://127.0.0.1:8798 REPLICATE_API_TOKEN=x python main.py
+"""
+
+import re, sys, json, time, base64, random, argparse, threading, itertools
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 입력을 못 찾을 때 돌려줄 1×1 PNG
+_PLACEHOLDER = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+# 최근 예측/파일만 보관 (soak 처럼 오래 돌려도 대역 서버 메모리가 늘지 않도록)
+KEEP_RECENT = 256
+
+
+def _remember(store: OrderedDict, key: str, value, lock):
+    with lock:
+        store[key] = value
+        while len(store) > KEEP_RECENT:
+            store.popitem(last=False)
+
+
+class _StandinHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+    def _json(self, code: int, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        srv = self.server
+        m = re.fullmatch(r"/files/(\w+)\.(\w+)", self.path)
+        if m:
+            data = srv.files.get(m.group(1))
+            if data is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/" + m.group(2).replace("jpg", "jpeg"))
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        m = re.fullmatch(r"/v1/predictions/(\w+)", self.path)
+        if m and m.group(1) in srv.predictions:
+            self._json(200, srv.predictions[m.group(1)])
+            return
+        if self.path == "/stats":
+            self._json(200, {"calls": srv.calls, "active": srv.active, "peak": srv.peak})
+            return
+        self.send_error(404)
+
+    def do_POST(self):
+        srv = self.server
+        m = re.fullmatch(r"/v1/models/([\w.-]+)/([\w.-]+)/predictions", self.path)
+        if not m:
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        inp = body.get("input", {})
+
+        with srv.lock:
+            srv.calls += 1
+            srv.active += 1
+            srv.peak = max(srv.peak, srv.active)
+            fail = srv.fail_next > 0
+            if fail:
+                srv.fail_next -= 1
+        try:
+            time.sleep(max(0.0, srv.latency + random.uniform(-srv.jitter, srv.jitter)))
+        finally:
+            with srv.lock:
+                srv.active -= 1
+
+        pid = f"p{next(srv.ids):06d}"
+        pred = {
+            "id": pid,
+            "model": f"{m.group(1)}/{m.group(2)}",
+            "version": "standin",
+            "status": "failed" if fail else "succeeded",
+            "input": {},
+            "output": None,
+            "logs": "",
+            "error": "stand-in failure" if fail else None,
+            "metrics": {"predict_time": srv.latency},
+            "created_at": None,
+            "started_at": None,
+            "completed_at": None,
+            "urls": {"get": f"{srv.base_url}/v1/predictions/{pid}"},
+        }
+        if not fail:
+            fid = f"f{pid[1:]}"
+            _remember(srv.files, fid, self._first_image(inp), srv.lock)
+            pred["output"] = [f"{srv.base_url}/files/{fid}.jpg"]
+        _remember(srv.predictions, pid, pred, srv.lock)
+        self._json(201, pred)
+
+    def _first_image(self, inp: dict) -> bytes:
+        for key in ("image_input", "reference_images"):
+            for item in inp.get(key) or []:
+                if isinstance(item, str) and item.startswith("data:"):
+                    return base64.b64decode(item.split(",", 1)[1])
+                m = re.search(r"/files/(\w+)\.", item or "")
+                if m and m.group(1) in self.server.files:
+                    return self.server.files[m.group(1)]
+        return _PLACEHOLDER
+
+
+def start_standin(latency: float = 1.0, jitter: float = 0.0, port: int = 0, fail_next: int = 0):
+    """백그라운드로 띄우고 (server, base_url) 반환. REPLICATE_BASE_URL 로 지정해서 사용"""
+    httpd = ThreadingHTTPServer(("127.0.0.1", port), _StandinHandler)
+    httpd.daemon_threads = True
+    httpd.latency = latency
+    httpd.jitter = jitter
+    httpd.fail_next = fail_next
+    httpd.lock = threading.Lock()
+    httpd.ids = itertools.count(1)
+    httpd.calls = httpd.active = httpd.peak = 0
+    httpd.files = OrderedDict()
+    httpd.predictions = OrderedDict()
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, httpd.base_url
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8798)
+    ap.add_argument("--latency", type=float, default=3.0, help="예측 1건 처리 시간(초)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="± 초")
+    ap.add_argument("--fail", type=int, default=0, help="처음 N건은 failed")
+    args = ap.parse_args()
+    httpd, url = start_standin(args.latency, args.jitter, args.port, args.fail)
+    print(f"replicate stand-in → REPLICATE_BASE_URL={url} (latency={args.latency}s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        httpd.shutdown()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+장시간 soak 테스트. 화면 없이 MainWindow 로 손님 세션을 수천 번 반복하면서
+RSS / QPixmap·QImage 수 / 축소본 캐시 / 스레드 수 / 단계별 지연을 기록하고,
+누수나 지연 증가가 한도를 넘으면 실패(종료 코드 1).
+
+    python bench/soak.py --sessions 2000 --out soak_out
+    python bench/soak.py --minutes 600 --sample-every 50      # 10시간 운영 흉내
+
+카메라는 synthetic 프레임 소스, Replicate 는 bench/replicate_standin.py, 공유는 내장 LAN 서버,
+인쇄는 file 백엔드 (뽑힌 종이처럼 바로 지움). 부스 setting.json 은 건드리지 않음
+(임시 폴더에 설정을 만들고 LIFEPHOTO_SETTINGS 로 지정).
+
+출력: <out>/samples.jsonl (샘플 시점마다 한 줄), <out>/summary.json
+"""
+
+import os, sys, gc, json, time, random, shutil, argparse, tempfile, threading
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        import resource  # /proc 없는 환경: 최대치로 대신
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def native_threads() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return threading.active_count()
+
+
+def slope(xs, ys) -> float:
+    """최소제곱 기울기"""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mx, my = sum(xs) / n, sum(ys) / n
+    den = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / den if den else 0.0
+
+
+class SoakRunner:
+    def __init__(self, app, window, stage_log: dict, seed: int = 0):
+        self.app = app
+        self.w = window
+        self.stage_log = stage_log  # {단계: [(세션 번호, ms)]}
+        self.rng = random.Random(seed)
+        self.n = 0
+
+    def pump(self):
+        """processEvents 는 deleteLater 를 배달하지 않음 (이벤트 루프 밖에서는 쌓이기만 함)
+        → 부스처럼 지연 삭제까지 처리해야 끝난 작업의 시그널/람다(세션 bytes 참조)가 풀림"""
+        from PyQt5.QtCore import QCoreApplication, QEvent
+
+        self.app.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def pump_until(self, cond, timeout: float, what: str):
+        end = time.monotonic() + timeout
+        while not cond():
+            if time.monotonic() > end:
+                raise TimeoutError(f"session {self.n}: {what} 시간 초과")
+            self.pump()
+            time.sleep(0.002)
+
+    def run_session(self):
+        """손님 1명: 모드 선택 → 촬영 → AI → 2장 선택 → 프레임 → QR/인쇄 → 홈"""
+        w = self.w
+        self.n += 1
+        t0 = time.monotonic()
+        w.goto_page(1)
+        w.selected_mode = self.rng.choice(("past", "future"))
+
+        import metrics
+
+        frames = metrics.camera_frames.value()
+        w.goto_page(w.capture_page_index)
+        self.pump_until(lambda: metrics.camera_frames.value() >= frames + 3, 10, "카메라 프레임")
+        w.count_left = 1
+        w._tick_countdown()  # 카운트다운 마지막 틱 = 촬영
+        w._start_ai_pipeline()
+        self.pump_until(lambda: w.stacked.currentIndex() == w.pick2_page_index, 60, "AI 결과")
+
+        picks = self.rng.sample(range(len([c for c in w.candidates if c is not None])), 2)
+        for t in picks:
+            w._choose_from_thumb(t)
+        w.goto_page(w.frame_page_index)
+        w._choose_frame(self.rng.randrange(len(w.frame_catalog)))
+        w.goto_page(w.print_page_index)
+        self.pump_until(lambda: w._qr_result is not None, 30, "QR")
+        w._print_final_frame()
+        self.pump_until(lambda: w.spooler.pending() == 0, 30, "인쇄")
+
+        # 손님이 안내창을 닫고 나가는 것과 같게 (열린 채 쌓이면 하네스가 만든 누수)
+        for top in self.app.topLevelWidgets():
+            if top is not w and top.isVisible():
+                top.close()
+        w.goto_page(0)
+        self.pump()
+        self.stage_log.setdefault("session.wall", []).append((self.n, (time.monotonic() - t0) * 1000))
+
+    def sample(self) -> dict:
+        from PyQt5.QtGui import QImage, QPixmap
+
+        gc.collect()
+        objs = gc.get_objects()
+        w = self.w
+        return {
+            "session": self.n,
+            "t": round(time.monotonic(), 2),
+            "rss_mb": round(rss_mb(), 1),
+            "qpixmaps": sum(1 for o in objs if type(o) is QPixmap),
+            "qimages": sum(1 for o in objs if type(o) is QImage),
+            "py_objects": len(objs),
+            "pix_cache_bytes": w.pix_cache.stats()["bytes"],
+            "threads_py": threading.active_count(),
+            "threads_native": native_threads(),
+        }
+
+
+def evaluate(samples, stage_log, args) -> dict:
+    """워밍업 이후 기준 대비 증가량/기울기 → 한도 초과 항목 목록"""
+    from tracing import percentile
+
+    warm = [s for s in samples if s["session"] >= args.warmup] or samples[-1:]
+    base, last = warm[0], warm[-1]
+    per_k = 1000.0
+    failures = []
+    # RSS 는 할당자 아레나가 자리 잡는 동안(~100 세션) 오르므로 뒤쪽 절반으로만 기울기
+    # (객체/스레드 수는 짧은 워밍업 기준 그대로 → 초반에 차오르는 캐시도 잡힘)
+    tail = warm[len(warm) // 2 :]
+    rss_slope = slope([s["session"] for s in tail], [s["rss_mb"] for s in tail]) * per_k
+    if len(tail) >= 3 and rss_slope > args.max_rss_growth:
+        failures.append(f"RSS +{rss_slope:.1f} MB/1000 sessions (> {args.max_rss_growth})")
+    for key, limit in (
+        ("qpixmaps", args.max_object_growth),
+        ("qimages", args.max_object_growth),
+        ("threads_native", args.max_thread_growth),
+        ("threads_py", args.max_thread_growth),
+    ):
+        peak = max(s[key] for s in warm)
+        if peak - base[key] > limit:
+            failures.append(f"{key} {base[key]} → peak {peak} (> +{limit})")
+
+    stages = {}
+    for name, rows in sorted(stage_log.items()):
+        rows = [r for r in rows if r[0] >= args.warmup]
+        if len(rows) < 10:
+            continue
+        k = max(5, len(rows) // 5)
+        first = percentile([ms for _, ms in rows[:k]], 0.5)
+        end = percentile([ms for _, ms in rows[-k:]], 0.5)
+        ratio = end / first if first > 0 else 1.0
+        stages[name] = {"count": len(rows), "p50_first": round(first, 1), "p50_last": round(end, 1), "ratio": round(ratio, 2)}
+        if ratio > args.max_latency_drift and end - first > args.min_latency_delta_ms:
+            failures.append(f"{name} p50 {first:.1f} → {end:.1f} ms (x{ratio:.2f})")
+
+    return {
+        "sessions": samples[-1]["session"] if samples else 0,
+        "baseline": base,
+        "last": last,
+        "rss_mb_per_1000": round(rss_slope, 2),
+        "stages": stages,
+        "failures": failures,
+        "ok": not failures,
+    }
+
+
+def make_settings(workdir: str, args) -> str:
+    from setting import FileController
+
+    path = os.path.join(workdir, "setting.json")
+    os.environ["LIFEPHOTO_SETTINGS"] = path
+    fc = FileController()  # 기본값으로 생성
+    for k, v in {
+        "REPLICATE_API_TOKEN": "soak",
+        "CAMERA_SOURCE": args.camera,
+        "SHARE_MODE": "lan",
+        "SHARE_PORT": 0,
+        "SHARE_PUBLIC_HOST": "127.0.0.1",
+        "SHARE_DIR": os.path.join(workdir, "share"),
+        "PRINT_BACKEND": "file",
+        "SESSION_MAX_MB": args.store_mb,
+        "SESSION_RETENTION_S": 5,  # 짧게 돌려도 정리 동작이 여러 번 끼도록
+        "PIPELINE_MODE": "single",
+        "METRICS_PORT": 0,
+        "METRICS_HOST": "127.0.0.1",
+    }.items():
+        fc.revise_str_json(k, v)
+    return path
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="부스 장시간 soak 테스트")
+    ap.add_argument("--sessions", type=int, default=2000)
+    ap.add_argument("--minutes", type=float, default=0, help="지정하면 세션 수 대신 시간으로 제한")
+    ap.add_argument("--sample-every", type=int, default=25)
+    ap.add_argument("--warmup", type=int, default=10, help="이 세션 이후부터 기준선")
+    ap.add_argument("--camera", default="synthetic:1280x720@30~3")
+    ap.add_argument("--ai-latency", type=float, default=0.05, help="대역 Replicate 지연(초)")
+    ap.add_argument("--store-mb", type=int, default=200, help="세션 저장소 한도 (정리 동작까지 포함해서 돌도록)")
+    ap.add_argument("--max-rss-growth", type=float, default=40, help="MB / 1000 세션")
+    ap.add_argument("--max-object-growth", type=int, default=30, help="QPixmap/QImage 개수 증가 한도")
+    ap.add_argument("--max-thread-growth", type=int, default=4)
+    ap.add_argument("--max-latency-drift", type=float, default=1.5, help="단계 p50 처음 대비 배수")
+    ap.add_argument("--min-latency-delta-ms", type=float, default=20, help="이보다 작은 증가는 무시")
+    ap.add_argument("--out", default="soak_out")
+    ap.add_argument("--keep-workdir", action="store_true")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    out_dir = os.path.abspath(args.out)
+    os.makedirs(out_dir, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix="lifephoto_soak_")
+    # 리소스(ui/ style/ img/ ...)는 현재 폴더 기준으로 찾으므로 임시 폴더에 링크해 두고 chdir
+    # → sessions/ logs/ print_out/ 은 전부 임시 폴더에 생김 (share/ 는 SHARE_DIR 로 지정)
+    for name in ("ui", "style", "img", "frame_catalog.json", "frame_boxes.json"):
+        src = os.path.join(ROOT, name)
+        if not os.path.exists(src):
+            continue
+        try:
+            os.symlink(src, os.path.join(workdir, name))
+        except OSError:  # 심볼릭 링크 권한이 없는 환경
+            (shutil.copytree if os.path.isdir(src) else shutil.copy)(src, os.path.join(workdir, name))
+    os.chdir(workdir)
+    make_settings(workdir, args)
+
+    from replicate_standin import start_standin
+
+    standin, base_url = start_standin(latency=args.ai_latency, jitter=args.ai_latency / 4)
+    os.environ["REPLICATE_BASE_URL"] = base_url
+
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    import main as booth
+    from tracing import percentile, tracer
+
+    stage_log = {}
+    window = booth.MainWindow()
+    window.pipeline.start_spacing_ms = 0  # 대역 API 라 시작 간격 불필요
+    runner = SoakRunner(app, window, stage_log, args.seed)
+
+    def on_trace(rec):
+        if rec["kind"] == "span" and rec["ms"] is not None:
+            stage_log.setdefault(rec["name"], []).append((runner.n, rec["ms"]))
+
+    tracer.add_listener(on_trace)
+
+    samples = []
+    deadline = time.monotonic() + args.minutes * 60 if args.minutes else None
+    print_dir = os.path.join(workdir, "print_out")
+    error = None
+    with open(os.path.join(out_dir, "samples.jsonl"), "w", encoding="utf-8") as f:
+        try:
+            while (deadline and time.monotonic() < deadline) or (not deadline and runner.n < args.sessions):
+                runner.run_session()
+                shutil.rmtree(print_dir, ignore_errors=True)  # 뽑힌 종이
+                os.makedirs(print_dir, exist_ok=True)
+                if runner.n == 1 or runner.n % args.sample_every == 0:
+                    s = runner.sample()
+                    s["wall_p50_ms"] = round(
+                        percentile([ms for _, ms in stage_log["session.wall"][-args.sample_every :]], 0.5), 1
+                    )
+                    samples.append(s)
+                    f.write(json.dumps(s) + "\n")
+                    f.flush()
+                    print(
+                        f"[soak] {s['session']:>5}  rss {s['rss_mb']:>7.1f} MB  pixmaps {s['qpixmaps']:>4}  "
+                        f"images {s['qimages']:>4}  threads {s['threads_native']:>3}  session p50 {s['wall_p50_ms']:.0f} ms"
+                    )
+        except (TimeoutError, KeyboardInterrupt) as e:
+            error = str(e) or type(e).__name__
+            print("⚠️", error)
+        if not samples or samples[-1]["session"] != runner.n:
+            samples.append(runner.sample())
+            f.write(json.dumps(samples[-1]) + "\n")
+
+    summary = evaluate(samples, stage_log, args)
+    if error:
+        summary["failures"].append(error)
+        summary["ok"] = False
+    summary["replicate_calls"] = standin.calls
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=1)
+
+    print(f"\nstage{'':<19}{'count':>7}{'p50 first':>11}{'p50 last':>10}{'ratio':>7}")
+    for name, st in summary["stages"].items():
+        print(f"{name:<24}{st['count']:>7}{st['p50_first']:>11}{st['p50_last']:>10}{st['ratio']:>7}")
+    print(f"RSS slope: {summary['rss_mb_per_1000']} MB / 1000 sessions")
+    for msg in summary["failures"]:
+        print("❌", msg)
+    print("✅ soak OK" if summary["ok"] else "❌ soak FAILED", f"({summary['sessions']} sessions) → {out_dir}")
+
+    tracer.flush()
+    if not args.keep_workdir:
+        os.chdir(out_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+    else:
+        print("workdir:", workdir)
+    return 0 if summary["ok"] else 1
+
+
+if __name__ == "__main__":
+    code = main()
+    os._exit(code)  # 백그라운드 스레드(카메라/서버) 정리 기다리지 않음
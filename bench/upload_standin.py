@@ -0,0 +1,84 @@
+"""
+0x0.st 로컬 대역. 업로드 본문을 지정한 속도(KB/s)로만 읽어서 대역폭이 낮은 현장을 흉내냄.
+응답은 0x0.st 형식 URL ("https://0x0.st/<hash>.<ext>").
+
+    python bench/upload_standin.py --port 8799 --rate 256
+    LIFEPHOTO_UPLOAD_URL=http://127.0.0.1:8799 python main.py
+"""
+
+import re, sys, time, hashlib, argparse, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StandinHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        rate = self.server.rate_bps  # bytes/s, 0이면 제한 없음
+        h = hashlib.sha256()
+        head = b""  # multipart 헤더(파일명) 확인용 앞부분
+        got = 0
+        t0 = time.monotonic()
+        while got < length:
+            chunk = self.rfile.read(min(16 * 1024, length - got))
+            if not chunk:
+                break
+            got += len(chunk)
+            h.update(chunk)
+            if len(head) < 1024:
+                head += chunk[: 1024 - len(head)]
+            if rate:
+                # 지금까지 받은 양이 허용 속도를 넘으면 그만큼 쉬었다 읽기
+                ahead = got / rate - (time.monotonic() - t0)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+        if self.server.fail_next > 0:
+            self.server.fail_next -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        m = re.search(rb'filename="[^"]*\.(\w+)"', head)
+        ext = m.group(1).decode() if m else "bin"
+        body = f"https://0x0.st/{h.hexdigest()[:6]}.{ext}\n".encode()
+        self.server.uploads.append((got, time.monotonic() - t0))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_standin(rate_kbps: float = 0, port: int = 0, fail_next: int = 0):
+    """백그라운드로 띄우고 (server, url) 반환. server.uploads 에 (bytes, 초) 기록"""
+    httpd = ThreadingHTTPServer(("127.0.0.1", port), _StandinHandler)
+    httpd.daemon_threads = True
+    httpd.rate_bps = int(rate_kbps * 1024)
+    httpd.fail_next = fail_next
+    httpd.uploads = []
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8799)
+    ap.add_argument("--rate", type=float, default=0, help="KB/s (0 = 무제한)")
+    ap.add_argument("--fail", type=int, default=0, help="처음 N번은 503")
+    args = ap.parse_args()
+    httpd, url = start_standin(args.rate, args.port, args.fail)
+    print(f"upload stand-in → {url} (rate={args.rate or '∞'} KB/s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        httpd.shutdown()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
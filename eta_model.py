@@ -0,0 +1,234 @@
+"""
+AI 변환 진행률/남은 시간 예측.
+
+LatencyModel: 트레이스 span(age / pose / pose.download)으로 단계별 소요 시간을 모아서
+    (단계, 모델, 해상도, 시간대) 별로 보관 → 표본이 적으면 시간대 → 해상도 → 모델 순으로 넓혀서 추정.
+    Replicate 로그의 진행률("45%|...")이 오면 replicate.progress 이벤트로 받아서 남은 시간 보정.
+    파일(JSON)로 저장해 두고 다음 실행에서 이어서 사용.
+SessionEta: 손님 한 명분 일정(나이 변환 1회 → 포즈 N장, 동시 실행 한도/시작 간격)을
+    모델 추정치로 세워 두고, 현재 세션 상태로 진행률(0~1)과 남은 초를 계산.
+
+    python eta_model.py build logs/trace.jsonl logs/trace.jsonl.1 -o logs/latency_model.json
+    python eta_model.py show logs/latency_model.json
+"""
+
+import os, sys, json, time, argparse, threading
+
+from tracing import percentile, load_records
+
+# 기록이 전혀 없을 때 쓰는 값 (초)
+DEFAULTS = {"age": 15.0, "pose": 25.0, "pose.download": 1.0}
+STAGES = tuple(DEFAULTS)
+
+
+def _hour(t=None) -> int:
+    return time.localtime(t).tm_hour
+
+
+class LatencyModel:
+    """
+    단계별 소요 시간 표본 (키별 최근 keep 개). 트레이스 리스너(on_trace)는 워커 스레드에서
+    불리므로 잠금으로 보호. estimate() 는 p60 (중앙값보다 약간 보수적으로 → 끝에서 덜 멈춤).
+    """
+
+    def __init__(self, path: str = "", keep: int = 200, min_samples: int = 3, quantile: float = 0.6):
+        self.path = path
+        self.keep = keep
+        self.min_samples = min_samples
+        self.quantile = quantile
+        self._lock = threading.Lock()
+        self._samples = {}  # {"stage|model|resolution|hour": [초, ...]}
+        self._progress = {}  # {(sid, index): 0~1} 진행 중인 Replicate 예측의 최근 진행률
+        self._dirty = False
+        if path:
+            self.load()
+
+    # --- 표본 ---
+    @staticmethod
+    def _key(stage, model="", resolution="", hour="") -> str:
+        return f"{stage}|{model}|{resolution}|{hour}"
+
+    def add(self, stage: str, seconds: float, model: str = "", resolution: str = "", hour=None):
+        if seconds is None or seconds <= 0:
+            return
+        k = self._key(stage, model, resolution, _hour() if hour is None else hour)
+        with self._lock:
+            v = self._samples.setdefault(k, [])
+            v.append(round(seconds, 3))
+            if len(v) > self.keep:
+                del v[: len(v) - self.keep]
+            self._dirty = True
+
+    def estimate(self, stage: str, model: str = "", resolution: str = "", hour=None) -> float:
+        """정확히 맞는 키부터 조건을 하나씩 풀면서 표본이 min_samples 이상인 첫 단계의 p60"""
+        hour = _hour() if hour is None else hour
+        tries = (
+            lambda s, m, r, h: (s, m, r, h) == (stage, model, resolution, str(hour)),
+            lambda s, m, r, h: (s, m, r) == (stage, model, resolution),
+            lambda s, m, r, h: (s, m) == (stage, model),
+            lambda s, m, r, h: s == stage,
+        )
+        with self._lock:
+            items = [(k.split("|"), v) for k, v in self._samples.items()]
+        for match in tries:
+            pool = [x for parts, v in items if match(*parts) for x in v]
+            if len(pool) >= self.min_samples:
+                return percentile(pool, self.quantile)
+        return DEFAULTS.get(stage, 10.0)
+
+    def learn(self, records) -> int:
+        """트레이스 기록(들)에서 한꺼번에 학습 (지난 로그로 초기 모델 만들기)"""
+        n = 0
+        for rec in records:
+            if rec.get("kind") == "span" and rec.get("name") in STAGES:
+                self.on_trace(rec)
+                n += 1
+        return n
+
+    # --- 트레이스 리스너 ---
+    def on_trace(self, rec: dict):
+        name = rec["name"]
+        if rec["kind"] == "event":
+            if name == "replicate.progress" and rec.get("sid"):
+                with self._lock:
+                    self._progress[(rec["sid"], rec.get("index"))] = rec.get("pct", 0) / 100
+            return
+        if name not in STAGES:
+            return
+        if name in ("age", "pose") and rec.get("sid"):
+            with self._lock:
+                self._progress.pop((rec["sid"], rec.get("index")), None)  # Replicate 구간 끝
+        if rec["ms"] is None or "error" in rec:
+            return
+        self.add(name, rec["ms"] / 1000, rec.get("model", ""), rec.get("resolution", ""), _hour(rec.get("t")))
+
+    def progress(self, sid: str) -> dict:
+        """{index(나이 변환은 None): 0~1} 지금 돌고 있는 예측의 Replicate 진행률"""
+        with self._lock:
+            return {i: p for (s, i), p in self._progress.items() if s == sid}
+
+    def forget(self, sid: str):
+        with self._lock:
+            for k in [k for k in self._progress if k[0] == sid]:
+                del self._progress[k]
+
+    # --- 저장 ---
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                self._samples = {k: list(v)[-self.keep :] for k, v in data.get("samples", {}).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print("[eta] load failed:", e)
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = {"saved": time.strftime("%Y-%m-%d %H:%M:%S"), "samples": dict(self._samples)}
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print("[eta] save failed:", e)
+
+
+class SessionEta:
+    """
+    세션 시작 시점의 추정치로 일정을 세움:
+        나이 변환 T_age → 포즈 i 시작 = max(i × 시작 간격, (i // 동시 한도) × T_pose), 끝 = 시작 + T_pose
+    이후 진행 상황(나이 변환 완료 시각, 남은 포즈 수, Replicate 진행률)으로 남은 시간만 다시 계산.
+    예상보다 늦어지면 남은 시간을 0 이 아닌 단계 시간의 10% 로 두어서 막대가 천천히 계속 움직임.
+    """
+
+    TAIL = 0.1
+
+    def __init__(
+        self,
+        model: LatencyModel,
+        n_poses: int,
+        max_inflight: int = 3,
+        spacing_s: float = 2.0,
+        age_model: str = "",
+        pose_model: str = "",
+        resolution: str = "",
+    ):
+        hour = _hour()
+        self.model = model
+        self.n_poses = max(1, n_poses)
+        self.t_age = model.estimate("age", age_model, "", hour)
+        self.t_pose_run = model.estimate("pose", pose_model, resolution, hour)
+        self.t_pose = self.t_pose_run + model.estimate("pose.download", "", "", hour)
+        k = max(1, max_inflight)
+        self.pose_finish = [
+            max(i * spacing_s, (i // k) * self.t_pose) + self.t_pose for i in range(self.n_poses)
+        ]
+        self.total = self.t_age + self.pose_finish[-1]
+
+    def remaining(self, sess, now: float = None) -> float:
+        """남은 초 (sess: guest_session.GuestSession)"""
+        now = time.monotonic() if now is None else now
+        if sess.state in ("ready", "picked", "failed"):
+            return 0.0
+        running = self.model.progress(sess.id)
+        if sess.aged_url is None:
+            p = running.get(None)
+            if p:
+                age_left = (1 - p) * self.t_age
+            else:
+                age_left = max(self.t_age - (now - sess.t_created), self.TAIL * self.t_age)
+            return age_left + self.pose_finish[-1]
+
+        t_aged = sess.t_aged if getattr(sess, "t_aged", None) is not None else now
+        planned = max(t_aged + self.pose_finish[-1] - now, self.TAIL * self.t_pose)
+        pcts = [p for i, p in running.items() if i is not None]
+        if pcts and len(pcts) >= sess.poses_left:
+            # 남은 포즈가 모두 진행률을 보내고 있으면 가장 느린 것 기준
+            return (1 - min(pcts)) * self.t_pose_run + (self.t_pose - self.t_pose_run)
+        return planned
+
+    def fraction(self, sess, now: float = None) -> float:
+        """0~1 (경과 / (경과 + 남은 시간)), 완료 전에는 0.99 를 넘지 않음"""
+        now = time.monotonic() if now is None else now
+        if sess.state in ("ready", "picked"):
+            return 1.0
+        elapsed = max(0.0, now - sess.t_created)
+        left = self.remaining(sess, now)
+        return min(0.99, elapsed / max(1e-6, elapsed + left))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="AI 단계 소요 시간 모델")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    bp = sub.add_parser("build", help="트레이스 로그로 모델 만들기/갱신")
+    bp.add_argument("traces", nargs="+")
+    bp.add_argument("-o", "--out", default="logs/latency_model.json")
+    sp = sub.add_parser("show", help="단계별 추정치")
+    sp.add_argument("model", nargs="?", default="logs/latency_model.json")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        m = LatencyModel(args.out)
+        n = m.learn(load_records(args.traces))
+        m.save()
+        print(f"learned {n} spans → {args.out}")
+        return 0
+
+    m = LatencyModel(args.model)
+    with m._lock:
+        keys = sorted(m._samples.items())
+    print(f"{'stage|model|resolution|hour':<52}{'n':>5}{'p50':>8}{'p60':>8}")
+    for k, v in keys:
+        print(f"{k:<52}{len(v):>5}{percentile(v, 0.5):>8.1f}{percentile(v, 0.6):>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+import os, sys, glob, json, re
+from collections import OrderedDict
+from PyQt5.QtCore import (
+    Qt,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QAbstractListModel,
+    QModelIndex,
+    QSize,
+    pyqtSignal,
+)
+from PyQt5.QtGui import QImage, QImageReader, QPixmap, QColor
+
+
+def _resource_path(rel_path: str) -> str:
+    base = getattr(sys, "_MEIPASS", os.path.abspath("."))
+    return os.path.join(base, rel_path)
+
+
+# 박스 좌표가 없는 프레임에 쓰는 기본값 (위/아래 2칸)
+DEFAULT_BOXES = [(0.077, 0.113, 0.85, 0.425), (0.07, 0.548, 0.86, 0.428)]
+
+
+class FrameEntry:
+    def __init__(self, path: str, name: str = "", boxes=None):
+        self.path = path
+        self.name = name or os.path.splitext(os.path.basename(path))[0]
+        self.boxes = [tuple(b) for b in boxes] if boxes else list(DEFAULT_BOXES)
+
+
+class FrameCatalog:
+    """
+    프레임 목록(데이터 기반).
+    frame_catalog.json 이 있으면 그 순서를, 없으면 img/frame_*.png 를 번호순으로 사용.
+    템플릿 원본은 필요할 때만 캔버스 크기로 디코딩하고 최근 몇 개만 들고 있음.
+    """
+
+    def __init__(
+        self,
+        canvas_size: QSize,
+        catalog_path: str = "frame_catalog.json",
+        template_glob: str = "img/frame_*.png",
+        max_templates: int = 3,
+    ):
+        self.canvas_size = QSize(canvas_size)
+        self.catalog_path = _resource_path(catalog_path)
+        self.template_glob = template_glob
+        self.max_templates = max(1, max_templates)
+        self._templates = OrderedDict()  # {idx: QPixmap} LRU
+        self.entries = self._load_entries()
+
+    def _load_entries(self):
+        entries = []
+        try:
+            if os.path.exists(self.catalog_path):
+                with open(self.catalog_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for item in data if isinstance(data, list) else []:
+                    if isinstance(item, str):
+                        item = {"path": item}
+                    path = item.get("path")
+                    if not path:
+                        continue
+                    entries.append(
+                        FrameEntry(
+                            _resource_path(path), item.get("name", ""), item.get("boxes")
+                        )
+                    )
+        except Exception as e:
+            print("[frame_catalog] load failed:", e)
+
+        if not entries:
+            # frame_10.png 가 frame_2.png 뒤에 오도록 숫자 기준 정렬
+            def _natural_key(p):
+                return [
+                    int(t) if t.isdigit() else t
+                    for t in re.split(r"(\d+)", os.path.basename(p))
+                ]
+
+            paths = sorted(glob.glob(_resource_path(self.template_glob)), key=_natural_key)
+            entries = [FrameEntry(p) for p in paths]
+        return entries
+
+    def reload(self, catalog_path: str = ""):
+        """목록 파일을 다시 읽음 (경로를 주면 그 파일로 바꿔서), 디코딩해 둔 템플릿은 버림"""
+        if catalog_path:
+            self.catalog_path = _resource_path(catalog_path)
+        self.entries = self._load_entries()
+        self._templates.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def boxes_norm(self):
+        """프레임별 정규화 박스 목록 (카탈로그 순서, frame_boxes.json 은 이름 기준으로 덮어씀)"""
+        return [list(e.boxes) for e in self.entries]
+
+    def template(self, idx: int) -> QPixmap:
+        """캔버스 크기로 맞춘 템플릿 (없으면 검은 캔버스)"""
+        if not (0 <= idx < len(self.entries)):
+            return QPixmap()
+        pm = self._templates.get(idx)
+        if pm is not None:
+            self._templates.move_to_end(idx)
+            return pm
+
+        reader = QImageReader(self.entries[idx].path)
+        # 디코딩 단계에서 바로 캔버스 크기로 (원본 크기 사본을 따로 만들지 않음)
+        reader.setScaledSize(self.canvas_size)
+        img = reader.read()
+        if img.isNull():
+            pm = QPixmap(self.canvas_size)
+            pm.fill(Qt.black)
+        else:
+            if img.size() != self.canvas_size:
+                img = img.scaled(
+                    self.canvas_size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation
+                )
+            pm = QPixmap.fromImage(img)
+
+        self._templates[idx] = pm
+        while len(self._templates) > self.max_templates:
+            self._templates.popitem(last=False)
+        return pm
+
+
+class ThumbSignals(QObject):
+    done = pyqtSignal(int, int, QImage)  # (generation, row, image)
+
+
+class ThumbJob(QRunnable):
+    """썸네일 1장을 백그라운드에서 축소 디코딩"""
+
+    def __init__(self, generation: int, row: int, path: str, size: QSize):
+        super().__init__()
+        self.generation = generation
+        self.row = row
+        self.path = path
+        self.size = QSize(size)
+        self.signals = ThumbSignals()
+
+    def run(self):
+        img = QImage()
+        try:
+            reader = QImageReader(self.path)
+            src = reader.size()
+            if src.isValid():
+                reader.setScaledSize(src.scaled(self.size, Qt.KeepAspectRatio))
+            img = reader.read()
+            if not img.isNull() and (
+                img.width() > self.size.width() or img.height() > self.size.height()
+            ):
+                img = img.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        except Exception as e:
+            print(f"[frame_thumb {self.row}] {e}")
+        self.signals.done.emit(self.generation, self.row, img)
+
+
+class FrameThumbModel(QAbstractListModel):
+    """
+    QListView 용 프레임 썸네일 모델.
+    뷰가 화면에 보이는 항목만 data()를 요청하므로 그때 비동기 로드를 예약하고,
+    완성된 썸네일은 개수 제한 LRU에만 보관 → 카탈로그 크기와 무관하게 메모리 일정.
+    """
+
+    def __init__(
+        self,
+        catalog: FrameCatalog,
+        thumb_size: QSize = QSize(200, 296),
+        max_cached: int = 48,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.thumb_size = QSize(thumb_size)
+        self.max_cached = max(1, max_cached)
+        self._cache = OrderedDict()  # {row: QPixmap}
+        self._pending = set()
+        self._failed = set()  # 디코딩 실패한 행 (다시 그릴 때마다 재시도하지 않음, reload 때 비움)
+        self._generation = 0
+
+        # AI 작업용 전역 풀과 분리 (썸네일이 Replicate 작업을 막지 않도록)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+
+        self._placeholder = QPixmap(self.thumb_size)
+        self._placeholder.fill(QColor("#E1DFDB"))
+        self._broken = QPixmap(self.thumb_size)  # 파일이 없거나 깨진 프레임
+        self._broken.fill(QColor("#9E9A94"))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.catalog)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if not (0 <= row < len(self.catalog)):
+            return None
+        if role == Qt.DecorationRole:
+            pm = self._cache.get(row)
+            if pm is not None:
+                self._cache.move_to_end(row)
+                return pm
+            if row in self._failed:
+                return self._broken
+            self._request(row)
+            return self._placeholder
+        if role == Qt.ToolTipRole:
+            return self.catalog.entries[row].name
+        if role == Qt.SizeHintRole:
+            return self.thumb_size + QSize(16, 16)
+        return None
+
+    def _request(self, row: int):
+        if row in self._pending:
+            return
+        self._pending.add(row)
+        job = ThumbJob(
+            self._generation, row, self.catalog.entries[row].path, self.thumb_size
+        )
+        job.signals.done.connect(self._on_thumb_done)
+        self.pool.start(job)
+
+    def _on_thumb_done(self, generation: int, row: int, img: QImage):
+        if generation != self._generation:
+            return  # reload() 이전에 예약된 결과는 버림
+        self._pending.discard(row)
+        idx = self.index(row)
+        if img.isNull():
+            self._failed.add(row)
+            self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
+            return
+        self._cache[row] = QPixmap.fromImage(img)
+        self._cache.move_to_end(row)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
+
+    def reload(self):
+        """카탈로그가 바뀌었을 때 캐시를 비우고 다시 그리기"""
+        self.beginResetModel()
+        self._generation += 1
+        self.pool.clear()
+        self._cache.clear()
+        self._pending.clear()
+        self._failed.clear()
+        self.endResetModel()
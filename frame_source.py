@@ -0,0 +1,288 @@
+"""
+촬영 페이지 프레임 공급원. 모두 cv2.VideoCapture 와 같은 read()/isOpened()/release() 를 가짐.
+
+    CAMERA_SOURCE (setting.json)
+        ""  / "camera"                 CAMERA_PORT 의 실제 카메라
+        "camera:1"                     다른 카메라 번호
+        "file:clip.mp4"                동영상 (끝나면 처음부터)
+        "file:frames/"                 이미지 시퀀스 폴더 (*.jpg / *.png, 이름순)
+        "file:rec/"                    FrameRecorder 녹화본 (timing.jsonl 있음) → 그대로 재생
+        "synthetic:1280x720@30~5"      합성 프레임 (해상도 @FPS ~지터 ms)
+    CAMERA_RECORD_DIR 를 지정하면 어떤 소스든 프레임 + read() 타이밍을 녹화.
+
+녹화본 재생은 결정적: 매 read() 가 녹화 순서대로 같은 프레임/실패를 돌려주고,
+realtime=True 면 녹화 당시 read() 가 막혔던 시간만큼 똑같이 막힘 (GUI 멈춤 재현).
+
+    python frame_source.py record synthetic:640x480@30~8 rec/ --seconds 5
+    python frame_source.py info rec/
+"""
+
+import os, sys, glob, json, time, queue, random, argparse, threading
+
+import cv2
+import numpy as np
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class CameraSource:
+    def __init__(self, port=0):
+        self.cap = cv2.VideoCapture(port)
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+class FileSource:
+    """동영상 파일 또는 이미지 시퀀스 폴더. loop=True 면 끝에서 처음으로."""
+
+    def __init__(self, path: str, loop: bool = True):
+        self.path = path
+        self.loop = loop
+        self._files = None
+        self._cap = None
+        self._i = 0
+        if os.path.isdir(path):
+            self._files = sorted(
+                f for f in glob.glob(os.path.join(path, "*")) if f.lower().endswith(IMAGE_EXTS)
+            )
+        else:
+            self._cap = cv2.VideoCapture(path)
+
+    def isOpened(self) -> bool:
+        return bool(self._files) if self._files is not None else self._cap.isOpened()
+
+    def read(self):
+        if self._files is not None:
+            if self._i >= len(self._files):
+                if not self.loop:
+                    return False, None
+                self._i = 0
+            frame = cv2.imread(self._files[self._i])
+            self._i += 1
+            return frame is not None, frame
+        ok, frame = self._cap.read()
+        if not ok and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._cap.read()
+        return ok, frame
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+
+
+class SyntheticSource:
+    """
+    움직이는 그라데이션 + 프레임 번호. 실제 카메라처럼 read() 가 다음 프레임 시각까지 막힘
+    (fps 주기 ± jitter_ms, seed 고정이면 매번 같은 순서).
+    """
+
+    def __init__(self, width: int = 1280, height: int = 720, fps: float = 30, jitter_ms: float = 0, seed: int = 0):
+        self.width = width
+        self.height = height
+        self.period = 1.0 / max(1e-3, fps)
+        self.jitter = jitter_ms / 1000
+        self._rng = random.Random(seed)
+        self._n = 0
+        self._next = None
+        self._open = True
+        # 한 번만 만들어 두고 프레임마다 밀기만 (합성 비용이 측정을 흐리지 않도록)
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+        self._base = np.dstack(
+            [np.broadcast_to(x, (height, width)), np.broadcast_to(y, (height, width)), (x + y) / 2 % 256]
+        ).astype(np.uint8)
+
+    def isOpened(self) -> bool:
+        return self._open
+
+    def read(self):
+        now = time.monotonic()
+        if self._next is None:
+            self._next = now
+        wait = self._next - now
+        if wait > 0:
+            time.sleep(wait)
+        self._next = max(self._next, now) + max(0.0, self.period + self._rng.uniform(-self.jitter, self.jitter))
+        frame = np.roll(self._base, (self._n * 8) % self.width, axis=1)
+        cv2.putText(frame, str(self._n), (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        self._n += 1
+        return True, frame
+
+    def release(self):
+        self._open = False
+
+
+class RecordingSource:
+    """FrameRecorder 녹화본 재생. 끝나면 처음부터 (loop) 또는 (False, None)."""
+
+    def __init__(self, rec_dir: str, realtime: bool = True, loop: bool = True):
+        self.dir = rec_dir
+        self.realtime = realtime
+        self.loop = loop
+        with open(os.path.join(rec_dir, "timing.jsonl"), "r", encoding="utf-8") as f:
+            self.entries = [json.loads(line) for line in f if line.strip()]
+        self._i = 0
+        self._last = None
+
+    def isOpened(self) -> bool:
+        return bool(self.entries)
+
+    def read(self):
+        if self._i >= len(self.entries):
+            if not self.loop:
+                return False, None
+            self._i = 0
+        e = self.entries[self._i]
+        self._i += 1
+        if self.realtime and e.get("read_ms"):
+            time.sleep(e["read_ms"] / 1000)  # 녹화 당시 read() 가 막힌 시간
+        if not e.get("ok"):
+            return False, None
+        if e.get("file"):
+            self._last = cv2.imread(os.path.join(self.dir, e["file"]))
+        return self._last is not None, self._last
+
+    def release(self):
+        pass
+
+
+class FrameRecorder:
+    """
+    다른 소스를 감싸서 read() 결과를 녹화. JPEG 저장은 전용 스레드에서 (GUI 타이머를 늦추지 않도록).
+    rec_dir/timing.jsonl: {"i", "t"(시작 기준 초), "ok", "read_ms", "file"}
+    디스크가 못 따라오면 프레임만 빼고 타이밍은 남김 (file=None, 재생 시 직전 프레임 반복).
+    """
+
+    def __init__(self, source, rec_dir: str, quality: int = 90):
+        self.source = source
+        self.dir = rec_dir
+        self.quality = quality
+        os.makedirs(os.path.join(rec_dir, "frames"), exist_ok=True)
+        self._timing = open(os.path.join(rec_dir, "timing.jsonl"), "w", encoding="utf-8")
+        self._t0 = None
+        self._i = 0
+        self._q = queue.Queue()
+        self._backlog = 0  # 아직 안 쓴 프레임 수 (대략적인 한도라 잠금 없이)
+        self.max_backlog = 120
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._writer, name="frame-recorder", daemon=True)
+        self._thread.start()
+
+    def isOpened(self) -> bool:
+        return self.source.isOpened()
+
+    def read(self):
+        t = time.monotonic()
+        if self._t0 is None:
+            self._t0 = t
+        ok, frame = self.source.read()
+        read_ms = (time.monotonic() - t) * 1000
+        entry = {"i": self._i, "t": round(t - self._t0, 4), "ok": bool(ok), "read_ms": round(read_ms, 2), "file": None}
+        keep = ok and self._backlog < self.max_backlog
+        if keep:
+            entry["file"] = f"frames/{self._i:06d}.jpg"
+            self._backlog += 1
+        elif ok:
+            self.dropped += 1
+        self._q.put((entry, frame if keep else None))  # read() 마다 새 배열이라 복사 불필요
+        self._i += 1
+        return ok, frame
+
+    def _writer(self):
+        while True:
+            item = self._q.get()
+            if item is None:
+                break
+            entry, frame = item
+            if frame is not None:
+                cv2.imwrite(os.path.join(self.dir, entry["file"]), frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+                self._backlog -= 1
+            self._timing.write(json.dumps(entry) + "\n")
+        self._timing.close()
+
+    def release(self):
+        self.source.release()
+        self._q.put(None)
+        self._thread.join(timeout=10)
+        if self.dropped:
+            print(f"[record] {self.dropped} frames not recorded (writer behind)")
+
+
+def open_source(spec: str = "", camera_port=0, record_dir: str = ""):
+    """CAMERA_SOURCE 문자열 → 소스 (열기 실패 여부는 isOpened() 로 확인)"""
+    spec = (spec or "camera").strip()
+    kind, _, arg = spec.partition(":")
+    if kind == "camera":
+        src = CameraSource(int(arg) if arg.isdigit() else camera_port)
+    elif kind == "file":
+        if os.path.isfile(os.path.join(arg, "timing.jsonl")):
+            src = RecordingSource(arg)
+        else:
+            src = FileSource(arg)
+    elif kind == "synthetic":
+        # 1280x720@30~5
+        size, _, rest = (arg or "1280x720@30").partition("@")
+        fps, _, jitter = (rest or "30").partition("~")
+        w, _, h = size.partition("x")
+        src = SyntheticSource(int(w or 1280), int(h or 720), float(fps or 30), float(jitter or 0))
+    else:
+        raise ValueError(f"알 수 없는 CAMERA_SOURCE: {spec}")
+    if record_dir:
+        src = FrameRecorder(src, os.path.join(record_dir, time.strftime("%Y%m%d-%H%M%S")))
+    return src
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="카메라 녹화/재생 도구")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rp = sub.add_parser("record", help="소스를 N초 동안 읽어서 녹화")
+    rp.add_argument("source", help="camera / camera:1 / file:... / synthetic:640x480@30~5")
+    rp.add_argument("out")
+    rp.add_argument("--seconds", type=float, default=10)
+    ip = sub.add_parser("info", help="녹화본 타이밍 요약")
+    ip.add_argument("rec")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "record":
+        src = FrameRecorder(open_source(args.source), args.out)
+        if not src.isOpened():
+            print("소스를 열 수 없습니다:", args.source)
+            return 1
+        end = time.monotonic() + args.seconds
+        n = 0
+        while time.monotonic() < end:
+            src.read()
+            n += 1
+        src.release()
+        print(f"recorded {n} reads → {args.out}")
+        return 0
+
+    entries = RecordingSource(args.rec, realtime=False).entries
+    ok = [e for e in entries if e["ok"]]
+    reads = sorted(e["read_ms"] for e in entries)
+    span = entries[-1]["t"] - entries[0]["t"] if len(entries) > 1 else 0
+    print(
+        json.dumps(
+            {
+                "reads": len(entries),
+                "failed": len(entries) - len(ok),
+                "seconds": round(span, 2),
+                "fps": round(len(ok) / span, 1) if span else 0,
+                "read_ms_p50": reads[len(reads) // 2] if reads else 0,
+                "read_ms_max": reads[-1] if reads else 0,
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+import time, itertools
+from collections import deque
+from PyQt5.QtCore import QObject, QRunnable, QTimer, QThreadPool, pyqtSignal
+from replicate_tasks import MIN_POSES, AgeJob, PoseJob
+from tracing import tracer
+
+
+class GuestSession:
+    """
+    손님 한 명분 상태 (UI와 무관, 이미지도 bytes로만 보관).
+    state: queued → aging → posing → ready → picked / failed
+    """
+
+    _numbers = itertools.count(1)
+
+    def __init__(self, sid: str, mode: str, capture_png: bytes, n_poses: int, prompts=()):
+        self.id = sid
+        self.number = next(self._numbers)  # 화면에 보여줄 대기 번호
+        self.mode = mode
+        self.capture_png = capture_png
+        self.aged_url = None
+        self.prompts = list(prompts)  # 접수 시점의 포즈 프롬프트 (도중에 설정이 바뀌어도 유지)
+        self.poses = [None] * n_poses  # 포즈 결과 bytes
+        self.poses_left = n_poses
+        self.state = "queued"
+        self.errors = []
+        self.t_created = time.monotonic()
+        self.t_aged = None  # 나이 변환 완료 시각 (진행률 ETA 기준점)
+        self.t_ready = None
+
+    @property
+    def progress(self) -> float:
+        """0~100 (나이 변환 25 + 포즈 75, 기존 진행률 배분과 동일)"""
+        if self.state in ("ready", "picked", "failed"):
+            return 100.0
+        done = len(self.poses) - self.poses_left
+        return (25.0 if self.aged_url else 0.0) + 75.0 * done / max(1, len(self.poses))
+
+    @property
+    def status_text(self) -> str:
+        return {
+            "queued": "대기 중",
+            "aging": "타임머신 변환 중",
+            "posing": "포즈 생성 중",
+            "ready": "완료",
+            "picked": "선택 중",
+            "failed": "실패",
+        }.get(self.state, self.state)
+
+    def elapsed(self) -> float:
+        end = self.t_ready if self.t_ready is not None else time.monotonic()
+        return end - self.t_created
+
+
+class RemoteSignals(QObject):
+    age_done = pyqtSignal(str)
+    pose_done = pyqtSignal(int, bytes)
+    pose_error = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+
+class RemoteSessionJob(QRunnable):
+    """
+    파이프라인 서비스(pipeline_service.py)에 세션 하나를 넣고 끝날 때까지 상태를 폴링.
+    나이 변환/포즈가 끝나는 대로 로컬 작업과 같은 모양의 시그널로 알림.
+    """
+
+    def __init__(self, client, capture_png: bytes, mode: str, prompts, poll_s: float = 0.5):
+        super().__init__()
+        self.client = client
+        self.capture_png = capture_png
+        self.mode = mode
+        self.prompts = list(prompts)
+        self.poll_s = poll_s
+        self.cancelled = False
+        self.session_id = None
+        self.signals = RemoteSignals()
+
+    def run(self):
+        with tracer.span("remote.session", session=self.session_id):
+            self._run()
+
+    def _run(self):
+        try:
+            sid = self.client.submit(self.capture_png, self.mode, self.prompts)
+        except Exception as e:
+            self.signals.failed.emit(f"[service] {e}")
+            return
+
+        aged_sent = False
+        got = set()
+        errors_seen = 0
+        while not self.cancelled:
+            try:
+                st = self.client.status(sid)
+            except Exception as e:
+                self.signals.failed.emit(f"[service] {e}")
+                return
+            if st.get("aged_url") and not aged_sent:
+                aged_sent = True
+                self.signals.age_done.emit(st["aged_url"])
+            for i, ready in enumerate(st.get("poses", [])):
+                if ready and i not in got:
+                    got.add(i)
+                    self.signals.pose_done.emit(i, self.client.pose(sid, i))
+            errors = st.get("errors", [])
+            if aged_sent:
+                for msg in errors[errors_seen:]:
+                    self.signals.pose_error.emit(msg)
+                errors_seen = len(errors)
+            if st.get("state") == "failed" and not aged_sent:
+                self.signals.failed.emit("; ".join(errors) or "[service] failed")
+                return
+            if st.get("state") in ("ready", "failed", "cancelled"):
+                return
+            time.sleep(self.poll_s)
+        self.client.cancel(sid)
+
+
+class SessionPipeline(QObject):
+    """
+    여러 손님의 AI 작업을 UI와 분리해서 처리.
+    Replicate 호출은 전체 세션 공용 FIFO 큐 + 동시 실행 한도(max_inflight)로만 나감
+    → 손님 N의 포즈가 도는 동안 손님 N+1이 촬영/나이 변환을 시작할 수 있음 (같은 API 동시성).
+    작업 시작 간격(start_spacing_ms)은 기존 포즈 2초 간격 요청과 같은 역할.
+    API 작업은 대기 시간이 대부분이라 CPU 코어 수와 무관하게 전용 풀(스레드 = 한도)에서 실행.
+    service_url 이 있으면 Replicate 대신 파이프라인 서비스에 세션을 넘김 (한도/캐시는 서비스가 관리).
+    """
+
+    session_changed = pyqtSignal(str)  # session_id (상태/진행률 변경)
+    session_ready = pyqtSignal(str)
+    session_failed = pyqtSignal(str, str)  # session_id, message (세션이 최종 실패했을 때만)
+
+    def __init__(
+        self,
+        store,
+        token: str,
+        pose_prompts,
+        max_inflight: int = 3,
+        start_spacing_ms: int = 2000,
+        service_url: str = "",
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.store = store
+        self.token = token
+        self.pose_prompts = list(pose_prompts)
+        self.max_inflight = max(1, max_inflight)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.max_inflight)
+
+        self.client = None
+        self._remote_jobs = {}  # {session_id: RemoteSessionJob}
+        if service_url:
+            from pipeline_service import PipelineClient
+
+            self.client = PipelineClient(service_url)
+            # 원격 모드: 스레드는 세션별 폴링용 (실제 동시성은 서비스가 제한)
+            self.pool.setMaxThreadCount(max(8, self.max_inflight))
+        self.start_spacing_ms = start_spacing_ms
+
+        self.sessions = {}  # {session_id: GuestSession} (생성 순서 유지)
+        self._pending = deque()  # (session, job)
+        self._inflight = 0
+        self._last_start = 0.0
+        self._dispatch_timer = QTimer(self)
+        self._dispatch_timer.setSingleShot(True)
+        self._dispatch_timer.timeout.connect(self._dispatch)
+
+    # --- 외부 API ---
+    def submit(self, capture_png: bytes, mode: str) -> GuestSession:
+        sid = self.store.new_session(mode)
+        self.store.put(sid, "capture", capture_png, "png")
+        sess = GuestSession(sid, mode, capture_png, len(self.pose_prompts), self.pose_prompts)
+        self.sessions[sid] = sess
+
+        if self.client is not None:
+            self._start_remote(sess)
+            self.session_changed.emit(sid)
+            return sess
+
+        job = AgeJob(capture_png, mode, token=self.token, seed=42)
+        job.session_id = sid
+        job.signals.age_done.connect(lambda url, s=sess: self._on_age_done(s, url))
+        job.signals.error.connect(lambda msg, s=sess: self._on_age_error(s, msg))
+        self._enqueue(sess, job)
+        self.session_changed.emit(sid)
+        return sess
+
+    def get(self, sid: str):
+        return self.sessions.get(sid)
+
+    def active(self):
+        """아직 손님이 가져가지 않은 세션 (대기열 화면용), 오래된 순"""
+        return [s for s in self.sessions.values() if s.state not in ("picked",)]
+
+    def ready(self):
+        return [s for s in self.sessions.values() if s.state == "ready"]
+
+    def pick(self, sid: str):
+        """손님이 결과를 가져감 → 목록에서 빠짐 (bytes 해제)"""
+        sess = self.sessions.pop(sid, None)
+        if sess is not None:
+            sess.state = "picked"
+            self.session_changed.emit(sid)
+        return sess
+
+    def discard(self, sid: str):
+        sess = self.sessions.pop(sid, None)
+        if sess is not None:
+            self._pending = deque(p for p in self._pending if p[0] is not sess)
+            remote = self._remote_jobs.pop(sid, None)
+            if remote is not None:
+                remote.cancelled = True
+            self.session_changed.emit(sid)
+
+    # --- 설정 변경 (setting.json 실행 중 수정) ---
+    def set_max_inflight(self, n: int):
+        """한도를 올리면 대기 중인 작업을 바로 시작, 내리면 돌고 있는 작업이 끝나면서 맞춰짐"""
+        self.max_inflight = max(1, n)
+        if self.client is None:
+            self.pool.setMaxThreadCount(self.max_inflight)
+        else:
+            self.pool.setMaxThreadCount(max(8, self.max_inflight))
+        self._dispatch()
+
+    def set_pose_prompts(self, prompts):
+        """다음 접수부터 적용 (이미 접수된 세션은 접수 때 프롬프트로 진행)"""
+        self.pose_prompts = list(prompts)
+
+    def set_token(self, token: str):
+        """다음에 만드는 작업부터 적용"""
+        self.token = token
+
+    def inflight(self) -> int:
+        return self._inflight
+
+    def queued_jobs(self) -> int:
+        return len(self._pending)
+
+    # --- 스케줄링 ---
+    def _enqueue(self, sess: GuestSession, job):
+        job.t_queued = time.monotonic()
+        self._pending.append((sess, job))
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._pending and self._inflight < self.max_inflight:
+            wait_ms = self.start_spacing_ms - (time.monotonic() - self._last_start) * 1000
+            if wait_ms > 0:
+                if not self._dispatch_timer.isActive():
+                    self._dispatch_timer.start(int(wait_ms) + 1)
+                return
+            sess, job = self._pending.popleft()
+            if sess.id not in self.sessions:
+                continue  # 취소된 세션
+            if sess.state == "queued":
+                sess.state = "aging"
+                self.session_changed.emit(sess.id)
+            self._inflight += 1
+            self._last_start = time.monotonic()
+            # 동시성 한도/시작 간격 때문에 기다린 시간
+            stage = "age.queue" if isinstance(job, AgeJob) else "pose.queue"
+            tracer.record(stage, job.t_queued, self._last_start - job.t_queued, session=sess.id)
+            self.pool.start(job)
+
+    def _job_finished(self):
+        self._inflight = max(0, self._inflight - 1)
+        self._dispatch()
+
+    def _start_remote(self, sess: GuestSession):
+        job = RemoteSessionJob(self.client, sess.capture_png, sess.mode, sess.prompts)
+        job.session_id = sess.id
+        job.signals.age_done.connect(lambda url, s=sess: self._on_age_done(s, url, local=False))
+        job.signals.pose_done.connect(
+            lambda idx, data, s=sess: self._on_pose_done(s, idx, data, local=False)
+        )
+        job.signals.pose_error.connect(lambda msg, s=sess: self._on_pose_error(s, msg, local=False))
+        job.signals.failed.connect(lambda msg, s=sess: self._on_age_error(s, msg, local=False))
+        job.setAutoDelete(False)  # discard() 에서 cancelled 설정용으로 참조 유지
+        self._remote_jobs[sess.id] = job
+        sess.state = "aging"
+        self.pool.start(job)
+
+    # --- 작업 결과 (GUI 스레드) ---
+    def _on_age_done(self, sess: GuestSession, url: str, local: bool = True):
+        if local:
+            self._job_finished()
+        if sess.id not in self.sessions:
+            return
+        sess.aged_url = url
+        sess.t_aged = time.monotonic()
+        sess.state = "posing"
+        # 나이 변환 결과는 백그라운드로 받아서 세션에 보관
+        self.store.put_url(sess.id, "aged", url)
+        if not local:
+            self.session_changed.emit(sess.id)
+            return  # 포즈는 서비스가 이어서 실행
+
+        inputs = [url, sess.capture_png] if sess.capture_png else [url]
+        for i, p in enumerate(sess.prompts):
+            job = PoseJob(
+                inputs=inputs,
+                pose_prompt=p,
+                index=i,
+                token=self.token,
+                seed=42,
+                aspect_ratio="1:1",
+                resolution="720p",
+            )
+            job.session_id = sess.id
+            job.signals.pose_done.connect(lambda idx, data, s=sess: self._on_pose_done(s, idx, data))
+            job.signals.error.connect(lambda msg, s=sess: self._on_pose_error(s, msg))
+            self._enqueue(sess, job)
+        self.session_changed.emit(sess.id)
+
+    def _on_age_error(self, sess: GuestSession, msg: str, local: bool = True):
+        if local:
+            self._job_finished()
+        self._remote_jobs.pop(sess.id, None)
+        if sess.id not in self.sessions:
+            return
+        sess.errors.append(msg)
+        sess.state = "failed"
+        self.session_changed.emit(sess.id)
+        self.session_failed.emit(sess.id, msg)
+
+    def _on_pose_done(self, sess: GuestSession, index: int, data: bytes, local: bool = True):
+        if local:
+            self._job_finished()
+        if sess.id not in self.sessions:
+            return
+        if 0 <= index < len(sess.poses):
+            sess.poses[index] = data
+        self.store.put(sess.id, f"pose_{index}", data)
+        self._pose_finished(sess)
+
+    def _on_pose_error(self, sess: GuestSession, msg: str, local: bool = True):
+        if local:
+            self._job_finished()
+        if sess.id not in self.sessions:
+            return
+        # 포즈 하나 실패는 기록만 (다른 포즈로 MIN_POSES 장이 차면 그대로 진행) → 모자라면 _pose_finished 에서 알림
+        sess.errors.append(msg)
+        print(f"⚠️ 세션 #{sess.number} 포즈 오류: {msg}")
+        self._pose_finished(sess)
+
+    def _pose_finished(self, sess: GuestSession):
+        sess.poses_left -= 1
+        if sess.poses_left <= 0 and sess.state == "posing":
+            self._remote_jobs.pop(sess.id, None)
+            # pick2 는 MIN_POSES 칸을 다 채워야 다음으로 → 그보다 적으면 진행 불가라 실패 처리
+            if sum(1 for p in sess.poses if p) >= MIN_POSES:
+                sess.state = "ready"
+                sess.t_ready = time.monotonic()
+                tracer.record("session.ai", sess.t_created, sess.elapsed(), session=sess.id, mode=sess.mode)
+                print(f"✅ 세션 #{sess.number} 준비 완료 ({sess.elapsed():.1f}s)")
+                self.session_changed.emit(sess.id)
+                self.session_ready.emit(sess.id)
+                return
+            sess.state = "failed"
+            self.session_changed.emit(sess.id)
+            self.session_failed.emit(sess.id, sess.errors[-1] if sess.errors else "포즈 생성 실패")
+            return
+        self.session_changed.emit(sess.id)
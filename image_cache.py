@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QPixmap
+
+
+def _pixmap_bytes(pm: QPixmap) -> int:
+    return pm.width() * pm.height() * max(1, pm.depth()) // 8
+
+
+class ScaledPixmapCache:
+    """
+    라벨 크기별 축소본 공용 캐시.
+    key = (원본 식별자, 목표 w, h, 비율 모드)
+    원본 식별자는 호출자가 주는 안정적인 튜플 (예: (세션 id, "cand", 인덱스)).
+    QPixmap.cacheKey() 는 같은 이미지라도 새로 만든 QPixmap 마다 달라서 쓰지 않음.
+    식별자가 없으면 캐시하지 않고 그냥 스케일.
+    첫 원소가 세션 id 이면 discard(세션 id) 로 그 세션 것만 한 번에 제거.
+    원본이 목표보다 훨씬 크면 1/2씩 줄인 밉맵 단계를 만들어 두고
+    목표 이상인 가장 작은 단계에서 스케일 → 다른 크기 요청도 싸게 처리.
+    전체 바이트 수 기준 LRU로 제거.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()  # {key: QPixmap}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def scaled(
+        self,
+        pix: QPixmap,
+        target: QSize,
+        aspect_mode=Qt.KeepAspectRatio,
+        source=None,
+    ) -> QPixmap:
+        if pix is None or pix.isNull() or target.isEmpty():
+            return QPixmap()
+        if source is None:
+            return self._mip_level(pix, target, None).scaled(
+                target, aspect_mode, Qt.SmoothTransformation
+            )
+        key = (source, target.width(), target.height(), int(aspect_mode))
+        hit = self._get(key)
+        if hit is not None:
+            self.hits += 1
+            return hit
+
+        self.misses += 1
+        src = self._mip_level(pix, target, source)
+        out = src.scaled(target, aspect_mode, Qt.SmoothTransformation)
+        self._put(key, out)
+        return out
+
+    def _mip_level(self, pix: QPixmap, target: QSize, source) -> QPixmap:
+        """절반으로 줄여도 목표의 2배 이상이 남는 동안 한 단계씩 내려감 (source 없으면 캐시 안 함)"""
+        src = pix
+        level = 0
+        tw, th = max(1, target.width()), max(1, target.height())
+        while src.width() >= 4 * tw and src.height() >= 4 * th:
+            level += 1
+            key = (source, "mip", level)
+            nxt = self._get(key) if source is not None else None
+            if nxt is None:
+                nxt = src.scaled(
+                    src.width() // 2,
+                    src.height() // 2,
+                    Qt.IgnoreAspectRatio,
+                    Qt.SmoothTransformation,
+                )
+                if source is not None:
+                    self._put(key, nxt)
+            src = nxt
+        return src
+
+    def _get(self, key):
+        pm = self._items.get(key)
+        if pm is not None:
+            self._items.move_to_end(key)
+        return pm
+
+    def _put(self, key, pm: QPixmap):
+        size = _pixmap_bytes(pm)
+        if size > self.max_bytes:
+            return  # 한 장이 예산보다 크면 캐시하지 않음
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= _pixmap_bytes(old)
+        self._items[key] = pm
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._items:
+            _, ev = self._items.popitem(last=False)
+            self._bytes -= _pixmap_bytes(ev)
+
+    def discard(self, tag):
+        """원본 식별자의 첫 원소가 tag 인 항목 전부 제거 (끝난 세션 정리용)"""
+        for key in [k for k in self._items if k[0] and k[0][0] == tag]:
+            self._bytes -= _pixmap_bytes(self._items.pop(key))
+
+    def clear(self):
+        self._items.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": len(self._items),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -1,4 +1,6 @@
-import sys, os, glob, cv2
+import startup_timing  # 가장 먼저: 시작 시간 측정 기준점
+
+import sys, os, glob, threading
 from PyQt5 import uic, QtWidgets
 from PyQt5.QtWidgets import QApplication, QMainWindow
 from PyQt5.QtWidgets import QButtonGroup
@@ -13,15 +15,38 @@ from PyQt5.QtCore import (
     QMarginsF,
 )
 from PyQt5 import QtCore
-from PyQt5.QtGui import QImage, QPixmap, QPainter, QFont, QFontDatabase, QCursor
-from setting import FileController
-from replicate_tasks import AgeJob, PoseJob
-import numpy as np
+from PyQt5.QtGui import QImage, QPixmap, QPainter, QFont, QFontDatabase, QCursor, QKeySequence
+from setting import Config, write_json_atomic
 import json
-from PyQt5.QtPrintSupport import QPrinter
-from PyQt5.QtCore import QSizeF, QSize
-from qr import QRCODE
-from PyQt5.QtCore import QFile, QTextStream
+from PyQt5.QtCore import QSize
+from qr import QRCODE, QrJob
+from share_server import ShareServer
+from print_spooler import PrintSpooler, make_backend
+from print_layout import SheetLayout
+from frame_catalog import FrameCatalog, FrameThumbModel
+from image_cache import ScaledPixmapCache
+from session_store import SessionStore
+from session_index import SessionIndex
+from staff_dialog import StaffDialog
+from guest_session import SessionPipeline
+from queue_dialog import QueueDialog
+import replicate_tasks
+from replicate_tasks import POSE_PROMPTS, AGE_MODEL, POSE_MODEL
+from tracing import tracer
+import metrics
+from stall_watchdog import StallWatchdog
+from sampling_profiler import SamplingProfiler
+from eta_model import LatencyModel, SessionEta
+import time
+from PyQt5.QtCore import QFile, QTextStream, QEvent
+
+startup_timing.timer.mark("imports")
+
+# 첫 화면 뒤에 백그라운드로 미리 import 해 둘 무거운 모듈 (촬영/AI/QR 에서 처음 쓸 때 멈춤 방지)
+WARM_IMPORTS = ("numpy", "cv2", "requests", "qrcode", "replicate")
+
+# pick2 화면 썸네일 수 (ui 의 thumb_1 ~ thumb_3) → 포즈 프롬프트는 2개 이상 이 수 이하
+PICK2_THUMBS = 3
 
 
 def resource_path(rel_path: str) -> str:
@@ -33,27 +58,66 @@ def resource_path(rel_path: str) -> str:
     return os.path.join(base, rel_path)
 
 
+def _warm_imports():
+    """첫 화면 뒤 백그라운드에서 무거운 모듈 미리 import (실패해도 무시 — 실제로 쓸 때 다시 시도)"""
+    import importlib
+
+    for name in WARM_IMPORTS:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
 def cv2_to_qpixmap(bgr):
     if bgr is None:
         return None
+    import cv2
+
     rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
     h, w, ch = rgb.shape
     qimg = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888)
     return QPixmap.fromImage(qimg)
 
 
+class _EditorCanvas(QtWidgets.QWidget):
+    """FrameEditorDialog 전용 그리기 위젯 (paintEvent에서 템플릿 + 오버레이를 한 번에)"""
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.setAttribute(Qt.WA_OpaquePaintEvent)  # 배경 지우기 생략 (깜빡임 방지)
+        self.setMouseTracking(False)
+
+    def paintEvent(self, ev):
+        p = QPainter(self)
+        self.editor._paint_canvas(p, ev.rect())
+        p.end()
+
+    def mousePressEvent(self, ev):
+        self.editor._on_mouse_press(ev)
+
+    def mouseMoveEvent(self, ev):
+        self.editor._on_mouse_move(ev)
+
+    def mouseReleaseEvent(self, ev):
+        self.editor._on_mouse_release(ev)
+
+
 class FrameEditorDialog(QtWidgets.QDialog):
-    def __init__(self, base_pixmap: QPixmap, parent=None):
+    def __init__(self, base_pixmap: QPixmap, parent=None, slot_pixmaps=None):
         super().__init__(parent)
         self.setWindowTitle("Frame 영역 조정기")
         self.setModal(True)
         self.base_pixmap = base_pixmap
         self.orig_w, self.orig_h = base_pixmap.width(), base_pixmap.height()
+        self.norms = []
 
         # ---- 미리보기 크기 결정 (화면의 70% 안쪽, 가로 최대 720px 권장) ----
-        scr = QtWidgets.QApplication.primaryScreen().availableGeometry()
-        max_w = min(720, int(scr.width() * 0.7))
-        max_h = int(scr.height() * 0.8)
+        scr = QtWidgets.QApplication.primaryScreen()
+        avail = scr.availableGeometry()
+        max_w = min(720, int(avail.width() * 0.7))
+        max_h = int(avail.height() * 0.8)
         self.scale = min(max_w / self.orig_w, max_h / self.orig_h)
         if self.scale <= 0:
             self.scale = 1.0
@@ -61,30 +125,40 @@ class FrameEditorDialog(QtWidgets.QDialog):
         self.view_w = int(self.orig_w * self.scale)
         self.view_h = int(self.orig_h * self.scale)
 
-        # 라벨(미리보기)
-        self.label = QtWidgets.QLabel()
-        self.label.setFixedSize(self.view_w, self.view_h)
-        self.label.setAlignment(Qt.AlignCenter)
-
-        # 최초 미리보기 그림
+        # 미리보기 템플릿은 한 번만 축소해 두고 매 페인트마다 그대로 그림
         self.view_pixmap = self.base_pixmap.scaled(
             self.view_w, self.view_h, Qt.KeepAspectRatio, Qt.SmoothTransformation
         )
-        self.label.setPixmap(self.view_pixmap)
+
+        # 세션 사진(선택된 2장) 미리보기용 축소본 — 박스보다 크지 않게 한 번만 축소
+        self.slot_views = []
+        for pm in slot_pixmaps or []:
+            if isinstance(pm, QPixmap) and not pm.isNull():
+                self.slot_views.append(
+                    pm.scaled(
+                        self.view_w, self.view_h, Qt.KeepAspectRatio, Qt.SmoothTransformation
+                    )
+                )
+
+        self.canvas = _EditorCanvas(self)
+        self.canvas.setFixedSize(self.view_w, self.view_h)
 
         layout = QtWidgets.QVBoxLayout(self)
-        layout.addWidget(self.label)
+        layout.addWidget(self.canvas)
 
         # 상태
         self.rects = []  # 원본 좌표계(QRect)
         self.master_rect = None
         self.start_pos = None  # 원본 좌표계의 시작점(QPoint)
         self.drag_pos = None  # 원본 좌표계의 현재점(QPoint)
+        self._dirty_view = QRect()  # 다음 프레임에 다시 그릴 영역(뷰 좌표)
 
-        # 이벤트 바인딩
-        self.label.mousePressEvent = self._on_mouse_press
-        self.label.mouseMoveEvent = self._on_mouse_move
-        self.label.mouseReleaseEvent = self._on_mouse_release
+        # 마우스 이동은 상태만 바꾸고, 실제 다시 그리기는 화면 주사율에 맞춰 한 번씩
+        hz = scr.refreshRate() or 60.0
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setSingleShot(True)
+        self.redraw_timer.setInterval(max(1, int(1000 / hz)))
+        self.redraw_timer.timeout.connect(self._flush_redraw)
 
         QtWidgets.QToolTip.showText(
             self.mapToGlobal(self.rect().center()),
@@ -112,6 +186,45 @@ class FrameEditorDialog(QtWidgets.QDialog):
             int(round(r.height() * self.scale)),
         )
 
+    # ---- 다시 그리기 (변경된 영역만, 주사율 단위로 묶음) ----
+    def _schedule_redraw(self, *orig_rects):
+        for r in orig_rects:
+            if r is not None:
+                # 테두리 두께만큼 여유
+                self._dirty_view |= self._to_view_rect(r).adjusted(-2, -2, 2, 2)
+        if not self.redraw_timer.isActive():
+            self.redraw_timer.start()
+
+    def _flush_redraw(self):
+        if self._dirty_view.isNull():
+            self.canvas.update()
+        else:
+            self.canvas.update(self._dirty_view)
+        self._dirty_view = QRect()
+
+    def _paint_canvas(self, p: QPainter, clip: QRect):
+        p.drawPixmap(clip, self.view_pixmap, clip)
+
+        boxes = list(self.rects)
+        cur = self._current_rect()
+        if cur:
+            boxes.append(cur)
+
+        # 세션 사진을 박스 안에 center-crop으로 바로 그림 (사본 없이 source rect만 계산)
+        for slot, rr in zip(self.slot_views, boxes):
+            vr = self._to_view_rect(rr)
+            if vr.width() <= 0 or vr.height() <= 0 or not vr.intersects(clip):
+                continue
+            sw, sh = slot.width(), slot.height()
+            k = max(vr.width() / sw, vr.height() / sh)
+            cw, ch = vr.width() / k, vr.height() / k
+            src = QtCore.QRectF((sw - cw) / 2, (sh - ch) / 2, cw, ch)
+            p.drawPixmap(QtCore.QRectF(vr), slot, src)
+
+        p.setPen(Qt.red)
+        for rr in boxes:
+            p.drawRect(self._to_view_rect(rr))
+
     def _on_mouse_press(self, ev):
         if ev.button() != Qt.LeftButton:
             return
@@ -124,28 +237,20 @@ class FrameEditorDialog(QtWidgets.QDialog):
     def _on_mouse_move(self, ev):
         if self.start_pos is None:
             return
+        before = self._current_rect()
         self.drag_pos = self._to_orig_pt(ev.pos())
-        # 미리보기 갱신 (뷰 좌표로 그림)
-        preview = self.view_pixmap.copy()
-        p = QPainter(preview)
-        p.setPen(Qt.red)
-        cur = self._current_rect()
-        if cur:
-            p.drawRect(self._to_view_rect(cur))
-        for rr in self.rects:
-            p.drawRect(self._to_view_rect(rr))
-        p.end()
-        self.label.setPixmap(preview)
+        self._schedule_redraw(before, self._current_rect())
 
     def _on_mouse_release(self, ev):
         if self.start_pos is None:
             return
+        before = self._current_rect()
         self.drag_pos = self._to_orig_pt(ev.pos())
         r = self._current_rect()
         self.start_pos = None
         self.drag_pos = None
         if not r or r.width() <= 0 or r.height() <= 0:
-            self.label.setPixmap(self.view_pixmap)
+            self._schedule_redraw(before)
             return
 
         # 첫 박스 확정
@@ -163,14 +268,7 @@ class FrameEditorDialog(QtWidgets.QDialog):
             self._emit_norm_and_close()
             return
 
-        # 프리뷰 갱신
-        preview = self.view_pixmap.copy()
-        p = QPainter(preview)
-        p.setPen(Qt.red)
-        for rr in self.rects:
-            p.drawRect(self._to_view_rect(rr))
-        p.end()
-        self.label.setPixmap(preview)
+        self._schedule_redraw(before, r)
 
     def _current_rect(self):
         if self.start_pos is None or self.drag_pos is None:
@@ -206,44 +304,63 @@ class MainWindow(QtWidgets.QMainWindow):
             os.path.dirname(__file__), "frame_boxes.json"
         )
 
-        self.qr = QRCODE()
+        # setting.json 캐시 (실행 중 수정하면 _apply_* 구독자가 바로 반영 → _subscribe_config)
+        self.config = Config()
+        settings = self.config.snapshot()
+        startup_timing.timer.mark("settings")
+
+        # 단계별 트레이스 (JSONL, 파일 쓰기는 백그라운드) → python tracing.py report
+        tracer.configure(
+            settings.get("TRACE_PATH", "logs/trace.jsonl"),
+            bool(settings.get("TRACE_ENABLED", True)),
+        )
+        self._capture_encode = None  # (시작 monotonic, 초) — 세션 id 생기면 기록
+
+        # 원격 대시보드용 /metrics (Prometheus 텍스트, 백그라운드 스레드)
+        metrics.attach_tracer(tracer)
+        self.metrics_server = self._start_metrics_server(settings)
+
+        # AI 진행 막대/남은 시간: 지난 단계별 소요 시간(모델/해상도/시간대)으로 예측 → eta_model.py
+        self.latency_model = LatencyModel(settings.get("ETA_MODEL_PATH", "logs/latency_model.json"))
+        tracer.add_listener(self.latency_model.on_trace)
+        replicate_tasks.PROGRESS_POLL_S = float(settings.get("REPLICATE_PROGRESS_POLL_S", 0.5))
+        self._eta = None
+        self._progress_text = ""
+        self._progress_shown = 0.0
+
+        # 공유 방식: "lan" 이면 내장 서버로 바로 공유 (외부 업로드 없음)
+        self.qr = None  # 처음 QR 만들 때 생성 (requests 세션 포함)
+        self._qr_lock = threading.Lock()  # 복제 스레드도 _ensure_qr 를 부름
+        self.share_server = self._start_share_server(settings)
+
+        # 라벨 표시용 축소본 공용 캐시 (썸네일/슬롯/프레임/미리보기/QR)
+        self.pix_cache = ScaledPixmapCache(max_bytes=64 * 1024 * 1024)
+        self._compose_serial = 0  # 합성할 때마다 +1 → 합성본 캐시 식별자
+
+        # 세션별 결과물(촬영본/AI 결과/합성본/QR URL) 보관 — 쓰기는 전용 스레드에서
+        self.store = self._open_session_store(settings)
+        self.session_id = None
 
         self.ai_running = False
-        self.poses_left = 0
 
         self.stacked = QtWidgets.QStackedWidget()
         self.setCentralWidget(self.stacked)
 
-        # ui/*.ui 를 알파벳 순서로 자동 로드 (first.ui, second.ui, ...)
-        self.pages = []
+        # ui/*.ui 를 알파벳 순서로 (first.ui, second.ui, ...) — 시작할 때는 첫 화면만 로드하고
+        # 나머지는 자리표시 위젯으로 두었다가 첫 화면이 그려진 뒤 한 장씩 (버튼 이미지 디코딩이 큼)
+        self._ui_paths = sorted(glob.glob(resource_path("ui/*.ui")))
+        self.pages = [None] * len(self._ui_paths)
         self.captured_png_bytes = None
 
         self.CANVAS_W = 1181  # px  (100 mm @ 300 DPI)
         self.CANVAS_H = 1748  # px  (148 mm @ 300 DPI)
 
-        self.frame_template_paths = [
-            resource_path("img/frame_1.png"),
-            resource_path("img/frame_2.png"),
-        ]
-        self.frame_templates = []
-        for p in self.frame_template_paths:
-            pm = QPixmap(p)
-            if pm.isNull():
-                pm = QPixmap(self.CANVAS_W, self.CANVAS_H)
-                pm.fill(Qt.black)
-            # 템플릿을 정확히 캔버스 크기로 맞춤 (왜곡 방지하려면 Expanding 후 center-crop로 바꿔도 됨)
-            pm = pm.scaled(
-                self.CANVAS_W,
-                self.CANVAS_H,
-                Qt.IgnoreAspectRatio,
-                Qt.SmoothTransformation,
-            )
-            self.frame_templates.append(pm)
-
-        for ui_path in sorted(glob.glob(resource_path("ui/*.ui"))):
-            w = uic.loadUi(ui_path)
-            self.stacked.addWidget(w)
-            self.pages.append(w)
+        # 프레임 목록은 frame_catalog.json(없으면 img/frame_*.png)에서 읽고,
+        # 템플릿은 선택될 때 캔버스 크기로 디코딩 (전부 미리 올리지 않음)
+        self.frame_catalog = FrameCatalog(
+            QSize(self.CANVAS_W, self.CANVAS_H),
+            settings.get("FRAME_CATALOG_PATH", "frame_catalog.json"),
+        )
 
         if not self.pages:
             QtWidgets.QMessageBox.critical(
@@ -251,70 +368,312 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             sys.exit(1)
 
-        # 버튼 시그널 연결 (각 페이지에 btnNext/btnBack이 있을 때만 연결)
-        for idx, page in enumerate(self.pages):
-            btn_next = getattr(page, "btn_next", None)
-            btn_back = getattr(page, "btn_back", None)
-
-            if btn_next:
-                btn_next.clicked.connect(lambda _, i=idx: self.goto_page(i + 1))
-            if btn_back:
-                btn_back.clicked.connect(lambda _, i=idx: self.goto_page(i - 1))
-
-        self.frame_boxes_norm = [
-            # frame_1: 위/아래
-            [(0.077, 0.113, 0.85, 0.425), (0.07, 0.548, 0.86, 0.428)],
-            # frame_2
-            [(0.077, 0.113, 0.85, 0.425), (0.07, 0.548, 0.86, 0.428)],
-        ]
+        for _ in self.pages:
+            self.stacked.addWidget(QtWidgets.QWidget())
+        # 페이지별 초기 설정 (해당 .ui 를 로드한 직후 실행)
+        self._page_setups = {
+            1: self._write_mode_buttons,
+            2: self._setup_capture_page,
+            3: self._setup_pick2_page,
+            4: self._setup_frame_page,
+            5: self._setup_print_page,
+        }
+        self._load_page(0)
+
+        # 프레임별 위/아래 박스 (카탈로그 기본값 → frame_boxes.json 의 같은 이름 항목으로 덮어씀)
+        self.frame_boxes_norm = self.frame_catalog.boxes_norm()
+        self._saved_boxes = {}  # {프레임 이름: boxes} (지금 카탈로그에 없는 프레임 것도 보존)
 
         self.final_composed_pixmap = QPixmap()
         self.qrcode_pixmap = None
 
+        # 백그라운드 QR 업로드 상태 (프레임 선택 시 미리 시작, 최신 generation만 반영)
+        self._qr_job = None
+        self._qr_gen = 0
+        self._qr_result = None  # (qr_image, page_url)
+        self._qr_debounce = QTimer(self)
+        self._qr_debounce.setSingleShot(True)
+        self._qr_debounce.setInterval(300)
+        self._qr_debounce.timeout.connect(self._start_qr_upload)
+
         self._load_frame_boxes()
 
         self.goto_page(0)  # 첫 화면
-        self._write_mode_buttons()
+        startup_timing.timer.mark("pages")
 
-        self._setup_capture_page()
-        self._setup_pick2_page()
-        self._setup_frame_page()
-        self._setup_print_page()
+        # QR 작업은 전용 풀에서: 전역 풀은 Qt 가 큰 이미지 smooth scaling 을 나눠 돌릴 때 쓰는데,
+        # GUI 스레드가 GIL 을 쥔 채 그걸 기다리는 동안 전역 풀 스레드가 파이썬 작업(GIL 필요)에
+        # 묶여 있으면 서로 기다리며 멈춤 (코어 1개 장비에서 soak 테스트로 재현)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
 
-        if self.btn_next_on_capture:
-            self.btn_next_on_capture.clicked.connect(self._start_ai_pipeline)
+        self.camera_port = settings.get("CAMERA_PORT", "")  ## 카메라 포트 json 추가
+        # 카메라 대신 동영상/녹화본/합성 프레임으로도 촬영 페이지를 돌릴 수 있음 (frame_source.py)
+        self.camera_source = settings.get("CAMERA_SOURCE", "")
+        self.camera_record_dir = settings.get("CAMERA_RECORD_DIR", "")
 
-        if self.pick2_next_btn:
-            self.pick2_next_btn.clicked.connect(
-                lambda: (
-                    self.goto_page(self.frame_page_index),
-                    QTimer.singleShot(
-                        0, lambda: self._choose_frame(self.selected_frame_index)
-                    ),
-                )
-            )
+        self.replicate_token = settings.get("REPLICATE_API_TOKEN", "")
+        if self.replicate_token:
+            os.environ["REPLICATE_API_TOKEN"] = self.replicate_token
 
-        self.pool = QThreadPool().globalInstance()
+        # 인쇄는 대기열 + 워커 스레드 (느린 프린터 드라이버가 화면을 멈추지 않도록)
+        self.print_copies = int(settings.get("PRINT_COPIES", 1))
+        # 여러 매를 한 장에 모아 찍는 배치 (full = 1장 1매, half/quarter/strip)
+        self.print_layout = SheetLayout.preset(
+            settings.get("PRINT_LAYOUT", "full"), settings.get("PRINT_PAPER", "postcard")
+        )
+        self.spooler = PrintSpooler(
+            make_backend(
+                settings.get("PRINT_BACKEND", "printer"),
+                settings.get("PRINTER_NAME", "Canon SELPHY CP1300"),
+            ),
+            self,
+        )
+        self.spooler.job_status.connect(self._on_print_status)
+        metrics.print_queue_depth.set_function(self.spooler.pending)
+
+        self.pose_prompts = self._checked_pose_prompts(settings.get("POSE_PROMPTS")) or POSE_PROMPTS
+
+        # 손님별 AI 작업은 UI와 분리된 파이프라인에서 (세션 간 공용 API 동시성 한도)
+        # PIPELINE_MODE: "single" = 기존처럼 기다렸다 진행, "queue" = 접수 후 다음 손님 바로 촬영
+        self.queue_mode = settings.get("PIPELINE_MODE", "single") == "queue"
+        self.pipeline = SessionPipeline(
+            self.store,
+            self.replicate_token,
+            self.pose_prompts,
+            max_inflight=int(settings.get("AI_MAX_INFLIGHT", 3)),
+            service_url=settings.get("AI_SERVICE_URL", ""),
+            parent=self,
+        )
+        self.pipeline.session_changed.connect(self._on_session_changed)
+        self.pipeline.session_ready.connect(self._on_session_ready)
+        self.pipeline.session_failed.connect(self._on_session_failed)
+        metrics.pipeline_inflight.set_function(self.pipeline.inflight)
+        metrics.pipeline_queued.set_function(self.pipeline.queued_jobs)
+        self._waiting_sid = None
+        self._setup_queue_ui()
+        startup_timing.timer.mark("services")
+
+        # 스태프 화면 (지난 세션 검색/재인쇄): Ctrl+Shift+S
+        QtWidgets.QShortcut(QKeySequence("Ctrl+Shift+S"), self, self._open_staff_dialog)
 
-        self.camera_port = (
-            FileController().load_json().get("CAMERA_PORT", "")
-        )  ## 카메라 포트 json 추가
+        self._load_stylesheet()
 
-        self.replicate_token = (
-            FileController().load_json().get("REPLICATE_API_TOKEN", "")
+        # 이벤트 루프 멈춤 감시 (멈춘 순간의 메인 스레드 스택 + 페이지 → 트레이스)
+        self.watchdog = None
+        if settings.get("STALL_WATCHDOG", True):
+            self.watchdog = StallWatchdog(
+                threshold_ms=int(settings.get("STALL_THRESHOLD_MS", 250)),
+                context=lambda: {"page": self.stacked.currentIndex(), "session": self.session_id},
+                parent=self,
+            )
+            self.watchdog.start()
+
+        # 현장 프로파일링: Ctrl+Shift+P (숨김) 또는 PROFILE_ON_START_S → 세션 저장소에 collapsed stack
+        self._page = self.stacked.currentIndex()
+        self.profile_seconds = float(settings.get("PROFILE_SECONDS", 30))
+        self.profiler = SamplingProfiler(
+            interval_ms=float(settings.get("PROFILE_INTERVAL_MS", 10)),
+            context=lambda: {"page": self._page, "session": self.session_id},
+            on_done=self._save_profile,
+        )
+        QtWidgets.QShortcut(QKeySequence("Ctrl+Shift+P"), self, self._toggle_profiler)
+        if float(settings.get("PROFILE_ON_START_S", 0)) > 0:
+            self.profiler.start(float(settings["PROFILE_ON_START_S"]))
+
+        self._subscribe_config(float(settings.get("CONFIG_POLL_S", 1.0)))
+
+        # 첫 화면이 실제로 그려지는 순간 → 시작 시간 보고 + 나머지 페이지/모듈 미리 로드
+        self.pages[0].installEventFilter(self)
+        startup_timing.timer.mark("window")
+
+    # --- 설정 실시간 반영 ---
+    def _subscribe_config(self, poll_s: float):
+        c = self.config
+        c.subscribe("REPLICATE_API_TOKEN", self._apply_token)
+        c.subscribe(("CAMERA_PORT", "CAMERA_SOURCE", "CAMERA_RECORD_DIR"), self._apply_camera)
+        c.subscribe("AI_MAX_INFLIGHT", lambda ch: self.pipeline.set_max_inflight(ch["AI_MAX_INFLIGHT"]))
+        c.subscribe("POSE_PROMPTS", self._apply_pose_prompts)
+        c.subscribe("FRAME_CATALOG_PATH", self._apply_frame_catalog)
+        c.subscribe(("PRINT_COPIES", "PRINT_LAYOUT", "PRINT_PAPER"), self._apply_print)
+        c.subscribe("PIPELINE_MODE", self._apply_pipeline_mode)
+        c.subscribe(
+            "REPLICATE_PROGRESS_POLL_S",
+            lambda ch: setattr(replicate_tasks, "PROGRESS_POLL_S", ch["REPLICATE_PROGRESS_POLL_S"]),
         )
+        if self.watchdog is not None:
+            c.subscribe(
+                "STALL_THRESHOLD_MS",
+                lambda ch: setattr(self.watchdog, "threshold", ch["STALL_THRESHOLD_MS"] / 1000),
+            )
+        # 카탈로그 파일 자체를 고쳐도 반영
+        c.watch_file(self.frame_catalog.catalog_path, self._reload_frames)
+
+        self._config_timer = QTimer(self)
+        self._config_timer.timeout.connect(c.check)
+        if poll_s > 0:
+            self._config_timer.start(int(poll_s * 1000))
+
+    def _apply_token(self, changed: dict):
+        self.replicate_token = changed["REPLICATE_API_TOKEN"]
         if self.replicate_token:
             os.environ["REPLICATE_API_TOKEN"] = self.replicate_token
+        else:
+            os.environ.pop("REPLICATE_API_TOKEN", None)
+        self.pipeline.set_token(self.replicate_token)
+
+    def _apply_camera(self, changed: dict):
+        self.camera_port = self.config.get("CAMERA_PORT", "")
+        self.camera_source = self.config.get("CAMERA_SOURCE", "")
+        self.camera_record_dir = self.config.get("CAMERA_RECORD_DIR", "")
+        # 촬영 화면에서 카메라가 켜져 있으면 새 설정으로 다시 열기 (카운트다운 중이면 다음 진입 때)
+        if getattr(self, "cap", None) is not None and not self.countdown_timer.isActive():
+            self._stop_camera()
+            self._start_camera()
+
+    @staticmethod
+    def _checked_pose_prompts(value):
+        """비었으면 기본 포즈, 2 ~ PICK2_THUMBS 개의 문자열이면 그대로, 아니면 경고 후 None
+        (1개면 2칸을 못 채워 pick2 에서 못 나가고, 썸네일보다 많으면 버려질 유료 호출)"""
+        if not value:
+            return POSE_PROMPTS
+        if (
+            isinstance(value, list)
+            and 2 <= len(value) <= PICK2_THUMBS
+            and all(isinstance(p, str) and p.strip() for p in value)
+        ):
+            return value
+        print(f"⚠️ [config] POSE_PROMPTS: 문자열 2~{PICK2_THUMBS}개가 아님 → 무시")
+        return None
 
-        POSE_PROMPTS = [
-            "@personA and @personB stand side by side, both smiling and giving a thumbs-up with one hand. Keep @personA and @personB identical to their references (no merging or replacement). Shoulder-to-shoulder, clear front view, 1:1 framing, natural light.",
-            "@personA holds smartphone above head level with the right hand for a selfie, while @personB stands close beside making a V sign with one hand. Both look toward the smartphone. Shoulder-to-shoulder, 1:1 framing. not face and hand distortion",
-            "@personA and @personB each use one hand to form a heart shape together. Shoulder-to-shoulder, 1:1 framing.",
-        ]
+    def _apply_pose_prompts(self, changed: dict):
+        prompts = self._checked_pose_prompts(changed["POSE_PROMPTS"])
+        if prompts is None:
+            return  # 이전 값 유지
+        self.pose_prompts = prompts
+        self.pipeline.set_pose_prompts(self.pose_prompts)
+
+    def _apply_frame_catalog(self, changed: dict):
+        self.config.unwatch_file(self.frame_catalog.catalog_path)
+        self._reload_frames(changed["FRAME_CATALOG_PATH"])
+        self.config.watch_file(self.frame_catalog.catalog_path, self._reload_frames)
+
+    def _reload_frames(self, catalog_path: str = ""):
+        """프레임 목록이 바뀌면 박스/썸네일 다시 만들고, 프레임 화면이면 미리보기도 다시"""
+        self.frame_catalog.reload(catalog_path)
+        self.frame_boxes_norm = self.frame_catalog.boxes_norm()
+        self._load_frame_boxes()
+        if getattr(self, "frame_model", None) is not None:
+            self.frame_model.reload()
+        n = len(self.frame_catalog)
+        if getattr(self, "selected_frame_index", 0) >= n:
+            self.selected_frame_index = 0
+        if getattr(self, "frame_page_index", None) is not None and self.stacked.currentIndex() == self.frame_page_index:
+            self._choose_frame(self.selected_frame_index)
+        print(f"🖼️ frame catalog reloaded ({n} frames)")
+
+    def _apply_print(self, changed: dict):
+        self.print_copies = int(self.config.get("PRINT_COPIES", 1))
+        self.print_layout = SheetLayout.preset(
+            self.config.get("PRINT_LAYOUT", "full"), self.config.get("PRINT_PAPER", "postcard")
+        )
 
-        self.pose_prompts = POSE_PROMPTS
+    def _apply_pipeline_mode(self, changed: dict):
+        self.queue_mode = changed["PIPELINE_MODE"] == "queue"
+        self.queue_btn.setVisible(self.queue_mode)
+        self._update_queue_button()
 
-        self._load_stylesheet()
+    def _start_metrics_server(self, settings: dict):
+        if not settings.get("METRICS_ENABLED", True):
+            return None
+        try:
+            server = metrics.MetricsServer(
+                host=settings.get("METRICS_HOST", "0.0.0.0"),
+                port=int(settings.get("METRICS_PORT", 9108)),
+            )
+            server.start()
+            return server
+        except OSError as e:
+            print("[metrics] 서버 시작 실패:", e)
+            return None
+
+    def _start_share_server(self, settings: dict):
+        if settings.get("SHARE_MODE", "0x0") != "lan":
+            return None
+        mirror = None
+        if settings.get("SHARE_MIRROR", False):
+            # 외부 호스트 복제는 백그라운드에서만 (QR 표시는 기다리지 않음)
+            # QRCODE(requests 포함)는 첫 복제 때 만들고 화면용과 같이 씀 → 시작 시 import 없음
+            mirror = self._mirror_upload
+        try:
+            server = ShareServer(
+                root_dir=settings.get("SHARE_DIR", "share"),
+                port=int(settings.get("SHARE_PORT", 8765)),
+                public_host=settings.get("SHARE_PUBLIC_HOST", ""),
+                mirror=mirror,
+            )
+            server.start()
+            return server
+        except OSError as e:
+            print("[share] 내장 서버 시작 실패, 0x0.st 사용:", e)
+            return None
+
+    def _open_session_store(self, settings: dict) -> SessionStore:
+        store = SessionStore(
+            root=settings.get("SESSION_DIR", "sessions"),
+            max_bytes=int(settings.get("SESSION_MAX_MB", 5120)) * 1024 * 1024,
+            max_age_days=float(settings.get("SESSION_MAX_DAYS", 30)),
+            compress=bool(settings.get("SESSION_COMPRESS", False)),
+            retention_interval=float(settings.get("SESSION_RETENTION_S", 600)),
+        )
+        # 검색/재인쇄용 인덱스는 manifest가 저장될 때마다 따라서 갱신 (정리로 지워진 세션 포함)
+        self.session_index = SessionIndex(os.path.join(store.root, "index.sqlite3"))
+        store.add_listener(self.session_index.on_manifest)
+        if self.session_index.count() == 0:
+            self.session_index.rebuild(store)
+        store.enforce_retention()
+        return store
+
+    def _toggle_profiler(self):
+        if self.profiler.running():
+            self.profiler.stop()  # 일찍 끝내도 그때까지 모은 샘플은 저장
+        else:
+            self.profiler.start(self.profile_seconds)
+
+    def _save_profile(self, folded: str, info: dict):
+        """샘플링 스레드에서 호출 — 진행 중 손님 세션에, 없으면 프로파일 전용 세션에 저장"""
+        sid = self.session_id or (info["sessions"][-1] if info["sessions"] else None)
+        if sid is None or self.store.manifest(sid) is None:
+            sid = self.store.new_session("profile")
+        kind = "profile_" + time.strftime("%H%M%S")
+        self.store.put(sid, kind, folded.encode("utf-8"), "folded")
+        self.store.set_meta(sid, **{kind: info})
+        print(f"🔬 profile saved → {sid}/{kind} ({info['samples']} samples, {info['overhead_pct']}% CPU)")
+
+    def _open_staff_dialog(self):
+        dlg = StaffDialog(
+            self.session_index,
+            self.store,
+            self.spooler,
+            qr=self._ensure_qr(),
+            layout=self.print_layout,
+            copies=self.print_copies,
+            parent=self,
+        )
+        dlg.exec_()
+
+    def _ensure_qr(self) -> QRCODE:
+        with self._qr_lock:
+            if self.qr is None:
+                self.qr = self._new_qr()
+            return self.qr
+
+    def _mirror_upload(self, data: bytes, filename: str) -> str:
+        """내장 서버 복제 콜백 (복제 스레드에서 호출)"""
+        return self._ensure_qr().upload_to_0x0st(data, filename)
+
+    def _new_qr(self) -> QRCODE:
+        return QRCODE(share_server=self.share_server)
 
     def _load_stylesheet(self):
         # stylesheet.qss 파일 로드
@@ -401,10 +760,15 @@ class MainWindow(QtWidgets.QMainWindow):
             self.future_label.style().polish(self.future_label)
             self.future_label.update()
 
+        # --- 세션 종료 (남은 쓰기는 writer 스레드가 마저 처리) ---
+        if getattr(self, "session_id", None):
+            self.store.enforce_retention()
+            self.pix_cache.discard(self.session_id)
+        self.session_id = None
+
         # --- 캡처/AI 파이프라인 상태 초기화 (카메라 off 안 함) ---
+        # (대기열 모드에서 진행 중인 다른 손님 세션은 파이프라인이 따로 보관)
         self.ai_running = False
-        self.poses_left = 0
-        self._pose_done_count = 0
         self.candidates = []
         self.final_slots = [None, None]
         self.slot_source = [None, None]
@@ -444,20 +808,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.selected_frame_index = 0
         if hasattr(self, "frame_preview") and self.frame_preview:
             self.frame_preview.clear()
-        if hasattr(self, "frame_opt_labels"):
-            for i, frame in enumerate(self.frame_opt_labels):
-                if frame:
-                    # 썸네일 원래대로
-                    frame.setStyleSheet(
-                        self._frame_thumb_style
-                        if hasattr(self, "_frame_thumb_style")
-                        else ""
-                    )
-                    if (
-                        i < len(getattr(self, "frame_templates", []))
-                        and not self.frame_templates[i].isNull()
-                    ):
-                        self._set_pix_to_label(frame, self.frame_templates[i])
+        if getattr(self, "frame_list", None) and self.frame_list.model():
+            # 썸네일은 모델 캐시에 그대로 두고 선택/스크롤만 처음으로
+            self.frame_list.setCurrentIndex(self.frame_list.model().index(0, 0))
+            self.frame_list.scrollToTop()
         self.final_composed_pixmap = QPixmap()
 
         # --- 인쇄 페이지 미리보기 리셋 ---
@@ -465,12 +819,12 @@ class MainWindow(QtWidgets.QMainWindow):
             self.print_preview.clear()
 
         # --- ✅ QR 상태 초기화 추가 ---
+        self._cancel_qr_upload()
         self.qrcode_pixmap = None
         if hasattr(self, "qrcode_label") and self.qrcode_label:
             self.qrcode_label.clear()
             self.qrcode_label.setToolTip("")
-        if hasattr(self, "qr"):
-            self.qr = QRCODE()  # 새 인스턴스로 교체해서 URL 중복 방지
+        # self.qr 은 유지 → 공유 URL 캐시로 재인쇄/재공유 시 업로드 생략
 
     def _setup_print_page(self):
         """6번째 인쇄 페이지 초기 설정"""
@@ -513,27 +867,102 @@ class MainWindow(QtWidgets.QMainWindow):
             and hasattr(self, "final_composed_pixmap")
             and not self.final_composed_pixmap.isNull()
         ):
-            self._set_pix_to_label(self.print_preview, self.final_composed_pixmap)
+            self._set_pix_to_label(
+                self.print_preview,
+                self.final_composed_pixmap,
+                (self.session_id, "composite", self._compose_serial),
+            )
 
-        # ⬇️ 여기 조건 간단히: 라벨만 있으면 생성/표시 시도
+        # 최종 합성본 저장 (PNG 인코딩은 writer 스레드에서, 같은 내용이면 중복 저장 안 함)
+        if self.session_id and not self.final_composed_pixmap.isNull():
+            self.store.put_image(
+                self.session_id, "composite", self.final_composed_pixmap.toImage()
+            )
+            self.store.set_meta(self.session_id, frame=self.selected_frame_index)
+
+        # QR은 프레임 선택 때 이미 백그라운드로 시작됨 → 결과가 있으면 표시, 없으면 자리표시
         if getattr(self, "qrcode_label", None):
-            try:
-                # QRCODE 인스턴스가 없다면 만들어두기
-                if not hasattr(self, "qr") or self.qr is None:
-                    self.qr = QRCODE()
-
-                qr_path, page_url = self.qr.run(self.final_composed_pixmap)
-
-                # 생성된 QR 이미지를 라벨에 표시 (헬퍼 재사용)
-                self.qrcode_pixmap = QPixmap(qr_path)
-                if not self.qrcode_pixmap.isNull():
-                    self._set_pix_to_label(self.qrcode_label, self.qrcode_pixmap)
-                    self.qrcode_label.setToolTip(page_url)
-                else:
-                    print("⚠️ QR 이미지 로드 실패:", qr_path)
+            if self._qr_result is not None:
+                self._show_qr(*self._qr_result)
+            else:
+                self.qrcode_label.clear()
+                self.qrcode_label.setAlignment(Qt.AlignCenter)
+                self.qrcode_label.setText("QR 코드 생성 중...")
+                if self._qr_debounce.isActive() or self._qr_job is None:
+                    # 대기 중인 예약이 있으면 기다리지 않고 바로 시작
+                    self._qr_debounce.stop()
+                    self._start_qr_upload()
+
+    def _schedule_qr_upload(self):
+        """프레임 선택이 바뀌면 이전 업로드를 취소하고 잠깐 뒤 새로 시작 (연속 클릭 묶기)"""
+        self._cancel_qr_upload()
+        self._qr_debounce.start()
+
+    def _cancel_qr_upload(self):
+        self._qr_debounce.stop()
+        self._qr_gen += 1  # 진행 중인 작업 결과는 무시됨
+        self._qr_result = None
+        if self._qr_job is not None:
+            self._qr_job.cancel()
+            self.pool.tryTake(self._qr_job)  # 아직 시작 전이면 큐에서 제거
+            self._qr_job = None
+
+    def _start_qr_upload(self):
+        if self.final_composed_pixmap.isNull():
+            return
+        # QRCODE 인스턴스가 없다면 만들어두기
+        self._ensure_qr()
+
+        side = 480
+        if getattr(self, "qrcode_label", None):
+            side = max(64, min(self.qrcode_label.width(), self.qrcode_label.height()))
+        job = QrJob(
+            self.qr,
+            self.final_composed_pixmap.toImage(),
+            self._qr_gen,
+            qr_side=side,
+            session_id=self.session_id,
+        )
+        job.setAutoDelete(False)  # cancel()/tryTake()용으로 참조 유지
+        job.signals.qr_done.connect(self._on_qr_done)
+        job.signals.error.connect(self._on_qr_error)
+        job.signals.progress.connect(self._on_qr_progress)
+        self._qr_job = job
+        self.pool.start(job)
 
-            except Exception as e:
-                print("QR 생성 실패:", e)
+    def _on_qr_done(self, generation: int, qr_img: QImage, page_url: str):
+        if generation != self._qr_gen:
+            return  # 이미 다른 프레임으로 바뀐 요청
+        self._qr_job = None
+        self._qr_result = (qr_img, page_url)
+        self.store.set_meta(self.session_id, share_url=page_url)
+        if self.stacked.currentIndex() == self.print_page_index:
+            self._show_qr(qr_img, page_url)
+
+    def _on_qr_progress(self, generation: int, sent: int, total: int):
+        if generation != self._qr_gen or self._qr_result is not None:
+            return
+        if getattr(self, "qrcode_label", None) and self.qrcode_label.pixmap() is None:
+            self.qrcode_label.setText(f"QR 코드 생성 중... {sent * 100 // max(1, total)}%")
+
+    def _on_qr_error(self, generation: int, msg: str):
+        if generation != self._qr_gen:
+            return
+        self._qr_job = None
+        print("QR 생성 실패:", msg)
+        if getattr(self, "qrcode_label", None):
+            self.qrcode_label.setText("QR 코드를 만들지 못했습니다.")
+
+    def _show_qr(self, qr_img: QImage, page_url: str):
+        # 메모리에서 만든 QR을 바로 표시 (이미 라벨 크기로 렌더링됨)
+        self.qrcode_pixmap = QPixmap.fromImage(qr_img)
+        if not self.qrcode_pixmap.isNull():
+            self.qrcode_label.setText("")
+            self.qrcode_label.setAlignment(Qt.AlignCenter)
+            self.qrcode_label.setPixmap(self.qrcode_pixmap)
+            self.qrcode_label.setToolTip(page_url)
+        else:
+            print("⚠️ QR 이미지 생성 실패:", page_url)
 
     def _print_final_frame(self):
         if (
@@ -542,56 +971,76 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.warning(self, "오류", "출력할 이미지가 없습니다.")
             return
 
-        pm = self.final_composed_pixmap
-
-        printer = QPrinter(QPrinter.HighResolution)
-        printer.setOutputFormat(QPrinter.NativeFormat)
-        printer.setPrinterName("Canon SELPHY CP1300")  # 기본 프린터 쓰면 주석
-
-        # 100×148mm, 테두리 없음(드라이버에서 Borderless 선택)
-        printer.setPaperSize(QSizeF(100, 148), QPrinter.Millimeter)
-        printer.setFullPage(True)
-        printer.setPageMargins(0, 0, 0, 0, QPrinter.Millimeter)
-        printer.setOrientation(QPrinter.Portrait)
-        printer.setResolution(300)
-
-        painter = QPainter(printer)
-        # === 포인트: 윈도우 좌표를 "이미지 픽셀 크기"로 설정하여 1:1 매핑 ===
-        painter.setWindow(0, 0, self.CANVAS_W, self.CANVAS_H)
-        painter.drawPixmap(
-            0, 0, pm
-        )  # 스케일 없이 꽉 채움 (드라이버가 그대로 용지에 맞춤)
-        painter.end()
-
-        QtWidgets.QMessageBox.information(
-            self, "인쇄", "✅ 프린터로 전송했습니다. 인쇄가 완료되면 가져가세요."
+        # 인쇄용 비트맵(캔버스 = 100×148mm @300DPI)은 여기서 한 번만 만들고 워커로 넘김
+        image = self.final_composed_pixmap.toImage()
+        self.spooler.submit(
+            image,
+            copies=self.print_copies,
+            layout=self.print_layout,
+            session_id=self.session_id,
         )
 
+    def _on_print_status(self, job_id: int, status: str, info: dict):
+        if not self.btn_print:
+            return
+        pending = info.get("pending", 0)
+        if status in ("queued", "printing") or pending:
+            self.btn_print.setText(f"인쇄 중... (대기 {pending}건)")
+            return
+        self.btn_print.setText("인쇄하기")
+        if status == "failed":
+            box = QtWidgets.QMessageBox(
+                QtWidgets.QMessageBox.Warning,
+                "인쇄",
+                f"인쇄에 실패했습니다: {info.get('error', '')}",
+                parent=self,
+            )
+        else:
+            box = QtWidgets.QMessageBox(
+                QtWidgets.QMessageBox.Information,
+                "인쇄",
+                "✅ 프린터로 전송했습니다. 인쇄가 완료되면 가져가세요.",
+                parent=self,
+            )
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.open()  # exec_() 대신 비모달 → 다음 손님 흐름을 막지 않음
+
     def _load_frame_boxes(self):
+        """frame_boxes.json = {카탈로그 항목 이름: [위 박스, 아래 박스]} → 이름이 같은 프레임에 적용
+        (목록 순서를 바꾸거나 항목을 넣고 빼도 박스가 다른 템플릿으로 옮겨가지 않음)"""
         try:
             if os.path.exists(self._frame_boxes_path):
-                with open(self._frame_boxes_path, "r", encoding="utf-8") as f:
+                with open(self._frame_boxes_path, "r", encoding="utf-8-sig") as f:
                     data = json.load(f)
-                # 간단 검증 (프레임 수/박스 수 같을 때만 반영)
-                if isinstance(data, list) and all(
-                    isinstance(x, list) and len(x) == 2 for x in data
-                ):
-                    self.frame_boxes_norm = data
+                if isinstance(data, list):
+                    # 예전 형식 (위치 기준 목록) → 지금 카탈로그 순서로 한 번 옮기고, 다음 저장부터 이름 기준
+                    names = [e.name for e in self.frame_catalog.entries]
+                    data = dict(zip(names, data))
+                if isinstance(data, dict):
+                    # 간단 검증 (박스 2개짜리만 반영, 없는 프레임은 카탈로그 기본값)
+                    self._saved_boxes = {
+                        k: v for k, v in data.items() if isinstance(v, list) and len(v) == 2
+                    }
         except Exception as e:
             print("[frame_boxes] load failed:", e)
+        for i, entry in enumerate(self.frame_catalog.entries):
+            boxes = self._saved_boxes.get(entry.name)
+            if boxes is not None:
+                self.frame_boxes_norm[i] = boxes
 
     def _save_frame_boxes(self):
+        for entry, boxes in zip(self.frame_catalog.entries, self.frame_boxes_norm):
+            self._saved_boxes[entry.name] = [list(b) for b in boxes]
         try:
-            with open(self._frame_boxes_path, "w", encoding="utf-8") as f:
-                json.dump(self.frame_boxes_norm, f, ensure_ascii=False, indent=2)
+            write_json_atomic(self._frame_boxes_path, self._saved_boxes)
         except Exception as e:
             print("[frame_boxes] save failed:", e)
 
     def _compose_frame(self, idx: int) -> QPixmap:
-        if not (0 <= idx < len(self.frame_templates)):
+        if not (0 <= idx < len(self.frame_catalog)):
             return QPixmap()
 
-        base = self.frame_templates[idx]
+        base = self.frame_catalog.template(idx)
         if base.isNull() or not all(self.final_slots):
             return QPixmap()
 
@@ -668,7 +1117,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.progress_label.setFont(font)
 
         self.progress_bar = QtWidgets.QProgressBar()
-        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setRange(0, 1000)  # 0.1% 단위 (타이머로 부드럽게)
         self.progress_bar.setValue(0)
         self.progress_bar.setTextVisible(False)
         self.progress_bar.setFixedHeight(18)
@@ -687,10 +1136,16 @@ class MainWindow(QtWidgets.QMainWindow):
         # 크기 및 중앙 배치
         self.progress_dlg.resize(420, 120)
 
+        # 진행 막대는 단계가 끝날 때가 아니라 타이머로 예측값을 따라감 (processEvents 없이)
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(100)
+        self._progress_timer.timeout.connect(self._tick_progress)
+
     def _show_progress(self, text="AI 이미지 변환 중 ...", value=0):
         self._init_progress_ui()
-        self.progress_label.setText(f"{text} {int(value)}%")
-        self.progress_bar.setValue(int(value))
+        self._progress_text = text
+        self._progress_shown = value / 100
+        self._render_progress(None)
 
         geo = self.frameGeometry()
         center = geo.center()
@@ -700,15 +1155,47 @@ class MainWindow(QtWidgets.QMainWindow):
         self.progress_dlg.move(dlg_geo.topLeft())
         self.progress_dlg.show()
 
-        QtWidgets.QApplication.processEvents()
+    def _start_eta(self, sess):
+        """세션 일정 추정을 세우고 진행 타이머 시작"""
+        self._eta = SessionEta(
+            self.latency_model,
+            len(sess.poses),
+            max_inflight=self.pipeline.max_inflight,
+            spacing_s=self.pipeline.start_spacing_ms / 1000,
+            age_model=AGE_MODEL,
+            pose_model=POSE_MODEL,
+            resolution="720p",
+        )
+        self._progress_timer.start()
+
+    def _tick_progress(self):
+        sess = self.pipeline.get(self._waiting_sid) if self._waiting_sid else None
+        if sess is None or self._eta is None:
+            return
+        now = time.monotonic()
+        target = self._eta.fraction(sess, now)
+        # 목표값으로 조금씩 다가감 (뒤로 가지 않음)
+        self._progress_shown = max(self._progress_shown, self._progress_shown + (target - self._progress_shown) * 0.2)
+        self._render_progress(self._eta.remaining(sess, now))
+
+    def _render_progress(self, remaining_s):
+        pct = int(self._progress_shown * 100)
+        text = f"{self._progress_text} … {pct}%"
+        if remaining_s is not None and self._progress_shown < 1:
+            text += f"\n약 {max(1, int(round(remaining_s)))}초 남음"
+        self.progress_bar.setValue(int(self._progress_shown * 1000))
+        self.progress_label.setText(text)
 
     def _update_progress(self, text, value):
         if hasattr(self, "progress_dlg") and self.progress_dlg.isVisible():
-            self.progress_bar.setValue(int(value))
-            self.progress_label.setText(f"{text} … {int(value)}%")
-            QtWidgets.QApplication.processEvents()
+            self._progress_text = text
+            self._progress_shown = max(self._progress_shown, value / 100)
+            self._render_progress(None)
 
     def _hide_progress(self):
+        if hasattr(self, "progress_dlg") and self.progress_dlg is not None:
+            self._progress_timer.stop()
+            self._eta = None
         if hasattr(self, "progress_dlg") and self.progress_dlg.isVisible():
             self.progress_dlg.hide()
 
@@ -717,6 +1204,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.cap = None
         self.video_timer = QTimer(self)
         self.video_timer.timeout.connect(self._draw_frame)
+        self._frame_meter = metrics.FrameMeter(30)
 
         self.countdown_timer = QTimer(self)
         self.countdown_timer.timeout.connect(self._tick_countdown)
@@ -746,6 +1234,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
             if self.btn_capture:
                 self.btn_capture.clicked.connect(self._start_countdown)
+            if self.btn_next_on_capture:
+                self.btn_next_on_capture.clicked.connect(self._start_ai_pipeline)
 
     def _enter_capture_page(self):
         self.captures.clear()
@@ -759,23 +1249,31 @@ class MainWindow(QtWidgets.QMainWindow):
         self._start_camera()
 
     def _start_camera(self):
-        if cv2 is None:
+        try:
+            from frame_source import open_source  # cv2/numpy 는 촬영 페이지에서 처음 필요
+        except ImportError:
             QtWidgets.QMessageBox.critical(
                 self, "오류", "OpenCV(cv2)가 설치되어 있지 않습니다."
             )
             return
         if self.cap is not None:
             return
-        self.cap = cv2.VideoCapture(self.camera_port)  ##
+        try:
+            self.cap = open_source(self.camera_source, self.camera_port, self.camera_record_dir)
+        except (ValueError, OSError) as e:
+            QtWidgets.QMessageBox.critical(self, "오류", f"카메라 소스 설정 오류: {e}")
+            return
         if not self.cap.isOpened():
             QtWidgets.QMessageBox.critical(self, "오류", "카메라를 열 수 없습니다.")
             self.cap.release()
             self.cap = None
             return
+        self._frame_meter.reset()
         self.video_timer.start(30)  # ~33fps 사진 미리 보기용. 없으면 프레임 멈쳐있음
 
     def _stop_camera(self):
         self.video_timer.stop()
+        self._frame_meter.reset()
         self.countdown_timer.stop()
         if self.cap is not None:
             self.cap.release()
@@ -785,8 +1283,10 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.cap is None or self.lbl_webcam is None:
             return
         ok, frame = self.cap.read()
+        self._frame_meter.tick(ok)
         if not ok:
             return
+        import cv2
 
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         h, w, ch = rgb.shape
@@ -829,9 +1329,13 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.lbl_countdown.setText("찰칵!")
 
             if hasattr(self, "_last_frame_bgr") and self._last_frame_bgr is not None:
+                import cv2
+
+                t0 = time.monotonic()
                 success, buf = cv2.imencode(
                     ".png", self._last_frame_bgr
                 )  # self._last_frame_bgr로 교체
+                self._capture_encode = (t0, time.monotonic() - t0)
                 if success:
                     self.captured_png_bytes = bytes(buf)
                 else:
@@ -942,11 +1446,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.sel_labels = [getattr(page, "sel_1", None), getattr(page, "sel_2", None)]
 
-        self.thumb_labels = [
-            getattr(page, "thumb_1", None),
-            getattr(page, "thumb_2", None),
-            getattr(page, "thumb_3", None),
-        ]
+        self.thumb_labels = [getattr(page, f"thumb_{i}", None) for i in range(1, PICK2_THUMBS + 1)]
 
         self.pick2_next_btn = getattr(page, "btn_next", None)
 
@@ -975,16 +1475,24 @@ class MainWindow(QtWidgets.QMainWindow):
 
         if self.pick2_next_btn:
             self.pick2_next_btn.setEnabled(False)
+            self.pick2_next_btn.clicked.connect(
+                lambda: (
+                    self.goto_page(self.frame_page_index),
+                    QTimer.singleShot(
+                        0, lambda: self._choose_frame(self.selected_frame_index)
+                    ),
+                )
+            )
 
     def _enter_pick2_page(self, pixmaps: list):
         if self.pick2_page_index is None:
             return
-        self.candidates = pixmaps[:4]
+        self.candidates = pixmaps[: len(self.thumb_labels)]
         for i, lbl in enumerate(self.thumb_labels):
             if not lbl:
                 continue
             if i < len(self.candidates) and isinstance(self.candidates[i], QPixmap):
-                self._set_pix_to_label(lbl, self.candidates[i])
+                self._set_pix_to_label(lbl, self.candidates[i], (self.session_id, "cand", i))
                 lbl.setEnabled(True)
                 lbl.setStyleSheet(self._thumb_style)
                 lbl.setToolTip("클릭하면 위의 빈 칸에 들어갑니다.")
@@ -1027,7 +1535,7 @@ class MainWindow(QtWidgets.QMainWindow):
         # 슬롯에 그리기
         target_lbl = self.sel_labels[slot_idx]
         if target_lbl:
-            self._set_pix_to_label(target_lbl, pix)
+            self._set_pix_to_label(target_lbl, pix, (self.session_id, "cand", t_index))
             target_lbl.setStyleSheet(self._filled_style)
             target_lbl.setText("")
 
@@ -1039,13 +1547,14 @@ class MainWindow(QtWidgets.QMainWindow):
         if all(self.final_slots) and self.pick2_next_btn:
             self.pick2_next_btn.setEnabled(True)
 
-    def _set_pix_to_label(self, lbl, pix: QPixmap):
-        """라벨 크기에 맞춰 비율 유지로 그림(왜곡 방지)"""
+    def _set_pix_to_label(self, lbl, pix: QPixmap, source=None):
+        """라벨 크기에 맞춰 비율 유지로 그림(왜곡 방지)
+        source = 원본 식별자 (세션 id, 종류, ...) → 같은 원본·크기는 캐시 재사용"""
         if not lbl or pix.isNull():
             return
         lbl.setAlignment(Qt.AlignCenter)
         target = lbl.size()
-        lbl.setPixmap(pix.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        lbl.setPixmap(self.pix_cache.scaled(pix, target, Qt.KeepAspectRatio, source))
 
     def _clear_slot(self, slot_idx: int):
         if not (0 <= slot_idx < 2):
@@ -1075,6 +1584,18 @@ class MainWindow(QtWidgets.QMainWindow):
             self.pick2_next_btn.setEnabled(False)
 
     def _start_ai_pipeline(self):
+        if not self.captured_png_bytes:
+            return
+        mode = "past" if (self.selected_mode in (None, "past")) else "future"
+
+        if self.queue_mode:
+            # 접수만 하고 바로 다음 손님 촬영 가능 (결과는 대기열 화면에서 가져감)
+            sess = self.pipeline.submit(self.captured_png_bytes, mode)
+            self._trace_capture(sess.id)
+            self._show_ticket(sess.number)
+            self.goto_page(0)
+            return
+
         if self.ai_running:
             return
         self.ai_running = True
@@ -1084,8 +1605,6 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self._show_progress("AI 이미지 변환 중…", 0)
 
-        mode = "past" if (self.selected_mode in (None, "past")) else "future"
-
         if self.pick2_page_index is not None:
             for i, lbl in enumerate(self.thumb_labels):
                 if lbl:
@@ -1095,7 +1614,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     lbl.setEnabled(False)
                     lbl.setStyleSheet(self._thumb_disabled)
 
-            self.candidates = [None, None, None, None]
+            self.candidates = [None] * len(self.thumb_labels)
 
             for lbl in self.sel_labels:
                 if lbl:
@@ -1106,88 +1625,124 @@ class MainWindow(QtWidgets.QMainWindow):
             if self.pick2_next_btn:
                 self.pick2_next_btn.setEnabled(False)
 
-        self._age_weight = 25.0
-        self._pose_weight_total = 75.0
-        self._pose_per = self._pose_weight_total / max(1, len(self.pose_prompts))
-        self._pose_done_count = 0
+        sess = self.pipeline.submit(self.captured_png_bytes, mode)
+        self._trace_capture(sess.id)
+        self._waiting_sid = sess.id
+        self._start_eta(sess)
 
-        job = AgeJob(self.captured_png_bytes, mode, token=self.replicate_token, seed=42)
-        job.signals.age_done.connect(self._on_age_done)
-        job.signals.error.connect(self._on_ai_error)
-        self.pool.start(job)
+    def _trace_capture(self, sid: str):
+        if self._capture_encode is not None:
+            t0, secs = self._capture_encode
+            tracer.record("capture.encode", t0, secs, session=sid)
+            self._capture_encode = None
 
-    def _on_ai_error(self, msg: str):
+    def _on_session_changed(self, sid: str):
+        self._update_queue_button()
+        if sid != self._waiting_sid:
+            return
+        sess = self.pipeline.get(sid)
+        if sess is not None and sess.state in ("aging", "posing"):
+            # 막대 값은 _tick_progress 가 예측으로 갱신, 여기서는 문구만
+            self._progress_text = "AI 이미지 변환 중" if sess.state == "aging" else "타임머신 완료, 포즈 생성 중"
+
+    def _on_session_ready(self, sid: str):
+        if sid != self._waiting_sid:
+            return  # 대기열 모드: 손님이 대기열 화면에서 가져감
+        self._waiting_sid = None
+        self.ai_running = False
+        self._update_progress("변환이 완료되었습니다.", 100)
+        self._hide_progress()
+        self.latency_model.forget(sid)
+        self.latency_model.save()
+        self._load_session(sid)
+
+    def _on_session_failed(self, sid: str, msg: str):
+        print("AI 생성 오류:", msg)
+        # session_failed 는 세션이 최종 실패했을 때만 옴 (포즈 일부 실패는 파이프라인이 기록만)
+        if sid != self._waiting_sid:
+            return
+        self._waiting_sid = None
+        self.ai_running = False
+        self._hide_progress()
+        self.latency_model.forget(sid)
+        self.pipeline.discard(sid)
         QtWidgets.QMessageBox.warning(self, "AI 생성 오류", msg)
 
-    def _on_age_done(self, base_url: str):
-        # 🔍 base_url이 URL이면 이미지 저장 (디버그용)
-        import requests
-
-        try:
-            if isinstance(base_url, str) and base_url.startswith("http"):
-                response = requests.get(base_url, timeout=10)
-                if response.status_code == 200:
-                    with open("my-image.png", "wb") as f:
-                        f.write(response.content)
-                    print("[DEBUG] Saved base_url image → my-image.png")
-                else:
-                    print(
-                        f"[DEBUG] Failed to download image, status={response.status_code}"
-                    )
-            else:
-                print(f"[DEBUG] base_url is not a valid URL: {base_url}")
-        except Exception as e:
-            print(f"[DEBUG] Error saving base_url image: {e}")
-
-        inputs = [base_url]
-        if hasattr(self, "captured_png_bytes") and self.captured_png_bytes:
-            inputs.append(self.captured_png_bytes)
-
-        self.poses_left = len(self.pose_prompts)
-
-        for i, p in enumerate(self.pose_prompts):
-            job = PoseJob(
-                inputs=inputs,
-                pose_prompt=p,
-                index=i,
-                token=self.replicate_token,
-                seed=42,
-                aspect_ratio="1:1",
-                resolution="720p",
-            )
-            job.signals.pose_done.connect(self._on_pose_done_bytes)
-            job.signals.error.connect(self._on_ai_error)
-            QTimer.singleShot(i * 2000, lambda j=job: self.pool.start(j))
-
-    def _on_pose_done_bytes(self, index, data: bytes):
-        # 모델 출력(한 장) 그대로 썸네일에 표시
-        pm = QPixmap()
-        pm.loadFromData(data)
-
-        if 0 <= index < len(self.thumb_labels):
-            lbl = self.thumb_labels[index]
-            if lbl and not pm.isNull():
-                self._set_pix_to_label(lbl, pm)
-                lbl.setEnabled(True)
-                lbl.setStyleSheet(self._thumb_style)
-                lbl.setToolTip("클릭하면 위의 빈 칸에 들어갑니다.")
-                if index < len(self.candidates):
-                    self.candidates[index] = pm
-
-        self._pose_done_count += 1
-        progress = (
-            self._age_weight
-            + min(self._pose_done_count, len(self.pose_prompts)) * self._pose_per
+    def _load_session(self, sid: str):
+        """완료된 세션 결과를 pick2 화면에 올림 (이 시점에 QPixmap 생성)"""
+        sess = self.pipeline.pick(sid)
+        if sess is None:
+            return
+        self._ensure_pages()
+        self.session_id = sess.id
+        self.selected_mode = sess.mode
+        self.captured_png_bytes = sess.capture_png
+        pixmaps = []
+        for data in sess.poses:
+            pm = QPixmap()
+            if data:
+                pm.loadFromData(data)
+            pixmaps.append(pm if not pm.isNull() else None)
+        if self.pick2_page_index is not None:
+            self.goto_page(self.pick2_page_index)
+            self._enter_pick2_page(pixmaps)
+            for lbl in self.thumb_labels:
+                if lbl and lbl.isEnabled():
+                    lbl.setToolTip("클릭하면 위의 빈 칸에 들어갑니다.")
+
+    def _setup_queue_ui(self):
+        """대기열 모드일 때 첫 화면에 대기열 버튼 + 접수 번호 안내"""
+        home = self.stacked.widget(0)
+        self.queue_btn = QtWidgets.QPushButton("대기열", home)
+        self.queue_btn.setObjectName("queue_button")
+        self.queue_btn.setStyleSheet(
+            "QPushButton#queue_button { background:#2E6B3F; color:white; font-size:22px;"
+            " border-radius:12px; padding:10px 18px; }"
         )
-        self._update_progress("타임머신 완료, 포즈 생성 중", progress)
+        self.queue_btn.clicked.connect(self._open_queue_dialog)
+        self.queue_btn.setVisible(self.queue_mode)
+
+        self.ticket_label = QtWidgets.QLabel(self)
+        self.ticket_label.setAlignment(Qt.AlignCenter)
+        self.ticket_label.setStyleSheet(
+            "background:rgba(17,17,17,220); color:#fff; font-size:28px;"
+            " border:2px solid #4CAF50; border-radius:16px; padding:24px;"
+        )
+        self.ticket_label.hide()
+        self._ticket_timer = QTimer(self)
+        self._ticket_timer.setSingleShot(True)
+        self._ticket_timer.timeout.connect(self.ticket_label.hide)
+        self._update_queue_button()
+
+    def _update_queue_button(self):
+        btn = getattr(self, "queue_btn", None)
+        if not btn or not self.queue_mode:
+            return
+        ready, total = len(self.pipeline.ready()), len(self.pipeline.active())
+        btn.setText(f"대기열  완료 {ready} / {total}")
+        btn.adjustSize()
+        page = btn.parentWidget()
+        btn.move(page.width() - btn.width() - 24, 24)
+        btn.raise_()
+
+    def _show_ticket(self, number: int):
+        self.ticket_label.setText(
+            f"접수 번호 #{number}\n사진을 만드는 중입니다.\n완료되면 대기열에서 골라주세요."
+        )
+        self.ticket_label.adjustSize()
+        self.ticket_label.move(
+            (self.width() - self.ticket_label.width()) // 2,
+            (self.height() - self.ticket_label.height()) // 2,
+        )
+        self.ticket_label.show()
+        self.ticket_label.raise_()
+        self._ticket_timer.start(3000)
 
-        self.poses_left -= 1
-        if self.poses_left <= 0:
-            self.ai_running = False
-            self._update_progress("변환이 완료되었습니다.", 100)
-            self._hide_progress()
-            if self.pick2_page_index is not None:
-                self.goto_page(self.pick2_page_index)
+    def _open_queue_dialog(self):
+        dlg = QueueDialog(self.pipeline, self)
+        dlg.setAttribute(Qt.WA_DeleteOnClose)
+        dlg.session_chosen.connect(self._load_session)
+        dlg.open()
 
     def _setup_frame_page(self):
         self.frame_page_index = None
@@ -1198,46 +1753,41 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         self.frame_preview = getattr(page, "frame_preview", None)
-        self.frame_opt_labels = [
-            getattr(page, "frame_opt_1", None),
-            getattr(page, "frame_opt_2", None),
-        ]
+        self.frame_list = getattr(page, "frame_list", None)
 
+        # 썸네일 항목 스타일 (hover/선택 시 레드 테두리)
         self._frame_thumb_style = """
-            QFrame {
+            QListView {
+                border: none;
+                background-color: transparent;
+            }
+            QListView::item {
                 border: 2px solid transparent;
                 border-radius: 12px;
                 background-color: transparent;
             }
-            QFrame:hover {
+            QListView::item:hover {
                 border: 2px solid #C94C46; /* 크리스마스 브릭 레드 */
                 background-color: rgba(201, 76, 70, 0.15); /* 크리스마스 레드 투명 */
             }
+            QListView::item:selected {
+                border: 2px solid #C94C46;   /* 포인트 레드 */
+                background-color: #C94C46;   /* 깊은 크리스마스 레드 */
+            }
             """
 
-        self._frame_thumb_selected = """
-        QFrame {
-            border: 2px solid #C94C46;   /* 포인트 레드 */
-            border-radius: 12px;
-            background-color: #C94C46;   /* 깊은 크리스마스 레드 */
-        }
-        """
-
-        for frame in self.frame_opt_labels:
-            if frame:
-                frame.setStyleSheet(self._frame_thumb_style)
-
-        for i, frame in enumerate(self.frame_opt_labels):
-            if not frame:
-                continue
-            frame.setStyleSheet(self._frame_thumb_style)
-            if i < len(self.frame_templates) and not self.frame_templates[i].isNull():
-                self._set_pix_to_label(frame, self.frame_templates[i])  # ★ 썸네일 표시
-            # 클릭 연결 (QLabel이면 mousePressEvent로 대체)
-            try:
-                frame.clicked.connect(lambda idx=i: self._choose_frame(idx))
-            except Exception:
-                frame.mousePressEvent = lambda ev, idx=i: self._choose_frame(idx)
+        if self.frame_list:
+            # 보이는 항목만 모델에 요청 → 썸네일은 그때 백그라운드로 디코딩
+            self.frame_model = FrameThumbModel(self.frame_catalog, parent=self)
+            self.frame_list.setModel(self.frame_model)
+            self.frame_list.setWrapping(False)
+            self.frame_list.setMovement(QtWidgets.QListView.Static)
+            self.frame_list.setIconSize(self.frame_model.thumb_size)
+            self.frame_list.setSelectionMode(
+                QtWidgets.QAbstractItemView.SingleSelection
+            )
+            self.frame_list.setStyleSheet(self._frame_thumb_style)
+            self.frame_list.clicked.connect(lambda mi: self._choose_frame(mi.row()))
 
         self.selected_frame_index = 0
 
@@ -1254,10 +1804,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _open_frame_editor(self):
         idx = self.selected_frame_index
-        if idx < 0 or idx >= len(self.frame_templates):
+        if idx < 0 or idx >= len(self.frame_catalog):
             return
-        base = self.frame_templates[idx]
-        dlg = FrameEditorDialog(base, self)
+        base = self.frame_catalog.template(idx)
+        # 선택된 세션 사진이 있으면 박스 안에 실시간 합성 미리보기
+        dlg = FrameEditorDialog(base, self, slot_pixmaps=self.final_slots)
         if dlg.exec_() == QtWidgets.QDialog.Accepted and dlg.norms:
             # 현재 프레임의 박스 좌표 교체
             self.frame_boxes_norm[idx] = dlg.norms
@@ -1267,24 +1818,83 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _choose_frame(self, idx: int):
         self.selected_frame_index = idx
-        for i, frame in enumerate(self.frame_opt_labels):
-            if not frame:
-                continue
-            frame.setStyleSheet(
-                self._frame_thumb_selected if i == idx else self._frame_thumb_style
-            )
+        if getattr(self, "frame_list", None) and self.frame_list.model():
+            mi = self.frame_list.model().index(idx, 0)
+            if self.frame_list.currentIndex() != mi:
+                self.frame_list.setCurrentIndex(mi)
 
-        composed = self._compose_frame(idx)  # ← 합성 결과
+        with tracer.span("compose", session=self.session_id, frame=idx):
+            composed = self._compose_frame(idx)  # ← 합성 결과
         if not composed.isNull():
             self.final_composed_pixmap = composed
+            self._compose_serial += 1
             if self.frame_preview:
-                self._set_pix_to_label(self.frame_preview, composed)
+                self._set_pix_to_label(
+                    self.frame_preview,
+                    composed,
+                    (self.session_id, "composite", self._compose_serial),
+                )
+            # 인쇄 페이지 전에 QR 업로드를 미리 시작
+            self._schedule_qr_upload()
+
+    # --- 페이지 지연 로드 ---
+    def _load_page(self, idx: int):
+        """idx 번째 .ui 를 로드해서 자리표시 위젯과 바꾸고 버튼 연결 + 페이지 설정"""
+        if self.pages[idx] is not None:
+            return
+        with tracer.span("startup.page", index=idx):
+            page = uic.loadUi(self._ui_paths[idx])
+        placeholder = self.stacked.widget(idx)
+        current = self.stacked.currentIndex()
+        self.stacked.removeWidget(placeholder)
+        self.stacked.insertWidget(idx, page)
+        placeholder.deleteLater()
+        if current >= 0:
+            self.stacked.setCurrentIndex(current)
+        self.pages[idx] = page
+
+        # 버튼 시그널 연결 (각 페이지에 btnNext/btnBack이 있을 때만 연결)
+        btn_next = getattr(page, "btn_next", None)
+        btn_back = getattr(page, "btn_back", None)
+        if btn_next:
+            btn_next.clicked.connect(lambda _, i=idx: self.goto_page(i + 1))
+        if btn_back:
+            btn_back.clicked.connect(lambda _, i=idx: self.goto_page(i - 1))
+
+        setup = self._page_setups.get(idx)
+        if setup:
+            setup()
+
+    def _ensure_pages(self):
+        """남은 페이지를 지금 전부 로드 (페이지 설정이 앞 페이지 상태에 기대므로 순서대로)"""
+        for idx in range(len(self.pages)):
+            self._load_page(idx)
+
+    def _preload_next_page(self):
+        """이벤트 루프 한 바퀴에 한 장씩 (터치 입력이 그 사이에 처리되도록)"""
+        idx = next((i for i, p in enumerate(self.pages) if p is None), None)
+        if idx is None:
+            return
+        self._load_page(idx)
+        QTimer.singleShot(0, self._preload_next_page)
+
+    def eventFilter(self, obj, event):
+        if obj is self.pages[0] and event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            startup_timing.timer.mark("first_frame")
+            startup_timing.timer.report(tracer)
+            QTimer.singleShot(0, self._preload_next_page)
+            threading.Thread(target=_warm_imports, name="warm-imports", daemon=True).start()
+        return super().eventFilter(obj, event)
 
     def goto_page(self, index: int):
         if 0 <= index < self.stacked.count():
+            if index != 0:
+                self._ensure_pages()
 
             if index == 0:
                 self._reset_ui_state()
+                self._update_queue_button()
 
             if (
                 hasattr(self, "capture_page_index")
@@ -1294,6 +1904,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     self._stop_camera()
 
             self.stacked.setCurrentIndex(index)
+            self._page = index
 
             if (
                 hasattr(self, "capture_page_index")
@@ -1315,10 +1926,13 @@ class MainWindow(QtWidgets.QMainWindow):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
 
+    startup_timing.timer.mark("qapplication")
+
     main_window = MainWindow()
     main_window.setWindowTitle("타임머신 포토부스")
 
     # 완전 풀스크린 모드 (타이틀바, 최소화/닫기 버튼 안 보임)
     main_window.showFullScreen()
+    startup_timing.timer.mark("show")
 
     sys.exit(app.exec_())
@@ -2,7 +2,7 @@ from PyInstaller.utils.hooks import collect_submodules, copy_metadata
 
 # -*- mode: python ; coding: utf-8 -*-
 
-datas = [('ui/*', 'ui/'), ('style/*', 'style/'), ('img/*', 'img/'), ('style/cursor/*', 'style/cursor'), ('style/font/*', 'style/font'), ('clickable_label.py', '.'), ('qr.py', '.'), ('replicate_tasks.py', '.'),('frame_boxes.json', '.'),
+datas = [('ui/*', 'ui/'), ('style/*', 'style/'), ('img/*', 'img/'), ('style/cursor/*', 'style/cursor'), ('style/font/*', 'style/font'), ('clickable_label.py', '.'), ('qr.py', '.'), ('replicate_tasks.py', '.'),('frame_boxes.json', '.'),('frame_catalog.json', '.'),('frame_catalog.py', '.'),('image_cache.py', '.'),('share_server.py', '.'),('upload_encoder.py', '.'),('uploader.py', '.'),('print_spooler.py', '.'),('print_layout.py', '.'),('session_store.py', '.'),('session_index.py', '.'),('staff_dialog.py', '.'),('guest_session.py', '.'),('queue_dialog.py', '.'),('pipeline_service.py', '.'),('batch_run.py', '.'),('tracing.py', '.'),('metrics.py', '.'),('stall_watchdog.py', '.'),('sampling_profiler.py', '.'),('frame_source.py', '.'),('eta_model.py', '.'),('startup_timing.py', '.'),
 ('setting.py', '.'),('senior(male).png', '.'), ]
 
 hiddenimports=[]
@@ -0,0 +1,307 @@
+"""
+부스 상태 메트릭 (Prometheus 텍스트 포맷, 백그라운드 HTTP 스레드).
+
+    GET http://<부스>:9108/metrics
+
+값 갱신은 잠금 하나 + dict 갱신뿐이라 GUI 스레드에서 불러도 됨.
+지연 시간(Replicate/QR 업로드)과 재시도/캐시 이벤트는 트레이스 기록에서 집계하고
+(attach_tracer), 카메라/대기열처럼 트레이스에 없는 값만 호출 쪽에서 직접 갱신.
+"""
+
+import time, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+def _labels(names, values, extra=None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join(
+        '%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}  # {라벨 값 tuple: 값}
+        if not self.label_names and self.kind != "histogram":
+            self._values[()] = 0  # 스크레이프 첫 회부터 0 으로 보이게
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, "") for n in self.label_names)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, v in items:
+            yield f"{self.name}{_labels(self.label_names, key)} {_fmt(v)}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        k = self._key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels=()):
+        super().__init__(name, help, labels)
+        self._fn = None
+
+    def set(self, v: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = v
+
+    def inc(self, amount: float = 1, **labels):
+        k = self._key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn):
+        """스크레이프할 때 fn() 값을 읽음 (라벨 없는 게이지만, 예: 인쇄 대기열 길이)"""
+        self._fn = fn
+
+    def render(self):
+        if self._fn is not None:
+            try:
+                self.set(self._fn())
+            except Exception:
+                pass
+        yield from super().render()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets, labels=()):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, v: float, **labels):
+        k = self._key(labels)
+        with self._lock:
+            h = self._values.get(k)
+            if h is None:
+                h = self._values[k] = [[0] * len(self.buckets), 0.0, 0]  # 구간별, 합, 개수
+            for i, b in enumerate(self.buckets):
+                if v <= b:
+                    h[0][i] += 1
+                    break
+            h[1] += v
+            h[2] += 1
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(k, (list(h[0]), h[1], h[2])) for k, h in sorted(self._values.items())]
+        for key, (counts, total, n) in items:
+            acc = 0
+            for b, c in zip(self.buckets, counts):
+                acc += c  # 누적 구간
+                yield f"{self.name}_bucket{_labels(self.label_names, key, ('le', _fmt(b)))} {acc}"
+            yield f"{self.name}_sum{_labels(self.label_names, key)} {_fmt(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, key)} {n}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        with self._lock:
+            # 같은 이름으로 다시 만들면 기존 것 반환 (모듈 재import/여러 창)
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labels=()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name, help, labels=()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(self, name, help, buckets, labels=()) -> Histogram:
+        return self._add(Histogram(name, help, buckets, labels))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# --- 부스 공용 메트릭 ---
+LATENCY_BUCKETS = (1, 2, 5, 10, 20, 30, 45, 60, 90, 120, 300)
+UPLOAD_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+camera_fps = registry.gauge("booth_camera_fps", "Camera preview frames drawn per second")
+camera_frames = registry.counter("booth_camera_frames_total", "Camera preview frames drawn")
+camera_dropped = registry.counter(
+    "booth_camera_dropped_frames_total", "Preview frames lost (read failures or late timer ticks)", ("reason",)
+)
+replicate_inflight = registry.gauge(
+    "booth_replicate_inflight", "Replicate predictions currently running", ("model",)
+)
+replicate_latency = registry.histogram(
+    "booth_replicate_latency_seconds", "Replicate stage latency", LATENCY_BUCKETS, ("stage", "status")
+)
+replicate_retries = registry.counter("booth_replicate_retries_total", "Replicate retries after timeouts", ("model",))
+qr_upload_latency = registry.histogram(
+    "booth_qr_upload_seconds", "QR image upload/publish latency", UPLOAD_BUCKETS, ("target",)
+)
+qr_cache = registry.counter("booth_qr_cache_total", "QR upload cache lookups", ("result",))
+qr_cache_hit_ratio = registry.gauge("booth_qr_cache_hit_ratio", "QR upload cache hit ratio since start")
+print_queue_depth = registry.gauge("booth_print_queue_depth", "Print jobs queued or printing")
+pipeline_inflight = registry.gauge("booth_pipeline_inflight", "AI jobs running in the session pipeline")
+pipeline_queued = registry.gauge("booth_pipeline_queued", "AI jobs waiting in the session pipeline")
+gui_stalls = registry.histogram(
+    "booth_gui_stall_seconds", "GUI event loop stalls over the watchdog threshold", (0.25, 0.5, 1, 2, 5, 10)
+)
+
+qr_cache_hit_ratio.set_function(
+    lambda: qr_cache.value(result="hit") / max(1, qr_cache.value(result="hit") + qr_cache.value(result="miss"))
+)
+
+
+def _on_trace(rec: dict):
+    name = rec["name"]
+    if rec["kind"] == "event":
+        if name == "replicate.retry":
+            replicate_retries.inc(model=rec.get("model", ""))
+        elif name == "qr.cache_hit":
+            qr_cache.inc(result="hit")
+        elif name == "qr.cache_miss":
+            qr_cache.inc(result="miss")
+        return
+    if rec["ms"] is None:
+        return
+    if name in ("age", "pose"):
+        replicate_latency.observe(rec["ms"] / 1000, stage=name, status="error" if "error" in rec else "ok")
+    elif name == "qr.upload":
+        qr_upload_latency.observe(rec["ms"] / 1000, target=rec.get("target", ""))
+    elif name == "gui.stall":
+        gui_stalls.observe(rec["ms"] / 1000)
+
+
+_attached = set()
+
+
+def attach_tracer(tracer):
+    """트레이스 span/event 를 메트릭으로 집계 (TRACE_ENABLED=False 여도 동작). 여러 번 불러도 한 번만"""
+    if id(tracer) in _attached:
+        return
+    _attached.add(id(tracer))
+    tracer.add_listener(_on_trace)
+
+
+class FrameMeter:
+    """
+    카메라 미리보기 타이머용. tick(ok) 를 프레임마다 호출.
+    읽기 실패와, 타이머가 늦게 와서 건너뛴 프레임(간격의 1.5배 이상)을 drop 으로 셈.
+    """
+
+    def __init__(self, interval_ms: int = 30):
+        self.interval = interval_ms / 1000
+        self._last = None
+        self._window_start = None
+        self._window_frames = 0
+
+    def reset(self):
+        self._last = None
+        self._window_start = None
+        self._window_frames = 0
+        camera_fps.set(0)
+
+    def tick(self, ok: bool):
+        now = time.monotonic()
+        if self._last is not None:
+            gap = now - self._last
+            if gap >= self.interval * 1.5:
+                camera_dropped.inc(int(gap / self.interval) - 1, reason="late")
+        self._last = now
+        if not ok:
+            camera_dropped.inc(reason="read")
+            return
+        camera_frames.inc()
+        if self._window_start is None:
+            self._window_start = now
+        self._window_frames += 1
+        if now - self._window_start >= 1.0:
+            camera_fps.set(round(self._window_frames / (now - self._window_start), 1))
+            self._window_start = now
+            self._window_frames = 0
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    def __init__(self, host: str = "0.0.0.0", port: int = 9108, registry_: Registry = None):
+        self.host = host
+        self.port = port
+        self.registry = registry_ or registry
+        self._httpd = None
+
+    def start(self):
+        if self._httpd is not None:
+            return
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.registry = self.registry
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, name="metrics-server", daemon=True).start()
+        print(f"📈 metrics → http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
@@ -0,0 +1,438 @@
+"""
+나이 변환 → 포즈 파이프라인을 별도 프로세스로 돌리는 로컬 서비스.
+여러 부스(GUI)가 세션을 넣고 결과를 받아감. Replicate 동시 실행 한도/시작 간격과
+결과 캐시는 여기 한 곳에서만 관리.
+
+    python pipeline_service.py --port 8790 --max-inflight 3
+    # 부스 setting.json: "AI_SERVICE_URL": "http://<서비스 IP>:8790"
+    # 로컬 테스트: python bench/replicate_standin.py 후 REPLICATE_BASE_URL 지정
+
+HTTP API (JSON)
+    POST   /v1/sessions                {"mode", "image_b64", "prompts"?} → 202 {"id"}
+    GET    /v1/sessions/<id>           상태 {"state", "aged_url", "poses": [bool], "errors", "progress"}
+    GET    /v1/sessions/<id>/poses/<i> 포즈 이미지 bytes
+    DELETE /v1/sessions/<id>           취소 (대기 중인 작업은 건너뜀)
+    GET    /v1/stats
+    GET    /metrics                    Prometheus 텍스트 (Replicate 진행 수/지연/재시도)
+"""
+
+import os, re, sys, json, time, queue, base64, hashlib, secrets, argparse, threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from replicate_tasks import MIN_POSES, POSE_PROMPTS, run_age, run_pose
+from tracing import tracer
+import metrics
+
+
+class ResultCache:
+    """
+    같은 입력(촬영본+모드+프롬프트+seed)의 결과 재사용.
+    포즈 결과 bytes 는 디스크에 (프로세스 재시작 후에도 유지), 나이 변환 URL 은
+    Replicate 출력 URL 이 만료되므로 메모리에 TTL 로만.
+    """
+
+    def __init__(self, cache_dir: str = "service_cache", max_items: int = 512, url_ttl: float = 1800):
+        self.cache_dir = os.path.abspath(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_items = max_items
+        self.url_ttl = url_ttl
+        self._urls = OrderedDict()  # {key: (url, expires)}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts) -> str:
+        h = hashlib.sha256()
+        for p in parts:
+            h.update(p if isinstance(p, bytes) else str(p).encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get_url(self, key: str):
+        with self._lock:
+            v = self._urls.get(key)
+            if v and v[1] > time.time():
+                self.hits += 1
+                return v[0]
+            self._urls.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put_url(self, key: str, url: str):
+        with self._lock:
+            self._urls[key] = (url, time.time() + self.url_ttl)
+            while len(self._urls) > self.max_items:
+                self._urls.popitem(last=False)
+
+    def get_bytes(self, key: str):
+        path = os.path.join(self.cache_dir, key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        os.utime(path)  # LRU 정리용
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put_bytes(self, key: str, data: bytes):
+        path = os.path.join(self.cache_dir, key)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        names = [n for n in os.listdir(self.cache_dir) if not n.endswith(".tmp")]
+        if len(names) > self.max_items:
+            names.sort(key=lambda n: os.path.getmtime(os.path.join(self.cache_dir, n)))
+            for n in names[: len(names) - self.max_items]:
+                try:
+                    os.remove(os.path.join(self.cache_dir, n))
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hits / total, 3) if total else 0.0}
+
+
+class ServiceSession:
+    def __init__(self, sid: str, mode: str, capture: bytes, prompts):
+        self.id = sid
+        self.mode = mode
+        self.capture = capture
+        self.prompts = list(prompts)
+        self.state = "queued"  # queued → aging → posing → ready / failed / cancelled
+        self.aged_url = None
+        self.poses = [None] * len(self.prompts)
+        self.poses_left = len(self.prompts)
+        self.errors = []
+        self.t_created = time.time()
+        self.t_done = None
+
+    def to_dict(self) -> dict:
+        done = len(self.poses) - self.poses_left
+        if self.state in ("ready", "failed", "cancelled"):
+            progress = 100.0
+        else:
+            progress = (25.0 if self.aged_url else 0.0) + 75.0 * done / max(1, len(self.poses))
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "state": self.state,
+            "aged_url": self.aged_url,
+            "poses": [p is not None for p in self.poses],
+            "errors": self.errors,
+            "progress": round(progress, 1),
+        }
+
+
+class PipelineService:
+    """
+    작업 큐 + 워커 스레드(= Replicate 동시 실행 한도).
+    모든 부스의 작업이 같은 FIFO 를 지나가므로 한도/간격이 전체에 한 번만 적용됨.
+    """
+
+    def __init__(
+        self,
+        max_inflight: int = 3,
+        start_spacing: float = 0.5,
+        cache: ResultCache = None,
+        session_ttl: float = 3600,
+        seed: int = 42,
+    ):
+        self.max_inflight = max(1, max_inflight)
+        self.start_spacing = start_spacing
+        self.cache = cache or ResultCache()
+        self.session_ttl = session_ttl
+        self.seed = seed
+
+        self.sessions = {}
+        self._lock = threading.Lock()
+        self._q = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._last_start = 0.0
+        self.inflight = 0
+        self.api_calls = 0
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"pipeline-{i}", daemon=True)
+            for i in range(self.max_inflight)
+        ]
+        for t in self._workers:
+            t.start()
+
+    # --- API ---
+    def submit(self, capture: bytes, mode: str, prompts=None) -> ServiceSession:
+        sess = ServiceSession(secrets.token_hex(8), mode, capture, prompts or POSE_PROMPTS)
+        with self._lock:
+            self._purge()
+            self.sessions[sess.id] = sess
+        self._q.put((sess, "age", None))
+        return sess
+
+    def get(self, sid: str):
+        with self._lock:
+            return self.sessions.get(sid)
+
+    def cancel(self, sid: str) -> bool:
+        sess = self.get(sid)
+        if sess is None:
+            return False
+        if sess.state not in ("ready", "failed"):
+            sess.state = "cancelled"
+            sess.t_done = time.time()
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            states = {}
+            for s in self.sessions.values():
+                states[s.state] = states.get(s.state, 0) + 1
+        return {
+            "max_inflight": self.max_inflight,
+            "inflight": self.inflight,
+            "queued_jobs": self._q.qsize(),
+            "api_calls": self.api_calls,
+            "sessions": states,
+            "cache": self.cache.stats(),
+        }
+
+    def _purge(self):
+        now = time.time()
+        for sid in [
+            sid for sid, s in self.sessions.items() if s.t_done and now - s.t_done > self.session_ttl
+        ]:
+            del self.sessions[sid]
+
+    # --- 워커 ---
+    def _wait_turn(self):
+        """Replicate 호출 시작 간격 (전체 공용)"""
+        with self._start_lock:
+            wait = self._last_start + self.start_spacing - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_start = time.monotonic()
+
+    def _worker(self):
+        while True:
+            sess, stage, index = self._q.get()
+            if sess.state == "cancelled":
+                continue
+            try:
+                with tracer.bind(sess.id, index=index):
+                    if stage == "age":
+                        self._run_age(sess)
+                    else:
+                        self._run_pose(sess, index)
+            except Exception as e:
+                msg = f"[{stage}{'' if index is None else ' ' + str(index)}] {e}"
+                sess.errors.append(msg)
+                print("[service]", sess.id, msg)
+                if stage == "age":
+                    self._finish(sess, "failed")
+                else:
+                    self._pose_finished(sess)
+
+    def _call(self, fn, *args):
+        self._wait_turn()
+        with self._lock:
+            self.inflight += 1
+            self.api_calls += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.inflight -= 1
+
+    def _run_age(self, sess: ServiceSession):
+        sess.state = "aging"
+        key = self.cache.key("age", sess.mode, self.seed, sess.capture)
+        url = self.cache.get_url(key)
+        if url is None:
+            url = self._call(run_age, sess.capture, sess.mode, self.seed)
+            self.cache.put_url(key, url)
+        sess.aged_url = url
+        sess.state = "posing"
+        for i in range(len(sess.prompts)):
+            self._q.put((sess, "pose", i))
+
+    def _run_pose(self, sess: ServiceSession, index: int):
+        key = self.cache.key("pose", sess.mode, self.seed, sess.prompts[index], sess.capture)
+        data = self.cache.get_bytes(key)
+        if data is None:
+            data = self._call(run_pose, [sess.aged_url, sess.capture], sess.prompts[index], self.seed)
+            self.cache.put_bytes(key, data)
+        sess.poses[index] = data
+        self._pose_finished(sess)
+
+    def _pose_finished(self, sess: ServiceSession):
+        with self._lock:
+            sess.poses_left -= 1
+            left = sess.poses_left
+        if left <= 0 and sess.state == "posing":
+            # 부스 pick2 는 MIN_POSES 장을 골라야 넘어감 → 모자라면 ready 로 넘기지 않음
+            if sum(1 for p in sess.poses if p) >= MIN_POSES:
+                self._finish(sess, "ready")
+            else:
+                if not sess.errors:
+                    sess.errors.append(f"[pose] 성공한 포즈가 {MIN_POSES}장 미만")
+                self._finish(sess, "failed")
+
+    def _finish(self, sess: ServiceSession, state: str):
+        sess.state = state
+        sess.t_done = time.time()
+        print(f"[service] {sess.id} {state} ({sess.t_done - sess.t_created:.1f}s)")
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+    def _json(self, code: int, obj):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        svc = self.server.service
+        if self.path != "/v1/sessions":
+            self._json(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            capture = base64.b64decode(body["image_b64"])
+            mode = body.get("mode", "past")
+        except (ValueError, KeyError) as e:
+            self._json(400, {"error": f"bad request: {e}"})
+            return
+        sess = svc.submit(capture, mode, body.get("prompts"))
+        self._json(202, {"id": sess.id})
+
+    def do_GET(self):
+        svc = self.server.service
+        if self.path == "/v1/stats":
+            self._json(200, svc.stats())
+            return
+        if self.path == "/metrics":
+            body = metrics.registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        m = re.fullmatch(r"/v1/sessions/(\w+)(?:/poses/(\d+))?", self.path)
+        sess = svc.get(m.group(1)) if m else None
+        if sess is None:
+            self._json(404, {"error": "unknown session"})
+            return
+        if m.group(2) is None:
+            self._json(200, sess.to_dict())
+            return
+        i = int(m.group(2))
+        data = sess.poses[i] if i < len(sess.poses) else None
+        if data is None:
+            self._json(404, {"error": "pose not ready"})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_DELETE(self):
+        m = re.fullmatch(r"/v1/sessions/(\w+)", self.path)
+        ok = bool(m) and self.server.service.cancel(m.group(1))
+        self._json(200 if ok else 404, {"cancelled": ok})
+
+
+def serve(service: PipelineService, host: str = "127.0.0.1", port: int = 8790):
+    """백그라운드 스레드로 HTTP 서버 시작 → (server, base_url)"""
+    httpd = ThreadingHTTPServer((host, port), _ServiceHandler)
+    httpd.daemon_threads = True
+    httpd.service = service
+    metrics.attach_tracer(tracer)
+    metrics.pipeline_inflight.set_function(lambda: service.inflight)
+    metrics.pipeline_queued.set_function(service._q.qsize)
+    threading.Thread(target=httpd.serve_forever, name="pipeline-http", daemon=True).start()
+    return httpd, f"http://{host}:{httpd.server_address[1]}"
+
+
+class PipelineClient:
+    """부스 쪽 클라이언트 (Qt 없음, 워커 스레드에서 호출)"""
+
+    def __init__(self, base_url: str, timeout=(3, 30)):
+        import requests
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.http = requests.Session()
+
+    def submit(self, capture: bytes, mode: str, prompts=None) -> str:
+        body = {"mode": mode, "image_b64": base64.b64encode(capture).decode("ascii")}
+        if prompts:
+            body["prompts"] = list(prompts)
+        r = self.http.post(f"{self.base_url}/v1/sessions", json=body, timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()["id"]
+
+    def status(self, sid: str) -> dict:
+        r = self.http.get(f"{self.base_url}/v1/sessions/{sid}", timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def pose(self, sid: str, index: int) -> bytes:
+        r = self.http.get(f"{self.base_url}/v1/sessions/{sid}/poses/{index}", timeout=self.timeout)
+        r.raise_for_status()
+        return r.content
+
+    def cancel(self, sid: str):
+        try:
+            self.http.delete(f"{self.base_url}/v1/sessions/{sid}", timeout=self.timeout)
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        r = self.http.get(f"{self.base_url}/v1/stats", timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="AI 파이프라인 로컬 서비스")
+    ap.add_argument("--host", default="127.0.0.1", help="부스가 여러 대면 0.0.0.0")
+    ap.add_argument("--port", type=int, default=8790)
+    ap.add_argument("--max-inflight", type=int, default=3, help="동시에 돌리는 Replicate 작업 수")
+    ap.add_argument("--spacing", type=float, default=0.5, help="작업 시작 최소 간격(초)")
+    ap.add_argument("--cache-dir", default="service_cache")
+    args = ap.parse_args()
+
+    if not os.environ.get("REPLICATE_API_TOKEN"):
+        from setting import FileController
+
+        token = FileController().load_json().get("REPLICATE_API_TOKEN", "")
+        if token:
+            os.environ["REPLICATE_API_TOKEN"] = token
+
+    service = PipelineService(args.max_inflight, args.spacing, ResultCache(args.cache_dir))
+    httpd, url = serve(service, args.host, args.port)
+    print(f"pipeline service → {url} (max_inflight={args.max_inflight})")
+    if os.environ.get("REPLICATE_BASE_URL"):
+        print("  Replicate →", os.environ["REPLICATE_BASE_URL"])
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        httpd.shutdown()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
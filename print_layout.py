@@ -0,0 +1,139 @@
+import math
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QImage, QPainter, QColor, QTransform
+
+MM_PER_INCH = 25.4
+
+# 자주 쓰는 용지 (mm, 세로 기준)
+PAPERS = {
+    "postcard": (100, 148),  # SELPHY 엽서
+    "L": (89, 127),
+    "KG": (102, 152),  # 4×6 inch
+    "A6": (105, 148),
+    "A4": (210, 297),
+}
+
+# 한 장에 몇 개를 어떤 크기로 (item_mm=None 이면 용지 전체 = 1장 1매)
+# 칸 크기는 사이 간격(기본 2mm)까지 포함해 엽서에 딱 맞도록 잡음
+PRESETS = {
+    "full": {"item_mm": None, "fit": "fit"},
+    "half": {"item_mm": (73, 100), "fit": "fit"},  # 엽서 1장에 2매
+    "quarter": {"item_mm": (49, 73), "fit": "fit"},  # 엽서 1장에 4매
+    "strip": {"item_mm": (49, 148), "fit": "cover"},  # 세로 스트립 2줄 (가운데 크롭)
+}
+
+
+def mm_to_px(mm: float, dpi: int) -> int:
+    return int(round(mm / MM_PER_INCH * dpi))
+
+
+class SheetLayout:
+    """
+    합성 캔버스 N매(또는 여러 변형)를 용지 한 장에 격자로 배치.
+    용지를 돌린 방향까지 비교해서 한 장에 가장 많이 들어가는 쪽을 고름.
+    같은 이미지는 칸 크기로 한 번만 래스터화하고 모든 칸/장에 재사용.
+    """
+
+    def __init__(
+        self,
+        paper_mm=(100, 148),
+        item_mm=None,
+        dpi: int = 300,
+        gap_mm: float = 2.0,
+        margin_mm: float = 0.0,
+        fit: str = "fit",
+        background=Qt.white,
+    ):
+        self.paper_mm = tuple(paper_mm)
+        self.item_mm = tuple(item_mm) if item_mm else None
+        self.dpi = dpi
+        self.gap_mm = gap_mm if item_mm else 0.0
+        self.margin_mm = margin_mm
+        self.fit = fit
+        self.background = QColor(background)
+        self.cols, self.rows, self.landscape = self._grid()
+
+    @classmethod
+    def preset(cls, name: str, paper: str = "postcard", dpi: int = 300):
+        p = PRESETS.get(name, PRESETS["full"])
+        return cls(PAPERS.get(paper, PAPERS["postcard"]), p["item_mm"], dpi, fit=p["fit"])
+
+    @property
+    def per_sheet(self) -> int:
+        return self.cols * self.rows
+
+    def _grid(self):
+        if not self.item_mm:
+            return 1, 1, False
+        iw, ih = self.item_mm
+        best = (0, 0, False)
+        for landscape in (False, True):
+            pw, ph = self.paper_mm[::-1] if landscape else self.paper_mm
+            pw -= 2 * self.margin_mm
+            ph -= 2 * self.margin_mm
+            cols = int((pw + self.gap_mm) // (iw + self.gap_mm))
+            rows = int((ph + self.gap_mm) // (ih + self.gap_mm))
+            if cols * rows > best[0] * best[1]:
+                best = (cols, rows, landscape)
+        if best[0] * best[1] == 0:
+            return 1, 1, False  # 칸이 용지보다 크면 1장 1매로
+        return best
+
+    def sheet_size_px(self):
+        pw, ph = self.paper_mm[::-1] if self.landscape else self.paper_mm
+        return mm_to_px(pw, self.dpi), mm_to_px(ph, self.dpi)
+
+    def cell_rects(self):
+        """한 장 안의 칸 위치 (px), 격자를 용지 가운데 정렬"""
+        sw, sh = self.sheet_size_px()
+        if not self.item_mm:
+            return [QRect(0, 0, sw, sh)]
+        cw, ch = mm_to_px(self.item_mm[0], self.dpi), mm_to_px(self.item_mm[1], self.dpi)
+        gap = mm_to_px(self.gap_mm, self.dpi)
+        gw = self.cols * cw + (self.cols - 1) * gap
+        gh = self.rows * ch + (self.rows - 1) * gap
+        x0, y0 = (sw - gw) // 2, (sh - gh) // 2
+        return [
+            QRect(x0 + c * (cw + gap), y0 + r * (ch + gap), cw, ch)
+            for r in range(self.rows)
+            for c in range(self.cols)
+        ]
+
+    def sheets_needed(self, n: int) -> int:
+        return max(1, math.ceil(n / self.per_sheet))
+
+    def _rasterize(self, img: QImage, w: int, h: int) -> QImage:
+        """칸 크기 비트맵 1장 (fit = 여백, cover = 가운데 크롭)"""
+        if self.fit == "cover":
+            scaled = img.scaled(w, h, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+            return scaled.copy((scaled.width() - w) // 2, (scaled.height() - h) // 2, w, h)
+        if img.width() == w and img.height() == h:
+            return img
+        return img.scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    def render(self, items) -> list:
+        """
+        items: QImage 목록 (같은 객체 반복 = 복사본).
+        return: 용지별 QImage 목록 (가로 배치였어도 세로 용지 방향으로 돌려서 반환)
+        """
+        cells = self.cell_rects()
+        sw, sh = self.sheet_size_px()
+        raster = {}  # {cacheKey: 칸 크기 비트맵}
+        sheets = []
+        for start in range(0, len(items), self.per_sheet):
+            sheet = QImage(sw, sh, QImage.Format_RGB32)
+            sheet.fill(self.background)
+            p = QPainter(sheet)
+            for img, rect in zip(items[start : start + self.per_sheet], cells):
+                key = img.cacheKey()
+                tile = raster.get(key)
+                if tile is None:
+                    tile = raster[key] = self._rasterize(img, rect.width(), rect.height())
+                x = rect.x() + (rect.width() - tile.width()) // 2
+                y = rect.y() + (rect.height() - tile.height()) // 2
+                p.drawImage(x, y, tile)
+            p.end()
+            if self.landscape:
+                sheet = sheet.transformed(QTransform().rotate(90))
+            sheets.append(sheet)
+        return sheets
@@ -0,0 +1,226 @@
+import os, time, queue, threading, itertools
+from PyQt5.QtCore import QObject, QSizeF, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtPrintSupport import QPrinter
+from tracing import tracer
+
+
+class PrintJob:
+    """인쇄 대기열 항목. image는 이미 인쇄 해상도로 만들어 둔 QImage (GUI 스레드에서 변환)."""
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        image: QImage,
+        copies: int = 1,
+        paper_mm=(100, 148),
+        dpi: int = 300,
+        layout=None,
+        session_id: str = None,
+    ):
+        self.id = next(self._ids)
+        self.session_id = session_id
+        self.image = image
+        self.copies = max(1, int(copies))
+        self.layout = layout  # SheetLayout (여러 매를 한 장에), None 이면 1장 1매
+        self.pages = None  # 워커에서 채움: 실제로 보낼 용지 이미지 목록
+        self.driver_copies = self.copies  # 같은 페이지를 드라이버에서 반복할 횟수
+        self.sheets = 0  # 실제로 나가는 용지 장수
+        self.paper_mm = paper_mm
+        self.dpi = dpi
+        self.status = "queued"  # queued → printing → done / failed
+        self.error = ""
+        self.t_queued = time.monotonic()
+        self.t_started = None
+        self.t_finished = None
+
+    def timings(self) -> dict:
+        out = {}
+        if self.t_started is not None:
+            out["wait_s"] = round(self.t_started - self.t_queued, 3)
+        if self.t_finished is not None and self.t_started is not None:
+            out["print_s"] = round(self.t_finished - self.t_started, 3)
+        return out
+
+
+def _setup_printer(printer: QPrinter, job: PrintJob):
+    printer.setPaperSize(QSizeF(*job.paper_mm), QPrinter.Millimeter)
+    printer.setFullPage(True)
+    printer.setPageMargins(0, 0, 0, 0, QPrinter.Millimeter)
+    printer.setOrientation(QPrinter.Portrait)
+    printer.setResolution(job.dpi)
+
+
+def _paint_pages(printer: QPrinter, pages):
+    painter = QPainter(printer)
+    try:
+        for i, page in enumerate(pages):
+            if i:
+                printer.newPage()
+            # 윈도우 좌표를 이미지 픽셀 크기로 → 1:1 매핑 (드라이버가 용지에 맞춤)
+            painter.setWindow(0, 0, page.width(), page.height())
+            painter.drawImage(0, 0, page)
+    finally:
+        painter.end()
+
+
+def prepare_pages(job: PrintJob):
+    """
+    보낼 페이지 결정. 레이아웃이 한 장에 여러 매면 한 번 래스터화한 비트맵으로 묶어 찍고,
+    1장 1매면 같은 페이지 하나를 드라이버 매수로 반복 (다시 그리지 않음).
+    """
+    if job.layout is not None and job.layout.per_sheet > 1:
+        job.pages = job.layout.render([job.image] * job.copies)
+        job.driver_copies = 1
+    else:
+        job.pages = [job.image]
+        job.driver_copies = job.copies
+    job.sheets = len(job.pages) * job.driver_copies
+
+
+class NativePrinterBackend:
+    """실제 프린터 (기본: Canon SELPHY CP1300). 매수는 드라이버 copyCount로 한 번에 전송."""
+
+    name = "printer"
+
+    def __init__(self, printer_name: str = "Canon SELPHY CP1300"):
+        self.printer_name = printer_name
+
+    def send(self, job: PrintJob):
+        printer = QPrinter(QPrinter.HighResolution)
+        printer.setOutputFormat(QPrinter.NativeFormat)
+        if self.printer_name:
+            printer.setPrinterName(self.printer_name)  # 비우면 기본 프린터
+        _setup_printer(printer, job)
+        printer.setCopyCount(job.driver_copies)
+        _paint_pages(printer, job.pages)
+
+
+class PdfBackend:
+    """프린터 없이 테스트용: 작업마다 PDF 1개 (용지 장수만큼 페이지)"""
+
+    name = "pdf"
+
+    def __init__(self, out_dir: str = "print_out"):
+        self.out_dir = os.path.abspath(out_dir)
+        os.makedirs(self.out_dir, exist_ok=True)
+
+    def send(self, job: PrintJob):
+        printer = QPrinter(QPrinter.HighResolution)
+        printer.setOutputFormat(QPrinter.PdfFormat)
+        printer.setOutputFileName(os.path.join(self.out_dir, f"job_{job.id:05d}.pdf"))
+        _setup_printer(printer, job)
+        _paint_pages(printer, job.pages * job.driver_copies)
+
+
+class FileBackend:
+    """가장 가벼운 테스트용: 용지 비트맵을 PNG로 저장 (장수만큼 파일)"""
+
+    name = "file"
+
+    def __init__(self, out_dir: str = "print_out"):
+        self.out_dir = os.path.abspath(out_dir)
+        os.makedirs(self.out_dir, exist_ok=True)
+
+    def send(self, job: PrintJob):
+        for n, page in enumerate(job.pages * job.driver_copies, 1):
+            path = os.path.join(self.out_dir, f"job_{job.id:05d}_{n}.png")
+            if not page.save(path, "PNG"):
+                raise RuntimeError(f"저장 실패: {path}")
+
+
+def make_backend(kind: str, printer_name: str = "", out_dir: str = "print_out"):
+    if kind == "pdf":
+        return PdfBackend(out_dir)
+    if kind == "file":
+        return FileBackend(out_dir)
+    return NativePrinterBackend(printer_name)
+
+
+class PrintSpooler(QObject):
+    """
+    인쇄 대기열 + 워커 스레드 1개. GUI 스레드는 submit()만 하고 바로 돌아감.
+    QPainter로 QPrinter에 그리는 것은 워커 스레드에서도 허용됨 (QPixmap은 X → QImage 사용).
+    job_status(job_id, status, info) 로 작업별 상태/타이밍 알림.
+    """
+
+    job_status = pyqtSignal(int, str, dict)
+
+    def __init__(self, backend, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self._q = queue.Queue()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._worker, name="print-spooler", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        image: QImage,
+        copies: int = 1,
+        paper_mm=(100, 148),
+        dpi: int = 300,
+        layout=None,
+        session_id: str = None,
+    ) -> PrintJob:
+        if layout is not None:
+            paper_mm, dpi = layout.paper_mm, layout.dpi
+        job = PrintJob(image, copies, paper_mm, dpi, layout, session_id)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._q.put(job)
+        self.job_status.emit(job.id, job.status, self._info(job))
+        return job
+
+    def pending(self) -> int:
+        """대기 + 인쇄 중 작업 수"""
+        with self._lock:
+            return sum(1 for j in self._jobs.values() if j.status in ("queued", "printing"))
+
+    def job(self, job_id: int):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stop(self):
+        self._q.put(None)
+
+    def _info(self, job: PrintJob) -> dict:
+        info = {"copies": job.copies, "backend": self.backend.name, "pending": self.pending()}
+        if job.sheets:
+            info["sheets"] = job.sheets
+        info.update(job.timings())
+        if job.error:
+            info["error"] = job.error
+        return info
+
+    def _worker(self):
+        while True:
+            job = self._q.get()
+            if job is None:
+                return
+            job.status = "printing"
+            job.t_started = time.monotonic()
+            self.job_status.emit(job.id, job.status, self._info(job))
+            tracer.record("print.wait", job.t_queued, job.t_started - job.t_queued, session=job.session_id)
+            try:
+                with tracer.span("print.render", session=job.session_id, copies=job.copies):
+                    prepare_pages(job)
+                with tracer.span("print.send", session=job.session_id, backend=self.backend.name) as sp:
+                    sp.attrs["sheets"] = job.sheets
+                    self.backend.send(job)
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+            job.t_finished = time.monotonic()
+            job.image = None  # 끝난 작업의 비트맵은 바로 해제
+            job.pages = []
+            with self._lock:
+                # 완료 기록은 최근 것만 유지
+                done = [i for i, j in self._jobs.items() if j.status in ("done", "failed")]
+                for i in done[:-50]:
+                    del self._jobs[i]
+            self.job_status.emit(job.id, job.status, self._info(job))
+            print(f"🖨️ print job {job.id} {job.status} {job.timings()}")
@@ -1,14 +1,91 @@
-import io, html, time, hashlib, requests, qrcode
+import os, html, json, time, hashlib, threading
 from PyQt5.QtGui import QPixmap, QImage
 from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QRunnable, pyqtSignal
+from upload_encoder import AdaptiveEncoder, ext_and_mime
+from uploader import StreamingUploader, UploadCancelled
+from tracing import tracer
+
+
+class QrCancelled(Exception):
+    """더 최신 요청으로 대체되어 중단된 업로드"""
+
+
+class QrSignals(QObject):
+    qr_done = pyqtSignal(int, QImage, str)  # (generation, qr_image, page_url)
+    progress = pyqtSignal(int, int, int)  # (generation, sent, total)
+    error = pyqtSignal(int, str)
+
+
+class ShareCache:
+    """
+    sha256(원본 픽셀 + 모드) → 공유 URL 캐시 (QRCODE.source_key). path가 있으면 JSON으로 디스크에 유지
+    (tmp 파일 쓰고 rename), 로드/저장 시 TTL 지난 항목은 제거.
+    """
+
+    def __init__(self, path: str = None, ttl: int = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items = {}  # {sha256: (page_url, ts)}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._items = {k: (v[0], float(v[1])) for k, v in data.items()}
+            except Exception as e:
+                print("[qr_cache] load failed:", e)
+        self._evict()
+
+    def _evict(self):
+        now = time.time()
+        for k in [k for k, (_, ts) in self._items.items() if now - ts >= self.ttl]:
+            del self._items[k]
+
+    def get(self, key: str):
+        with self._lock:
+            rec = self._items.get(key)
+            if rec and time.time() - rec[1] < self.ttl:
+                return rec[0]
+            return None
+
+    def put(self, key: str, page_url: str):
+        with self._lock:
+            self._items[key] = (page_url, time.time())
+            self._evict()
+            if not self.path:
+                return
+            try:
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self._items, f)
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print("[qr_cache] save failed:", e)
 
 
 class QRCODE:
-    def __init__(self):
+    def __init__(
+        self, share_server=None, cache_path: str = "qr_cache.json", encoder=None
+    ):
         self.TITLE = "세대 체인지 AI 인생사진관"
+        # 있으면 0x0.st 대신 부스 내장 서버(LAN/핫스팟 URL)로 공유
+        self.share_server = share_server
+        import requests  # requests/qrcode/numpy 는 처음 쓸 때 import (부스 시작 시간 단축)
+
         self.session = requests.Session()  # keep-alive로 약간 더 빠르게
-        self._cache = {}  # {sha256: (page_url, qr_path, ts)}
+        # 내장 서버 링크는 토큰 TTL 이 지나면 410 → 그때는 메모리 캐시만, 수명도 TTL 보다 짧게
+        if share_server is not None:
+            self._cache = ShareCache(None, ttl=max(60, share_server.token_ttl - 3600))
+        else:
+            self._cache = ShareCache(cache_path)
+        self._qr_images = {}  # {(url, side): QImage} 최근 QR 몇 개
+        # 업링크 속도에 맞춰 품질/포맷을 고르는 인코더 (인스턴스 간 공유 가능)
+        self.encoder = encoder or AdaptiveEncoder()
+        # 측정한 처리량은 인코더로 → 다음 업로드의 목표 크기/다운스케일에 반영
+        self.uploader = StreamingUploader(
+            self.session, on_sample=self.encoder.record_throughput
+        )
         self.HTML_TEMPLATE = """<!doctype html>
 <html lang="ko">
 <head><meta charset="utf-8"><title>{title}</title>
@@ -20,9 +97,9 @@ class QRCODE:
 </script>
 </body></html>"""
 
-    # --- QPixmap -> bytes 저장 헬퍼 ---
+    # --- QPixmap/QImage -> bytes 저장 헬퍼 ---
     @staticmethod
-    def _save_qpixmap(pm: QPixmap, fmt: str = "PNG", quality: int = -1) -> bytes:
+    def _save_qpixmap(pm, fmt: str = "PNG", quality: int = -1) -> bytes:
         qba = QByteArray()
         buf = QBuffer(qba)
         buf.open(QIODevice.WriteOnly)
@@ -31,7 +108,7 @@ class QRCODE:
         return bytes(qba)
 
     @staticmethod
-    def _downscale(pm: QPixmap, max_side: int = 1080) -> QPixmap:
+    def _downscale(pm, max_side: int = 1080):
         w, h = pm.width(), pm.height()
         if max(w, h) <= max_side:  # 이미 작으면 그대로
             return pm
@@ -41,85 +118,208 @@ class QRCODE:
             nh, nw = max_side, int(w * (max_side / h))
         return pm.scaled(nw, nh, Qt.KeepAspectRatio, Qt.SmoothTransformation)
 
-    def upload_to_0x0st(self, file_bytes: bytes, filename: str) -> str:
-        files = {"file": (filename, io.BytesIO(file_bytes))}
-        last_err = None
-        for attempt in range(3):  # 가벼운 재시도
-            try:
-                r = self.session.post(
-                    "https://0x0.st",
-                    files=files,
-                    timeout=(5, 40),
-                    headers={"User-Agent": "qr-uploader/1.0"},
-                )
-                r.raise_for_status()
-                url = r.text.strip()
-                if url.startswith("https://0x0.st/"):
-                    return url
-                raise RuntimeError(
-                    f"0x0.st upload failed: {r.status_code} {r.text[:200]!r}"
-                )
-            except requests.exceptions.RequestException as e:
-                last_err = e
-                time.sleep(0.6 * (attempt + 1))
-        raise last_err if last_err else RuntimeError("0x0.st upload unknown error")
+    def upload_to_0x0st(
+        self, file_bytes: bytes, filename: str, is_cancelled=None, progress=None
+    ) -> str:
+        """스트리밍 업로드 (progress(sent, total) 콜백, 처리량은 인코더로 전달)"""
+        try:
+            return self.uploader.upload(
+                file_bytes, filename, progress=progress, is_cancelled=is_cancelled
+            )
+        except UploadCancelled:
+            raise QrCancelled()
 
-    def make_qr_png(self, url: str, out_path: str = "qr_download.png") -> str:
-        qr = qrcode.QRCode(border=2, box_size=8)
+    def make_qr_image(self, url: str, side: int = 480) -> QImage:
+        """
+        QR 모듈 행렬을 numpy로 한 번에 확대해 QImage(흑백)로 바로 만듦 (파일 저장 없음).
+        모듈당 정수 픽셀로 확대해서 side 안에 가장 크게 들어가도록 (경계 흐림 없음).
+        """
+        ck = (url, side)
+        img = self._qr_images.get(ck)
+        if img is not None:
+            return img
+
+        import qrcode
+        import numpy as np
+
+        qr = qrcode.QRCode(border=2)
         qr.add_data(url)
         qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        img.save(out_path)
-        print(f"📷 QR saved → {out_path}")
-        return out_path
+        mat = np.asarray(qr.get_matrix(), dtype=bool)  # 테두리 포함 n×n
+        n = mat.shape[0]
+        k = max(1, side // n)
+        px = np.where(mat, 0, 255).astype(np.uint8)
+        px = np.repeat(np.repeat(px, k, axis=0), k, axis=1)
+        px = np.ascontiguousarray(px)
+        h, w = px.shape
+        img = QImage(px.data, w, h, w, QImage.Format_Grayscale8).copy()
+
+        if len(self._qr_images) >= 8:
+            self._qr_images.pop(next(iter(self._qr_images)))
+        self._qr_images[ck] = img
+        return img
+
+    @staticmethod
+    def source_key(src, mode: str) -> str:
+        """원본(bytes 또는 QImage/QPixmap 픽셀) + 모드의 sha256 (공유 캐시 키)"""
+        h = hashlib.sha256(mode.encode())
+        if isinstance(src, (bytes, bytearray)):
+            h.update(src)
+            return h.hexdigest()
+        img = src.toImage() if isinstance(src, QPixmap) else src
+        h.update(f"{img.width()}x{img.height()}:{int(img.format())}:".encode())
+        bits = img.constBits()
+        bits.setsize(img.sizeInBytes())
+        h.update(bits)
+        return h.hexdigest()
 
-    def run(self, pm_or_bytes, mode: str = "fast") -> tuple[str, str]:
+    def run(
+        self,
+        pm_or_bytes,
+        mode: str = "fast",
+        is_cancelled=None,
+        qr_side: int = 480,
+        progress=None,
+    ) -> tuple[QImage, str]:
         """
         mode: "fast" = 업로드 1회(압축 JPEG/WebP) + 이미지 URL QR
               "html" = 이미지 + HTML 2회 업로드(파일명 제안 필요할 때)
-        return: (qr_path, page_url)
+        is_cancelled: 업로드 시도 사이사이 확인하는 콜백 (True면 QrCancelled)
+        qr_side: QR 이미지 한 변 픽셀 (표시할 라벨 크기)
+        progress: 이미지 업로드 진행 콜백 (sent, total)
+        return: (qr_image, page_url)
         """
-        # --- 입력 정규화 ---
-        if isinstance(pm_or_bytes, QPixmap):
+        # --- 입력 정규화 (워커 스레드에서는 QImage/bytes로 넘길 것) ---
+        if isinstance(pm_or_bytes, (QPixmap, QImage)):
             pm = pm_or_bytes
         elif isinstance(pm_or_bytes, (bytes, bytearray)):
-            # bytes로 들어오면 QPixmap에 로드해 다운스케일/재인코딩 가능하게
-            pm = QPixmap()
-            pm.loadFromData(bytes(pm_or_bytes))
+            # bytes로 들어오면 QImage로 로드해 다운스케일/재인코딩 가능하게
+            pm = QImage.fromData(bytes(pm_or_bytes))
         else:
-            raise TypeError("run() expects QPixmap or bytes")
-
-        # --- 다운스케일 + JPEG로 압축(대폭 빨라짐) ---
-        pm_small = self._downscale(pm, 1080)
-        jpg_bytes = self._save_qpixmap(pm_small, "JPG", quality=85)
+            raise TypeError("run() expects QPixmap, QImage or bytes")
 
-        # --- 캐시 체크(같은 이미지면 재사용) ---
-        key = hashlib.sha256(jpg_bytes).hexdigest()
-        rec = self._cache.get(key)
-        if rec and time.time() - rec[2] < 3600:  # 1시간 캐시
-            page_url, qr_path, _ = rec
-            return qr_path, page_url
+        # --- 캐시 체크(같은 이미지면 인코딩/업로드 없이 재사용, 재시작 후에도 유지) ---
+        # 인코딩 결과는 업링크 추정치에 따라 달라지므로 키는 인코딩 전 원본 기준
+        raw = isinstance(pm_or_bytes, (bytes, bytearray))
+        key = self.source_key(pm_or_bytes if raw else pm, mode)
+        page_url = self._cache.get(key)
+        if page_url:
+            tracer.event("qr.cache_hit")
+            with tracer.span("qr.render"):
+                return self.make_qr_image(page_url, qr_side), page_url
+        tracer.event("qr.cache_miss")
 
-        # --- 업로드 (fast: 1회 / html: 2회) ---
-        img_url = self.upload_to_0x0st(jpg_bytes, "lifephoto.jpg")
+        # --- 다운스케일 + 업링크 속도 기준 목표 크기에 맞춰 압축 ---
+        with tracer.span("qr.encode") as sp:
+            pm_small = self._downscale(pm, self.encoder.recommend_max_side())
+            if isinstance(pm_small, QPixmap):
+                pm_small = pm_small.toImage()
+            if self.share_server is not None:
+                # LAN 공유는 업링크를 안 쓰므로 예산을 최대로
+                target = self.encoder.max_bytes
+            else:
+                target = self.encoder.target_bytes()
+            jpg_bytes, fmt, _ = self.encoder.encode(pm_small, target)
+            ext, mime = ext_and_mime(fmt)
+            sp.attrs.update(fmt=fmt, bytes=len(jpg_bytes))
 
-        if mode == "html":
-            try:
-                html_bytes = self.HTML_TEMPLATE.format(
-                    title=html.escape(self.TITLE),
-                    file_url=html.escape(img_url),
-                    suggest_name=html.escape("세대_체인지_AI_인생사진관.jpg"),
-                ).encode("utf-8")
-                page_url = self.upload_to_0x0st(
-                    html_bytes, "세대_체인지_AI_인생사진관.html"
+        # --- 업로드 (fast: 1회 / html: 2회), 내장 서버면 로컬 게시만 ---
+        # 실패/취소도 error= 로 남도록 with 구간 (트레이스 리포트/업로드 지연 히스토그램)
+        with tracer.span(
+            "qr.upload", target="lan" if self.share_server else "0x0", bytes=len(jpg_bytes)
+        ):
+            if self.share_server is not None:
+                img_url = self.share_server.publish(jpg_bytes, f"lifephoto.{ext}", mime)
+            else:
+                img_url = self.upload_to_0x0st(
+                    jpg_bytes, f"lifephoto.{ext}", is_cancelled, progress
                 )
-            except Exception as e:
-                print("⚠️ HTML 업로드 실패, 이미지 URL로 폴백:", e)
+
+            if self.share_server is not None:
+                page_url = img_url  # LAN에서는 이미지 URL이 바로 열림 (HTML 페이지 불필요)
+            elif mode == "html":
+                try:
+                    html_bytes = self.HTML_TEMPLATE.format(
+                        title=html.escape(self.TITLE),
+                        file_url=html.escape(img_url),
+                        suggest_name=html.escape(f"세대_체인지_AI_인생사진관.{ext}"),
+                    ).encode("utf-8")
+                    page_url = self.upload_to_0x0st(
+                        html_bytes, "세대_체인지_AI_인생사진관.html", is_cancelled
+                    )
+                except QrCancelled:
+                    raise
+                except Exception as e:
+                    print("⚠️ HTML 업로드 실패, 이미지 URL로 폴백:", e)
+                    page_url = img_url
+            else:
+                # ✅ 가장 빠름: 이미지 URL 바로 QR
                 page_url = img_url
-        else:
-            # ✅ 가장 빠름: 이미지 URL 바로 QR
-            page_url = img_url
 
-        qr_path = self.make_qr_png(page_url)
-        self._cache[key] = (page_url, qr_path, time.time())
-        return qr_path, page_url
+        # 취소됐더라도 업로드 결과는 캐시에 남겨 다음 요청에서 재사용
+        self._cache.put(key, page_url)
+        if is_cancelled and is_cancelled():
+            raise QrCancelled()
+        with tracer.span("qr.render"):
+            return self.make_qr_image(page_url, qr_side), page_url
+
+
+class QrJob(QRunnable):
+    """
+    합성 이미지 업로드 + QR 생성을 백그라운드에서 실행.
+    generation 으로 최신 요청을 구분하고, cancel() 되면 다음 확인 지점에서 중단.
+    """
+
+    def __init__(
+        self,
+        qr: QRCODE,
+        image: QImage,
+        generation: int,
+        mode: str = "fast",
+        qr_side: int = 480,
+        session_id: str = None,
+    ):
+        super().__init__()
+        self.qr = qr
+        self.session_id = session_id
+        self.image = image  # QPixmap은 GUI 스레드 전용이라 QImage로 받음
+        self.generation = generation
+        self.mode = mode
+        self.qr_side = qr_side
+        self._cancelled = False
+        self._last_pct = -1
+        self.signals = QrSignals()
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def _on_progress(self, sent: int, total: int):
+        pct = sent * 100 // max(1, total)
+        if pct != self._last_pct:  # 1% 단위로만 GUI에 알림
+            self._last_pct = pct
+            self.signals.progress.emit(self.generation, sent, total)
+
+    def run(self):
+        with tracer.bind(self.session_id, generation=self.generation), tracer.span("qr") as sp:
+            self._run(sp)
+
+    def _run(self, sp):
+        try:
+            qr_img, page_url = self.qr.run(
+                self.image,
+                mode=self.mode,
+                is_cancelled=self.is_cancelled,
+                qr_side=self.qr_side,
+                progress=self._on_progress,
+            )
+            if not self._cancelled:
+                self.signals.qr_done.emit(self.generation, qr_img, page_url)
+        except QrCancelled:
+            sp.attrs["cancelled"] = True
+            print(f"[qr {self.generation}] cancelled")
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.error.emit(self.generation, str(e))
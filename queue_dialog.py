@@ -0,0 +1,102 @@
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+
+
+class QueueDialog(QtWidgets.QDialog):
+    """
+    대기열 화면: 접수된 손님 세션의 진행 상태를 보여주고,
+    완료된 세션을 고르면 session_chosen(session_id) 후 닫힘.
+    """
+
+    session_chosen = pyqtSignal(str)
+
+    def __init__(self, pipeline, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("대기열")
+        self.pipeline = pipeline
+
+        self.list = QtWidgets.QListWidget()
+        font = self.list.font()
+        font.setPointSize(font.pointSize() + 4)
+        self.list.setFont(font)
+        self.summary = QtWidgets.QLabel()
+        self.btn_pick = QtWidgets.QPushButton("사진 고르기")
+        self.btn_pick.setEnabled(False)
+        self.btn_discard = QtWidgets.QPushButton("삭제")
+        self.btn_discard.setEnabled(False)
+        btn_close = QtWidgets.QPushButton("닫기")
+
+        bottom = QtWidgets.QHBoxLayout()
+        bottom.addWidget(self.summary, 1)
+        bottom.addWidget(self.btn_discard)
+        bottom.addWidget(self.btn_pick)
+        bottom.addWidget(btn_close)
+        root = QtWidgets.QVBoxLayout(self)
+        root.addWidget(self.list, 1)
+        root.addLayout(bottom)
+        self.resize(560, 480)
+
+        self.list.currentItemChanged.connect(lambda *_: self._update_buttons())
+        self.list.itemDoubleClicked.connect(lambda _: self._pick())
+        self.btn_pick.clicked.connect(self._pick)
+        self.btn_discard.clicked.connect(self._discard)
+        btn_close.clicked.connect(self.reject)
+        pipeline.session_changed.connect(self._on_changed)
+
+        # 경과 시간 표시용 (상태 변화가 없어도 1초마다)
+        self._tick = QTimer(self)
+        self._tick.timeout.connect(self.refresh)
+        self._tick.start(1000)
+        self.refresh()
+
+    def _on_changed(self, sid: str):
+        self.refresh()
+
+    def refresh(self):
+        current = self._current_sid()
+        sessions = self.pipeline.active()
+        self.list.blockSignals(True)
+        self.list.clear()
+        for sess in sessions:
+            mode = {"past": "과거", "future": "미래"}.get(sess.mode, sess.mode)
+            secs = int(sess.elapsed())
+            text = f"#{sess.number}  {mode}  {sess.status_text}"
+            if sess.state not in ("ready", "failed"):
+                text += f"  {int(sess.progress)}%"
+            text += f"  ({secs // 60}:{secs % 60:02d})"
+            item = QtWidgets.QListWidgetItem(text)
+            item.setData(Qt.UserRole, sess.id)
+            if sess.state == "ready":
+                item.setForeground(Qt.darkGreen)
+            elif sess.state == "failed":
+                item.setForeground(Qt.red)
+            self.list.addItem(item)
+            if sess.id == current:
+                self.list.setCurrentItem(item)
+        self.list.blockSignals(False)
+        self.summary.setText(
+            f"완료 {len(self.pipeline.ready())} / 전체 {len(sessions)}"
+            f"  · API 진행 {self.pipeline.inflight()} · 대기 {self.pipeline.queued_jobs()}"
+        )
+        self._update_buttons()
+
+    def _current_sid(self):
+        item = self.list.currentItem()
+        return item.data(Qt.UserRole) if item else None
+
+    def _update_buttons(self):
+        sess = self.pipeline.get(self._current_sid() or "")
+        self.btn_pick.setEnabled(sess is not None and sess.state == "ready")
+        self.btn_discard.setEnabled(sess is not None)
+
+    def _pick(self):
+        sess = self.pipeline.get(self._current_sid() or "")
+        if sess is None or sess.state != "ready":
+            return
+        self.session_chosen.emit(sess.id)
+        self.accept()
+
+    def _discard(self):
+        sid = self._current_sid()
+        if sid:
+            self.pipeline.discard(sid)
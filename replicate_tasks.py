@@ -1,8 +1,191 @@
-import os, base64, replicate, requests
+import os, base64
 from PyQt5.QtCore import QObject, pyqtSignal, QRunnable
 from PyQt5.QtCore import Qt, QByteArray, QBuffer, QIODevice
 from PyQt5.QtGui import QImage
 import time
+from tracing import tracer
+from metrics import replicate_inflight
+
+AGE_MODEL = "google/nano-banana"
+POSE_MODEL = "runwayml/gen4-image"
+
+PROMPT_OLD = (
+    "Transform the person in the uploaded photo into an korean adult version, around 25-30 years old Korean college freshman."
+    "Make the face look slightly more mature while keeping the same identity, gender, and hairstyle. "
+    "Add subtle adult facial proportions and natural skin texture without wrinkles. "
+    "Render as a realistic, high-quality studio portrait with soft lighting and neutral background."
+)
+
+PROMPT_YOUNG = (
+    "Transform the person into around 20 years old Korean college freshman. "
+    "Preserve the same facial identity and gender, but make the face look youthful and full of energy. "
+    "Smooth the skin naturally, remove wrinkles, and brighten the eyes for a lively and fresh appearance. "
+    "Keep a natural dark hair color with soft, healthy shine. "
+    "Give the overall feeling of a bright, friendly, first-year university student in Korea. "
+    "Render as a photorealistic, high-quality portrait under gentle daylight, with natural proportions and realistic facial texture."
+)
+
+# pick2 화면에서 손님이 채워야 하는 칸 수 → 성공한 포즈가 이보다 적으면 세션 실패
+MIN_POSES = 2
+
+POSE_PROMPTS = [
+    "@personA and @personB stand side by side, both smiling and giving a thumbs-up with one hand. Keep @personA and @personB identical to their references (no merging or replacement). Shoulder-to-shoulder, clear front view, 1:1 framing, natural light.",
+    "@personA holds smartphone above head level with the right hand for a selfie, while @personB stands close beside making a V sign with one hand. Both look toward the smartphone. Shoulder-to-shoulder, 1:1 framing. not face and hand distortion",
+    "@personA and @personB each use one hand to form a heart shape together. Shoulder-to-shoulder, 1:1 framing.",
+]
+
+
+def output_url(out):
+    """replicate.run 결과(FileOutput / [url] / url 문자열)에서 URL 하나 꺼내기"""
+    if hasattr(out, "url"):
+        return out.url
+    if isinstance(out, list) and out:
+        return output_url(out[0])
+    if isinstance(out, str) and out.startswith(("http://", "https://")):
+        return out
+    return None
+
+
+def shrink_image_bytes(png_bytes: bytes, max_side=1024, quality=85) -> bytes:
+    img = QImage.fromData(png_bytes)
+    if img.isNull():
+        return png_bytes
+    w, h = img.width(), img.height()
+    if max(w, h) > max_side:
+        if w >= h:
+            nw, nh = max_side, int(h * (max_side / w))
+        else:
+            nh, nw = max_side, int(w * (max_side / h))
+        img = img.scaled(nw, nh, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    ba = QByteArray()
+    buf = QBuffer(ba)
+    buf.open(QIODevice.WriteOnly)
+    img.save(buf, "JPG", quality)  # JPEG로 전송량 축소
+    buf.close()
+    return bytes(ba)
+
+
+def normalize_image_inputs(inputs):
+    norm = []
+    for item in inputs:
+        if isinstance(item, (bytes, bytearray)):
+            b_small = shrink_image_bytes(bytes(item), max_side=1024, quality=85)
+            norm.append("data:image/jpeg;base64," + base64.b64encode(b_small).decode())
+
+        elif isinstance(item, str) and item.startswith(
+            ("http://", "https://", "data:image/")
+        ):
+            norm.append(item)
+        else:
+            raise ValueError("지원하지 않는 타입")
+
+    return norm
+
+
+# 0보다 크면 replicate.run 처럼 동기 대기(Prefer: wait)로 예측을 만들고, 그 안에 안 끝났을 때만
+# 이 간격으로 상태를 폴링하면서 로그의 진행률("45%|...")을 replicate.progress 이벤트로 남김
+# (진행 막대/ETA 보정용). 간격은 클라이언트 poll_interval 보다 느리지 않게. 0 이면 replicate.run.
+PROGRESS_POLL_S = 0.5
+
+
+def _run_with_progress(model: str, payload: dict):
+    import replicate
+    from replicate.exceptions import ModelError
+    from replicate.helpers import transform_output
+
+    # 대부분은 여기서 끝난 상태로 돌아옴 → replicate.run 과 같은 지연, 추가 GET 없음
+    pred = replicate.models.predictions.create(model=model, input=payload, wait=True)
+    interval = min(PROGRESS_POLL_S, replicate.default_client.poll_interval)
+    last = None
+    while pred.status not in ("succeeded", "failed", "canceled"):
+        time.sleep(interval)
+        pred.reload()
+        prog = pred.progress
+        if prog is not None and prog.percentage != last:
+            last = prog.percentage
+            tracer.event("replicate.progress", model=model, pct=round(prog.percentage * 100, 1))
+    if pred.status != "succeeded":
+        raise ModelError(pred)
+    return transform_output(pred.output, replicate.default_client)
+
+
+def _run_model(model: str, payload: dict):
+    """replicate.run + 진행 중 호출 수 게이지 (/metrics)"""
+    import replicate  # 무거운 import (~80 ms) 라 첫 호출 때 (부스 시작 시간 단축)
+
+    replicate_inflight.inc(model=model)
+    try:
+        if PROGRESS_POLL_S > 0:
+            return _run_with_progress(model, payload)
+        return replicate.run(model, input=payload)
+    finally:
+        replicate_inflight.dec(model=model)
+
+
+def run_age(image_bytes: bytes, mode: str, seed: int = 42) -> str:
+    """나이 변환 1회 → 결과 URL (GUI/서비스/배치 공용, 스레드 어디서나 호출 가능)"""
+    image_input = "data:image/png;base64," + base64.b64encode(image_bytes).decode()
+    with tracer.span("age", mode=mode, model=AGE_MODEL):
+        out = _run_model(
+            AGE_MODEL,
+            {
+                "prompt": PROMPT_OLD if mode == "future" else PROMPT_YOUNG,
+                "image_input": [image_input],
+                "output_format": "jpg",
+                "seed": seed,
+            },
+        )
+    url = output_url(out)
+    if not url:
+        raise RuntimeError("Replicate output URL을 얻지 못했습니다.")
+    return url
+
+
+def _replicate_run_with_retry(payload, tries=3):
+    last = None
+    for i in range(tries):
+        try:
+            return _run_model(POSE_MODEL, payload)
+        except Exception as e:
+            if "timed out" in str(e).lower() and i < tries - 1:
+                tracer.event("replicate.retry", model=POSE_MODEL, attempt=i + 1)
+                time.sleep(0.8 * (i + 1))
+                continue
+            last = e
+            break
+    raise last
+
+
+def run_pose(
+    inputs,
+    pose_prompt: str,
+    seed: int = 42,
+    aspect_ratio: str = "1:1",
+    resolution: str = "720p",
+) -> bytes:
+    """포즈 1장 생성 → 결과 이미지 bytes"""
+    refs = normalize_image_inputs(inputs)
+    with tracer.span("pose", model=POSE_MODEL, resolution=resolution):
+        out = _replicate_run_with_retry(
+            {
+                "prompt": pose_prompt,
+                "reference_images": refs,  # 최대 3장
+                "reference_tags": ["personA", "personB"],  # refs와 같은 순서
+                "aspect_ratio": aspect_ratio,  # 예: "1:1"
+                "resolution": resolution,  # 예: "1080p"
+                "seed": seed,
+            }
+        )
+    url = output_url(out)
+    if not url:
+        raise RuntimeError("포즈 결과 URL을 얻지 못했습니다.")
+    import requests
+
+    with tracer.span("pose.download") as sp:
+        resp = requests.get(url, timeout=(5, 120))
+        resp.raise_for_status()
+        sp.attrs["bytes"] = len(resp.content)
+    return resp.content
 
 
 class WorkerSignals(QObject):
@@ -19,51 +202,18 @@ class AgeJob(QRunnable):
         self.mode = mode
         self.seed = seed
         self.token = token
+        self.session_id = None  # 트레이스용 (파이프라인이 채움)
         self.signals = WorkerSignals()
 
-        self.prompt_old = (
-            "Transform the person in the uploaded photo into an korean adult version, around 25-30 years old Korean college freshman."
-            "Make the face look slightly more mature while keeping the same identity, gender, and hairstyle. "
-            "Add subtle adult facial proportions and natural skin texture without wrinkles. "
-            "Render as a realistic, high-quality studio portrait with soft lighting and neutral background."
-        )
-
-        self.prompt_young = (
-            "Transform the person into around 20 years old Korean college freshman. "
-            "Preserve the same facial identity and gender, but make the face look youthful and full of energy. "
-            "Smooth the skin naturally, remove wrinkles, and brighten the eyes for a lively and fresh appearance. "
-            "Keep a natural dark hair color with soft, healthy shine. "
-            "Give the overall feeling of a bright, friendly, first-year university student in Korea. "
-            "Render as a photorealistic, high-quality portrait under gentle daylight, with natural proportions and realistic facial texture."
-        )
-
-    def _to_data_uri_from_bytes(self, png_bytes: bytes) -> str:
-        b64 = base64.b64encode(png_bytes).decode()
-        return "data:image/png;base64," + b64
+        self.prompt_old = PROMPT_OLD
+        self.prompt_young = PROMPT_YOUNG
 
     def run(self):
         try:
             os.environ["REPLICATE_API_TOKEN"] = self.token
-            image_input = self._to_data_uri_from_bytes(self.inputs)
-            out = replicate.run(
-                "google/nano-banana",
-                input={
-                    "prompt": (
-                        self.prompt_old if self.mode == "future" else self.prompt_young
-                    ),
-                    "image_input": [image_input],
-                    "output_format": "jpg",
-                    "seed": self.seed,
-                },
-            )
-            url = (
-                out.url
-                if hasattr(out, "url")
-                else (out[0] if isinstance(out, list) else None)
-            )
-            if not url:
-                raise RuntimeError("Replicate output URL을 얻지 못했습니다.")
-            self.signals.age_done.emit(url)  # bytes 전달
+            with tracer.bind(self.session_id):
+                url = run_age(self.inputs, self.mode, self.seed)
+            self.signals.age_done.emit(url)  # 결과 URL 전달
         except Exception as e:
             self.signals.error.emit(f"[Age {e}")
 
@@ -92,82 +242,20 @@ class PoseJob(QRunnable):
         self.token = token
         self.aspect_ratio = aspect_ratio
         self.resolution = resolution
+        self.session_id = None  # 트레이스용 (파이프라인이 채움)
         self.signals = WorkerSignals()
 
-    def _shrink_image_bytes(self, png_bytes: bytes, max_side=1024, quality=85) -> bytes:
-        img = QImage.fromData(png_bytes)
-        if img.isNull():
-            return png_bytes
-        w, h = img.width(), img.height()
-        if max(w, h) > max_side:
-            if w >= h:
-                nw, nh = max_side, int(h * (max_side / w))
-            else:
-                nh, nw = max_side, int(w * (max_side / h))
-            img = img.scaled(nw, nh, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        ba = QByteArray()
-        buf = QBuffer(ba)
-        buf.open(QIODevice.WriteOnly)
-        img.save(buf, "JPG", quality)  # JPEG로 전송량 축소
-        buf.close()
-        return bytes(ba)
-
-    def _to_data_uri_from_bytes(self, b: bytes) -> str:
-        b_small = self._shrink_image_bytes(b, max_side=1024, quality=85)
-        return "data:image/jpeg;base64," + base64.b64encode(b_small).decode()
-
-    def _replicate_run_with_retry(self, payload, tries=3):
-        last = None
-        for i in range(tries):
-            try:
-                return replicate.run("runwayml/gen4-image", input=payload)
-            except Exception as e:
-                if "timed out" in str(e).lower() and i < tries - 1:
-                    time.sleep(0.8 * (i + 1))
-                    continue
-                last = e
-                break
-        raise last
-
-    def _normalize_image_inputs(self, inputs):
-        norm = []
-        for item in inputs:
-            if isinstance(item, (bytes, bytearray)):
-                norm.append(self._to_data_uri_from_bytes(bytes(item)))
-
-            elif isinstance(item, str) and item.startswith(
-                ("http://", "https://", "data:image/")
-            ):
-                norm.append(item)
-            else:
-                raise ValueError("지원하지 않는 타입")
-
-        return norm
-
     def run(self):
         try:
             os.environ["REPLICATE_API_TOKEN"] = self.token
-            refs = self._normalize_image_inputs(self.inputs)
-
-            out = self._replicate_run_with_retry(
-                {
-                    "prompt": self.pose_prompt,
-                    "reference_images": refs,  # 최대 3장
-                    "reference_tags": ["personA", "personB"],  # refs와 같은 순서
-                    "aspect_ratio": self.aspect_ratio,  # 예: "1:1"
-                    "resolution": self.resolution,  # 예: "1080p"
-                    "seed": self.seed,
-                }
-            )
-            url = (
-                out.url
-                if hasattr(out, "url")
-                else (out[0] if isinstance(out, list) else None)
-            )
-            if not url:
-                raise RuntimeError("포즈 결과 URL을 얻지 못했습니다.")
-            resp = requests.get(url, timeout=(5, 120))
-            resp.raise_for_status()
-            self.signals.pose_done.emit(self.index, resp.content)  # bytes 전달
+            with tracer.bind(self.session_id, index=self.index):
+                data = run_pose(
+                    self.inputs,
+                    self.pose_prompt,
+                    self.seed,
+                    self.aspect_ratio,
+                    self.resolution,
+                )
+            self.signals.pose_done.emit(self.index, data)  # bytes 전달
         except Exception as e:
             self.signals.error.emit(f"[pose {self.index}] {e}")
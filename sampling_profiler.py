@@ -0,0 +1,142 @@
+"""
+현장 부스용 샘플링 프로파일러. 정해진 시간 동안 일정 간격으로 모든 스레드
+(GUI 스레드 + 스레드 풀/워커)의 스택을 sys._current_frames() 로 떠서 모음.
+결과는 flamegraph 용 collapsed stack 텍스트로 세션 저장소에 보관.
+
+    한 줄 = "page:2;session:<sid>;<스레드>;main.py:<module>;...;main.py:_draw_frame <샘플 수>"
+
+    부스: Ctrl+Shift+P (PROFILE_SECONDS 동안) 또는 setting.json PROFILE_ON_START_S
+    꺼내기: python sampling_profiler.py export sessions <세션 id> [-o out_dir]
+           flamegraph.pl out.folded > out.svg   /   speedscope 에 바로 열기
+"""
+
+import os, sys, time, argparse, threading
+from collections import Counter
+
+from tracing import tracer
+
+
+def collapse(frame, limit: int = 80) -> list:
+    """프레임 → ["main.py:<module>", ..., "main.py:_draw_frame"] (바깥 → 안쪽)"""
+    out = []
+    while frame is not None and len(out) < limit:
+        code = frame.f_code
+        out.append(f"{os.path.basename(code.co_filename)}:{code.co_name}".replace(";", ":").replace(" ", "_"))
+        frame = frame.f_back
+    out.reverse()
+    return out
+
+
+class SamplingProfiler:
+    """
+    start(seconds) → 백그라운드 스레드에서 샘플링, 끝나면 on_done(folded_text, info) 호출
+    (샘플링 스레드에서 호출됨). 한 번에 하나만 실행.
+    context: 샘플마다 부르는 fn() -> {"page", "session"} (다른 스레드에서 부르므로 위젯 접근 금지)
+    """
+
+    def __init__(self, interval_ms: float = 10, context=None, on_done=None):
+        self.interval = interval_ms / 1000
+        self.context = context
+        self.on_done = on_done
+        self._thread = None
+        self._stop = threading.Event()
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float = 30) -> bool:
+        if self.running():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(seconds,), name="sampling-profiler", daemon=True)
+        self._thread.start()
+        print(f"🔬 profiling {seconds:g}s @ {1 / self.interval:.0f} Hz")
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, seconds: float):
+        me = threading.get_ident()
+        stacks = Counter()
+        samples = 0
+        t0 = time.monotonic()
+        cpu0 = time.thread_time()
+        sessions = set()
+        while not self._stop.is_set() and time.monotonic() - t0 < seconds:
+            ctx = {}
+            if self.context is not None:
+                try:
+                    ctx = self.context() or {}
+                except Exception:
+                    pass
+            tags = [f"page:{ctx.get('page')}"]
+            if ctx.get("session"):
+                tags.append(f"session:{ctx['session']}")
+                sessions.add(ctx["session"])
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                thread = names.get(ident, "")
+                if not thread or thread.startswith("Dummy-"):
+                    thread = "qt-worker"  # QThreadPool 스레드 (ident 가 매번 달라서 하나로 묶음)
+                thread = thread.replace(";", ":").replace(" ", "_")
+                stacks[";".join(tags + [thread] + collapse(frame))] += 1
+            samples += 1
+            self._stop.wait(self.interval)
+
+        wall = time.monotonic() - t0
+        info = {
+            "seconds": round(wall, 2),
+            "samples": samples,
+            "interval_ms": self.interval * 1000,
+            "overhead_pct": round((time.thread_time() - cpu0) / max(wall, 1e-6) * 100, 2),  # 샘플링 스레드 CPU
+            "sessions": sorted(sessions),
+        }
+        text = "".join(f"{k} {v}\n" for k, v in sorted(stacks.items()))
+        tracer.event("profile.done", **{k: v for k, v in info.items() if k != "sessions"})
+        if self.on_done is not None:
+            try:
+                self.on_done(text, info)
+            except Exception as e:
+                print("[profile] save failed:", e)
+
+
+def export(store_root: str, sid: str, out_dir: str = ".") -> list:
+    """세션에 저장된 profile_* 결과를 .folded 파일로 꺼내기"""
+    from session_store import SessionStore
+
+    store = SessionStore(root=store_root)
+    m = store.manifest(sid) or {}
+    written = []
+    for kind in sorted(m.get("artifacts", {})):
+        if not kind.startswith("profile_"):
+            continue
+        data = store.get(sid, kind)
+        if data is None:
+            continue
+        path = os.path.join(out_dir, f"{sid}_{kind}.folded")
+        with open(path, "wb") as f:
+            f.write(data)
+        written.append(path)
+    return written
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="부스 프로파일 결과 꺼내기")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ep = sub.add_parser("export", help="세션의 collapsed stack 을 .folded 파일로")
+    ep.add_argument("store", help="세션 저장소 폴더 (SESSION_DIR)")
+    ep.add_argument("sid")
+    ep.add_argument("-o", "--out", default=".")
+    args = ap.parse_args(argv)
+
+    paths = export(args.store, args.sid, args.out)
+    for p in paths:
+        print(p)
+    return 0 if paths else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import os, queue, sqlite3, threading
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    mode TEXT,
+    frame INTEGER,
+    share_url TEXT,
+    composite_sha TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions(created DESC);
+CREATE TABLE IF NOT EXISTS artifacts (
+    session_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    ext TEXT,
+    size INTEGER,
+    PRIMARY KEY (session_id, kind)
+);
+"""
+
+
+def _row_from_manifest(m: dict):
+    meta = m.get("meta", {})
+    arts = m.get("artifacts", {})
+    comp = arts.get("composite", {}).get("sha")
+    session = (m["id"], m.get("created", 0), m.get("mode", ""), meta.get("frame"), meta.get("share_url"), comp)
+    artifacts = [(m["id"], k, a["sha"], a.get("ext"), a.get("size")) for k, a in arts.items()]
+    return session, artifacts
+
+
+class SessionIndex:
+    """
+    세션 검색용 SQLite 인덱스 (시간/모드/프레임/결과물 해시/공유 URL).
+    쓰기는 전용 스레드의 연결 하나로만 (SessionStore 리스너 → 큐), 읽기는 호출 스레드 연결.
+    WAL 모드라 쓰는 중에도 조회가 막히지 않음.
+    """
+
+    def __init__(self, db_path: str = "sessions/index.sqlite3"):
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        con = sqlite3.connect(self.db_path)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.executescript(_SCHEMA)
+        con.close()
+
+        self._q = queue.Queue()
+        self._read = threading.local()
+        self._thread = threading.Thread(target=self._writer, name="session-index", daemon=True)
+        self._thread.start()
+
+    # --- 쓰기 (비동기) ---
+    def on_manifest(self, sid: str, manifest: dict):
+        """SessionStore.add_listener 용. manifest는 writer 스레드가 계속 고치므로 여기서 값만 떠감"""
+        if manifest is None:
+            self._q.put(("delete", sid))
+        else:
+            self._q.put(("upsert", _row_from_manifest(manifest)))
+
+    def remove(self, sid: str):
+        self._q.put(("delete", sid))
+
+    def rebuild(self, store):
+        """인덱스가 비어 있거나 어긋났을 때 store의 manifest들로 다시 채움 (백그라운드)"""
+        self._q.put(("rebuild", store))
+
+    def flush(self, timeout: float = 10.0):
+        done = threading.Event()
+        self._q.put(("barrier", done))
+        done.wait(timeout)
+
+    def _writer(self):
+        con = sqlite3.connect(self.db_path)
+        con.execute("PRAGMA synchronous=NORMAL")
+        while True:
+            op, arg = self._q.get()
+            try:
+                if op == "upsert":
+                    self._upsert(con, *arg)
+                elif op == "delete":
+                    con.execute("DELETE FROM sessions WHERE id=?", (arg,))
+                    con.execute("DELETE FROM artifacts WHERE session_id=?", (arg,))
+                elif op == "rebuild":
+                    live = set(arg.sessions())
+                    for (sid,) in con.execute("SELECT id FROM sessions").fetchall():
+                        if sid not in live:
+                            con.execute("DELETE FROM sessions WHERE id=?", (sid,))
+                            con.execute("DELETE FROM artifacts WHERE session_id=?", (sid,))
+                    for sid in live:
+                        m = arg.manifest(sid)
+                        if m:
+                            self._upsert(con, *_row_from_manifest(m))
+                elif op == "barrier":
+                    arg.set()
+                    continue
+                con.commit()
+            except Exception as e:
+                print("[index] write failed:", e)
+
+    @staticmethod
+    def _upsert(con, session, artifacts):
+        con.execute(
+            "INSERT INTO sessions(id, created, mode, frame, share_url, composite_sha) VALUES (?,?,?,?,?,?) "
+            "ON CONFLICT(id) DO UPDATE SET mode=excluded.mode, frame=excluded.frame, "
+            "share_url=excluded.share_url, composite_sha=excluded.composite_sha",
+            session,
+        )
+        con.executemany(
+            "INSERT OR REPLACE INTO artifacts(session_id, kind, sha, ext, size) VALUES (?,?,?,?,?)",
+            artifacts,
+        )
+
+    # --- 읽기 ---
+    def _con(self):
+        con = getattr(self._read, "con", None)
+        if con is None:
+            con = self._read.con = sqlite3.connect(self.db_path)
+            con.row_factory = sqlite3.Row
+        return con
+
+    def count(self) -> int:
+        return self._con().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def search(self, text: str = "", mode: str = None, printable_only: bool = True, limit: int = 200):
+        """
+        text: 세션 id 일부, 날짜("2026-10-19", "10-19 14:"), 공유 URL 일부 중 아무거나.
+        최신순 dict 목록.
+        """
+        where, args = [], []
+        text = (text or "").strip()
+        if text:
+            digits = text.replace("-", "").replace(":", "").replace(" ", "")
+            where.append("(id LIKE ? OR REPLACE(id, '-', '') LIKE ? OR share_url LIKE ?)")
+            args += [f"%{text}%", f"%{digits}%", f"%{text}%"]
+        if mode:
+            where.append("mode=?")
+            args.append(mode)
+        if printable_only:
+            where.append("composite_sha IS NOT NULL")
+        sql = "SELECT * FROM sessions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created DESC LIMIT ?"
+        args.append(limit)
+        return [dict(r) for r in self._con().execute(sql, args).fetchall()]
+
+    def artifacts(self, sid: str) -> dict:
+        rows = self._con().execute(
+            "SELECT kind, sha, ext, size FROM artifacts WHERE session_id=?", (sid,)
+        ).fetchall()
+        return {r["kind"]: dict(r) for r in rows}
@@ -0,0 +1,287 @@
+import os, gzip, json, time, queue, shutil, hashlib, secrets, threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt5.QtGui import QImage
+
+# 이미 압축된 포맷은 gzip 해도 거의 안 줄어듦
+_COMPRESSIBLE = {"png", "bmp", "json", "txt", "folded"}
+
+
+def guess_ext(data: bytes) -> str:
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return "bin"
+
+
+class SessionStore:
+    """
+    세션별 결과물 저장소.
+    root/blobs/ab/<sha256>[.gz]  : 내용 주소 저장 (같은 내용은 한 번만)
+    root/<session_id>/manifest.json : {mode, created, meta, artifacts{kind: {sha, ext, size}}}
+    모든 쓰기는 전용 writer 스레드에서 순서대로 처리 → GUI 스레드는 큐에 넣고 바로 리턴.
+    보관 한도(용량/기간)는 세션 단위로 오래된 것부터 정리.
+    정리는 전체 세션/blob 을 훑으므로 retention_interval 초에 한 번만 (0 = 요청마다).
+    """
+
+    def __init__(
+        self,
+        root: str = "sessions",
+        max_bytes: int = 5 * 1024**3,
+        max_age_days: float = 30,
+        compress: bool = False,
+        retention_interval: float = 600,
+    ):
+        self.root = os.path.abspath(root)
+        self.blob_dir = os.path.join(self.root, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.compress = compress
+        self.retention_interval = retention_interval
+        self._last_retention = None  # 첫 요청은 바로 실행
+
+        self._manifests = {}  # {session_id: dict} (이번 실행에서 만든/연 세션)
+        self._lock = threading.Lock()
+        self._q = queue.Queue()
+        self._fetch = ThreadPoolExecutor(max_workers=2)  # URL 결과 다운로드용
+        self._listeners = []  # 세션 manifest가 저장될 때 호출 (session_id, manifest)
+        self._thread = threading.Thread(target=self._writer, name="session-writer", daemon=True)
+        self._thread.start()
+
+    # --- 세션 ---
+    def new_session(self, mode: str = "") -> str:
+        sid = time.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(3)
+        manifest = {"id": sid, "mode": mode, "created": time.time(), "meta": {}, "artifacts": {}}
+        with self._lock:
+            self._manifests[sid] = manifest
+        self._q.put(("manifest", sid))
+        return sid
+
+    def add_listener(self, fn):
+        """
+        manifest가 디스크에 쓰일 때마다 writer 스레드에서 fn(session_id, manifest) 호출.
+        보관 기간/용량 정리로 세션이 지워지면 manifest=None 으로 호출.
+        """
+        self._listeners.append(fn)
+
+    # --- 쓰기 (모두 비동기) ---
+    def put(self, sid: str, kind: str, data: bytes, ext: str = None):
+        if sid and data:
+            self._q.put(("blob", sid, kind, bytes(data), ext or guess_ext(data)))
+
+    def put_image(self, sid: str, kind: str, image: QImage, fmt: str = "PNG", quality: int = -1):
+        """QImage 인코딩까지 writer 스레드에서 (QImage는 스레드 간 공유 가능)"""
+        if sid and image is not None and not image.isNull():
+            self._q.put(("image", sid, kind, QImage(image), fmt, quality))
+
+    def put_url(self, sid: str, kind: str, url: str, timeout=(5, 30)):
+        """원격 결과(예: Replicate 출력 URL)를 백그라운드로 받아서 저장"""
+        if not sid or not isinstance(url, str) or not url.startswith("http"):
+            return
+
+        def fetch():
+            import requests
+
+            try:
+                r = requests.get(url, timeout=timeout)
+                r.raise_for_status()
+                self.put(sid, kind, r.content)
+            except Exception as e:
+                print(f"[session] {kind} 다운로드 실패:", e)
+
+        self._fetch.submit(fetch)
+
+    def set_meta(self, sid: str, **meta):
+        if sid:
+            self._q.put(("meta", sid, meta))
+
+    def flush(self, timeout: float = 10.0):
+        """지금까지 넣은 쓰기가 끝날 때까지 대기 (종료 직전/테스트용)"""
+        done = threading.Event()
+        self._q.put(("barrier", done))
+        done.wait(timeout)
+
+    def enforce_retention(self, force: bool = False):
+        """보관 정리 예약. 마지막 정리 후 retention_interval 이 안 지났으면 건너뜀 (force 면 바로)"""
+        now = time.monotonic()
+        if (
+            not force
+            and self._last_retention is not None
+            and now - self._last_retention < self.retention_interval
+        ):
+            return
+        self._last_retention = now
+        self._q.put(("retention",))
+
+    # --- 읽기 ---
+    def manifest(self, sid: str):
+        with self._lock:
+            m = self._manifests.get(sid)
+        if m is not None:
+            return m
+        path = os.path.join(self.root, sid, "manifest.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, sid: str, kind: str):
+        m = self.manifest(sid)
+        art = (m or {}).get("artifacts", {}).get(kind)
+        if not art:
+            return None
+        return self.read_blob(art["sha"])
+
+    def read_blob(self, sha: str):
+        path = self._blob_path(sha)
+        for p, gz in ((path, False), (path + ".gz", True)):
+            if os.path.exists(p):
+                with open(p, "rb") as f:
+                    data = f.read()
+                return gzip.decompress(data) if gz else data
+        return None
+
+    def sessions(self):
+        return sorted(
+            d
+            for d in os.listdir(self.root)
+            if d != "blobs" and os.path.exists(os.path.join(self.root, d, "manifest.json"))
+        )
+
+    # --- writer 스레드 ---
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.blob_dir, sha[:2], sha)
+
+    def _writer(self):
+        while True:
+            task = self._q.get()
+            try:
+                op = task[0]
+                if op == "blob":
+                    _, sid, kind, data, ext = task
+                    self._write_artifact(sid, kind, data, ext)
+                elif op == "image":
+                    _, sid, kind, image, fmt, quality = task
+                    ba = QByteArray()
+                    buf = QBuffer(ba)
+                    buf.open(QIODevice.WriteOnly)
+                    image.save(buf, fmt, quality)
+                    buf.close()
+                    self._write_artifact(sid, kind, bytes(ba), fmt.lower().replace("jpeg", "jpg"))
+                elif op == "meta":
+                    _, sid, meta = task
+                    m = self.manifest(sid)
+                    if m is not None:
+                        m.setdefault("meta", {}).update(meta)
+                        self._save_manifest(sid, m)
+                elif op == "manifest":
+                    self._save_manifest(task[1], self.manifest(task[1]))
+                elif op == "retention":
+                    self._retention()
+                elif op == "barrier":
+                    task[1].set()
+            except Exception as e:
+                print("[session] write failed:", e)
+
+    def _write_artifact(self, sid: str, kind: str, data: bytes, ext: str):
+        sha = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(sha)
+        if not (os.path.exists(path) or os.path.exists(path + ".gz")):  # 중복 제거
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            payload, target = data, path
+            if self.compress and ext in _COMPRESSIBLE:
+                payload, target = gzip.compress(data, 6), path + ".gz"
+            tmp = target + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, target)
+
+        m = self.manifest(sid)
+        if m is None:
+            return
+        m.setdefault("artifacts", {})[kind] = {"sha": sha, "ext": ext, "size": len(data)}
+        self._save_manifest(sid, m)
+
+    def _save_manifest(self, sid: str, m: dict):
+        if m is None:
+            return
+        d = os.path.join(self.root, sid)
+        os.makedirs(d, exist_ok=True)
+        tmp = os.path.join(d, "manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(m, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, os.path.join(d, "manifest.json"))
+        for fn in self._listeners:
+            try:
+                fn(sid, m)
+            except Exception as e:
+                print("[session] listener failed:", e)
+
+    def _retention(self):
+        now = time.time()
+        entries = []
+        for sid in self.sessions():
+            m = self.manifest(sid) or {}
+            entries.append((m.get("created", 0), sid, m))
+        entries.sort()
+
+        # 1) 기간 초과 세션 삭제
+        keep = []
+        for created, sid, m in entries:
+            if now - created > self.max_age:
+                self._drop_session(sid)
+            else:
+                keep.append((created, sid, m))
+
+        # 2) 남은 blob 용량이 한도를 넘으면 오래된 세션부터 삭제
+        #    (blob 별 참조 수를 세어 두고 지운 세션 몫만 빼서 합계 갱신)
+        def shas(m):
+            return {a["sha"] for a in m.get("artifacts", {}).values()}
+
+        sizes = self._blob_sizes()
+        refs = Counter(s for _, _, m in keep for s in shas(m))
+        total = sum(sizes.get(s, 0) for s in refs)
+        while keep and total > self.max_bytes:
+            _, sid, m = keep.pop(0)
+            self._drop_session(sid)
+            for s in shas(m):
+                refs[s] -= 1
+                if refs[s] == 0:
+                    del refs[s]
+                    total -= sizes.get(s, 0)
+        live = set(refs)
+
+        # 3) 어떤 세션도 참조하지 않는 blob 제거
+        for sha, _ in sizes.items():
+            if sha not in live:
+                for p in (self._blob_path(sha), self._blob_path(sha) + ".gz"):
+                    if os.path.exists(p):
+                        os.remove(p)
+
+    def _blob_sizes(self) -> dict:
+        out = {}
+        for sub in os.listdir(self.blob_dir):
+            d = os.path.join(self.blob_dir, sub)
+            if not os.path.isdir(d):
+                continue
+            for name in os.listdir(d):
+                if name.endswith(".tmp"):
+                    continue
+                out[name[:64]] = os.path.getsize(os.path.join(d, name))
+        return out
+
+    def _drop_session(self, sid: str):
+        with self._lock:
+            self._manifests.pop(sid, None)
+        shutil.rmtree(os.path.join(self.root, sid), ignore_errors=True)
+        for fn in self._listeners:
+            try:
+                fn(sid, None)
+            except Exception as e:
+                print("[session] listener failed:", e)
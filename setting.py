@@ -1,22 +1,121 @@
 import json
 import os
 import sys
+import threading
+
+DEFAULTS = {
+    "REPLICATE_API_TOKEN": "",
+    "CAMERA_PORT": 0,
+    "CAMERA_SOURCE": "",  # "" = 카메라, "file:<동영상/폴더/녹화본>", "synthetic:1280x720@30~5"
+    "CAMERA_RECORD_DIR": "",  # 지정하면 촬영 페이지 프레임 + 타이밍 녹화 (재생 테스트용)
+    "SHARE_MODE": "0x0",  # "0x0" = 외부 업로드, "lan" = 내장 공유 서버
+    "SHARE_PORT": 8765,
+    "SHARE_PUBLIC_HOST": "",  # 비우면 LAN IP 자동
+    "SHARE_DIR": "share",  # 내장 서버 blob/토큰 폴더 (상대 경로는 앱 폴더 기준)
+    "SHARE_MIRROR": False,  # lan 모드에서 0x0.st에도 백그라운드 복제
+    "PRINT_BACKEND": "printer",  # "printer" / "pdf" / "file" (프린터 없이 테스트)
+    "PRINTER_NAME": "Canon SELPHY CP1300",
+    "PRINT_COPIES": 1,
+    "PRINT_LAYOUT": "full",  # "full" / "half" / "quarter" / "strip"
+    "PRINT_PAPER": "postcard",  # postcard(100×148) / L / KG / A6 / A4
+    "SESSION_DIR": "sessions",  # 세션 결과물 보관 폴더
+    "SESSION_MAX_MB": 5120,  # 보관 용량 한도 (넘으면 오래된 세션부터 삭제)
+    "SESSION_MAX_DAYS": 30,  # 보관 기간
+    "SESSION_COMPRESS": False,  # PNG 등 비압축 포맷 gzip 저장
+    "SESSION_RETENTION_S": 600,  # 보관 정리(전체 세션/blob 훑기) 최소 간격
+    "PIPELINE_MODE": "single",  # "queue" 면 접수 후 다음 손님 바로 촬영 (대기열 화면)
+    "AI_MAX_INFLIGHT": 3,  # 모든 손님 통틀어 동시에 돌리는 Replicate 작업 수
+    "AI_SERVICE_URL": "",  # 파이프라인 서비스 주소 (비우면 부스에서 직접 Replicate 호출)
+    "TRACE_ENABLED": True,  # 단계별 트레이스 기록 (logs/trace.jsonl)
+    "TRACE_PATH": "logs/trace.jsonl",
+    "METRICS_ENABLED": True,  # Prometheus 텍스트 메트릭 (http://<부스>:9108/metrics)
+    "METRICS_HOST": "0.0.0.0",
+    "METRICS_PORT": 9108,
+    "STALL_WATCHDOG": True,  # GUI 멈춤 감시 (멈춘 위치 스택을 트레이스에 기록)
+    "STALL_THRESHOLD_MS": 250,
+    "PROFILE_SECONDS": 30,  # Ctrl+Shift+P 샘플링 프로파일 길이
+    "PROFILE_INTERVAL_MS": 10,
+    "PROFILE_ON_START_S": 0,  # 0보다 크면 실행 직후 N초 프로파일
+    "ETA_MODEL_PATH": "logs/latency_model.json",  # AI 단계별 소요 시간 기록 (진행 막대/남은 시간 예측)
+    "REPLICATE_PROGRESS_POLL_S": 0.5,  # 동기 대기 안에 안 끝난 예측의 진행률 폴링 간격 (0 = 진행률 없이 끝날 때까지 대기)
+    "POSE_PROMPTS": [],  # 비우면 기본 포즈 (replicate_tasks.POSE_PROMPTS), 문자열 2~3개 목록이면 그걸로
+    "FRAME_CATALOG_PATH": "frame_catalog.json",  # 프레임 목록 (파일을 고치면 바로 반영)
+    "CONFIG_POLL_S": 1.0,  # setting.json 변경 확인 간격 (0 = 실행 중 변경 감지 안 함)
+}
+
+# 기본값과 타입이 다른 키 (카메라 포트는 번호 또는 장치 경로)
+TYPES = {"CAMERA_PORT": (int, str)}
+
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off", "")
+
+
+def write_bytes_atomic(path: str, data: bytes):
+    """임시 파일에 다 쓴 뒤 rename → 쓰는 도중 꺼져도 반쯤 쓰인 파일이 남지 않음"""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as outfile:
+        outfile.write(data)
+        outfile.flush()
+        os.fsync(outfile.fileno())
+    os.replace(tmp, path)
+
+
+def write_json_atomic(path: str, data):
+    """setting.json 형식 (BOM 포함 UTF-8, 들여쓰기 4) 으로 원자적 저장"""
+    write_bytes_atomic(path, json.dumps(data, indent=4, ensure_ascii=False).encode("UTF-8-sig"))
+
+
+def _convert(t, value):
+    if t is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in _TRUE + _FALSE:
+            return value.strip().lower() in _TRUE
+        raise ValueError("not a bool")
+    if t is int:
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError("not an int")
+        return int(value)
+    if t is float:
+        if isinstance(value, bool):
+            raise ValueError("not a number")
+        return float(value)
+    if t is str:
+        if isinstance(value, (dict, list)) or value is None:
+            raise ValueError("not a string")
+        return str(value)
+    if t is list:
+        if not isinstance(value, list):
+            raise ValueError("not a list")
+        return list(value)
+    return value
+
+
+def coerce(key: str, value):
+    """DEFAULTS 의 타입으로 맞춤 (모르는 키는 그대로). 안 맞으면 경고 후 기본값"""
+    if key not in DEFAULTS:
+        return value
+    types = TYPES.get(key) or (type(DEFAULTS[key]),)
+    for t in types:
+        try:
+            return _convert(t, value)
+        except (TypeError, ValueError):
+            continue
+    print(f"⚠️ [config] {key}={value!r}: {'/'.join(t.__name__ for t in types)} 이 아님 → 기본값 {DEFAULTS[key]!r}")
+    return DEFAULTS[key]
 
 
 class FileController:
     def __init__(self) -> None:
-        self.path = self.resource_path("setting.json")
+        # LIFEPHOTO_SETTINGS 로 다른 설정 파일 지정 가능 (soak/벤치마크가 부스 설정을 건드리지 않도록)
+        self.path = os.environ.get("LIFEPHOTO_SETTINGS") or self.resource_path("setting.json")
         self.init_json()
 
     def init_json(self):
-        json_string = {
-            "REPLICATE_API_TOKEN": "",
-            "CAMERA_PORT": 0,
-        }
-
         if not os.path.isfile(self.path):
-            with open(self.path, "w", encoding="UTF-8-sig") as outfile:
-                json.dump(json_string, outfile, indent=4, ensure_ascii=False)
+            write_json_atomic(self.path, DEFAULTS)
 
     def resource_path(self, relative_path):
         base_path = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
@@ -25,35 +124,166 @@ class FileController:
     def revise_str_json(self, key, value):
         data = self.load_json()
         data[key] = value
-        with open(self.path, "w", encoding="UTF-8-sig") as outfile:
-            json.dump(data, outfile, indent=4, ensure_ascii=False)
+        write_json_atomic(self.path, data)
 
     def add_dict_json(self, key, value_key, val):
         data = self.load_json()
         data[key][value_key] = val
-        with open(self.path, "w", encoding="UTF-8-sig") as outfile:
-            json.dump(data, outfile, indent=4, ensure_ascii=False)
+        write_json_atomic(self.path, data)
 
     def remove_dict_json(self, current_name):
         data = self.load_json()
         del data["camera_list"][current_name]
-        with open(self.path, "w", encoding="UTF-8-sig") as outfile:
-            json.dump(data, outfile, indent=4, ensure_ascii=False)
+        write_json_atomic(self.path, data)
 
     def revise_key_dict_json(self, dict_key, current_name, new_name):
         data = self.load_json()
         data[dict_key][new_name] = data[dict_key].pop(current_name)
-        with open(self.path, "w", encoding="UTF-8-sig") as outfile:
-            json.dump(data, outfile, indent=4, ensure_ascii=False)
+        write_json_atomic(self.path, data)
 
     def revise_val_dict_json(self, dict_key, val_key, value):
         data = self.load_json()
         data[dict_key][val_key] = value
-        with open(self.path, "w", encoding="UTF-8-sig") as outfile:
-            json.dump(data, outfile, indent=4, ensure_ascii=False)
+        write_json_atomic(self.path, data)
 
     def load_json(self):
         data = None
         with open(self.path, "r", encoding="UTF-8-sig") as f:
             data = json.load(f)
         return data
+
+
+def _file_sig(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Config:
+    """
+    setting.json 캐시 + 실행 중 변경 반영.
+    값은 DEFAULTS 타입으로 맞춰서 메모리에 들고 있고 (파일에 없는 키는 기본값),
+    check() 가 파일 mtime/크기가 바뀐 것을 보면 다시 읽어서 바뀐 키만 구독자에게 알림.
+    GUI 에서는 QTimer 로 check() 를 부름 → 구독자는 GUI 스레드에서 실행.
+    (QFileSystemWatcher 는 rename 저장 후 감시가 끊기는 편집기/OS 가 있어서 stat 폴링)
+    편집 중 JSON 이 깨져 있으면 이전 값을 유지하고 다음 저장을 기다림.
+    """
+
+    def __init__(self, path: str = ""):
+        self.path = path or FileController().path  # 없으면 기본값으로 생성
+        self._lock = threading.RLock()
+        self._values = {}
+        self._sig = None
+        self._subs = []  # [(키 집합, callback(changed: dict))]
+        self._files = {}  # {경로: [sig, callback()]} 함께 감시할 다른 파일
+        self.reload(notify=False)
+
+    # --- 읽기 ---
+    def get(self, key: str, default=None):
+        with self._lock:
+            return self._values.get(key, default)
+
+    def __getitem__(self, key: str):
+        with self._lock:
+            return self._values[key]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+    def _read(self):
+        with open(self.path, "r", encoding="UTF-8-sig") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("top level is not an object")
+        return data
+
+    def reload(self, notify: bool = True) -> dict:
+        """파일을 다시 읽어서 바뀐 키 {키: 새 값} (읽기 실패 시 {} 이고 이전 값 유지)"""
+        with self._lock:
+            self._sig = _file_sig(self.path)  # 읽는 도중 또 바뀌면 다음 check() 에서 다시 읽음
+            try:
+                raw = self._read()
+            except Exception as e:
+                print(f"⚠️ [config] {self.path} 읽기 실패 (이전 값 유지): {e}")
+                return {}
+            values = {k: coerce(k, raw.get(k, v)) for k, v in DEFAULTS.items()}
+            values.update({k: v for k, v in raw.items() if k not in DEFAULTS})
+            changed = {k: v for k, v in values.items() if self._values.get(k) != v or k not in self._values}
+            first = not self._values
+            self._values = values
+        if notify and not first and changed:
+            self._notify(changed)
+        return changed
+
+    # --- 쓰기 ---
+    def update(self, **values) -> dict:
+        """키 여러 개를 한 번에 저장 (파일의 다른 키/모르는 키는 그대로 보존) → 바뀐 키"""
+        with self._lock:
+            try:
+                raw = self._read()
+            except FileNotFoundError:
+                raw = dict(DEFAULTS)
+            except ValueError:
+                raw = dict(self._values)  # 깨진 파일은 마지막으로 읽은 값으로 덮어씀
+            for k, v in values.items():
+                raw[k] = coerce(k, v)
+            write_json_atomic(self.path, raw)
+        return self.reload()
+
+    def set(self, key: str, value) -> dict:
+        return self.update(**{key: value})
+
+    # --- 변경 감지 ---
+    def subscribe(self, keys, callback):
+        """keys 중 하나라도 바뀌면 callback({바뀐 키: 새 값})"""
+        keys = frozenset([keys] if isinstance(keys, str) else keys)
+        with self._lock:
+            self._subs.append((keys, callback))
+        return callback
+
+    def watch_file(self, path: str, callback):
+        """setting.json 외 파일(프레임 카탈로그 등)도 같은 check() 에서 감시 → 바뀌면 callback()"""
+        with self._lock:
+            self._files[path] = [_file_sig(path), callback]
+
+    def unwatch_file(self, path: str):
+        with self._lock:
+            self._files.pop(path, None)
+
+    def check(self) -> dict:
+        """바뀐 게 있으면 다시 읽고 알림 (stat 만 하므로 자주 불러도 가벼움)"""
+        with self._lock:
+            files = [(p, w) for p, w in self._files.items()]
+        for path, watch in files:
+            sig = _file_sig(path)
+            if sig != watch[0]:
+                watch[0] = sig
+                try:
+                    watch[1]()
+                except Exception as e:
+                    print(f"[config] {path} 반영 실패: {e}")
+        if _file_sig(self.path) == self._sig:
+            return {}
+        return self.reload()
+
+    def _notify(self, changed: dict):
+        with self._lock:
+            subs = list(self._subs)
+        handled = set()
+        for keys, callback in subs:
+            part = {k: v for k, v in changed.items() if k in keys}
+            if not part:
+                continue
+            handled.update(part)
+            try:
+                callback(part)
+            except Exception as e:
+                print(f"[config] {', '.join(part)} 반영 실패: {e}")
+        for k in changed:
+            if k in handled:
+                print(f"⚙️ {k} 변경 → 바로 적용")
+            else:
+                print(f"⚙️ {k} 변경 → 다시 시작하면 적용")
@@ -0,0 +1,287 @@
+import os, re, json, time, socket, hashlib, secrets, threading
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from setting import write_json_atomic
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def lan_ip() -> str:
+    """외부로 나가는 인터페이스의 LAN/핫스팟 IP (UDP connect는 패킷을 보내지 않음)"""
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.connect(("10.255.255.255", 1))
+        return s.getsockname()[0]
+    except OSError:
+        return "127.0.0.1"
+    finally:
+        s.close()
+
+
+class _ShareHandler(BaseHTTPRequestHandler):
+    server_version = "LifePhotoShare/1.0"
+    _RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+    def log_message(self, fmt, *args):
+        pass  # 부스 콘솔이 접속 로그로 덮이지 않도록
+
+    def do_HEAD(self):
+        self._serve(head_only=True)
+
+    def do_GET(self):
+        self._serve(head_only=False)
+
+    def _serve(self, head_only: bool):
+        share = self.server.share
+        # 동시 전송 수 제한 → 넘치면 바로 503 (부스 업링크/디스크 보호)
+        if not share._slots.acquire(blocking=False):
+            self.send_response(503)
+            self.send_header("Retry-After", "2")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            self._serve_file(share, head_only)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            share._slots.release()
+
+    def _serve_file(self, share, head_only: bool):
+        m = re.match(r"^/s/([A-Za-z0-9_\-]+)(?:/[^/]*)?$", self.path.split("?", 1)[0])
+        rec = share.lookup(m.group(1)) if m else None
+        if rec is None:
+            self.send_error(404)
+            return
+        if rec["expires"] <= time.time():
+            self.send_error(410)  # 만료된 링크
+            return
+
+        path = share.blob_path(rec["sha"])
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            self.send_error(404)
+            return
+
+        etag = '"%s"' % rec["sha"]
+        max_age = max(0, int(rec["expires"] - time.time()))
+        common = [
+            ("ETag", etag),
+            ("Last-Modified", formatdate(rec["created"], usegmt=True)),
+            ("Cache-Control", f"public, max-age={max_age}, immutable"),
+            ("Accept-Ranges", "bytes"),
+            ("Content-Type", rec["content_type"]),
+            (
+                "Content-Disposition",
+                "inline; filename*=UTF-8''" + quote(rec["filename"]),
+            ),
+        ]
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            for k, v in common:
+                self.send_header(k, v)
+            self.end_headers()
+            return
+
+        start, end = 0, size - 1
+        status = 200
+        rng = self.headers.get("Range")
+        if rng and self.headers.get("If-Range", etag) == etag:
+            mr = self._RANGE_RE.match(rng.strip())
+            if mr is None or (not mr.group(1) and not mr.group(2)):
+                status = 416
+            else:
+                if mr.group(1):
+                    start = int(mr.group(1))
+                    end = int(mr.group(2)) if mr.group(2) else size - 1
+                else:  # bytes=-N (마지막 N바이트)
+                    start = max(0, size - int(mr.group(2)))
+                end = min(end, size - 1)
+                status = 206 if start <= end and start < size else 416
+
+        if status == 416:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        length = end - start + 1
+        self.send_response(status)
+        for k, v in common:
+            self.send_header(k, v)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+        if head_only:
+            return
+
+        with open(path, "rb") as f:
+            f.seek(start)
+            left = length
+            while left > 0:
+                chunk = f.read(min(64 * 1024, left))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                left -= len(chunk)
+
+
+class ShareServer:
+    """
+    부스 로컬 저장소의 이미지를 LAN/핫스팟으로 바로 내려주는 내장 HTTP 서버.
+    publish() → 만료 토큰 URL 반환 (QR에 그대로 넣음). 외부 업로드 없이 공유 가능.
+    mirror(bytes, filename) -> url 콜백이 있으면 백그라운드로 외부 호스트에도 복제.
+    토큰 표는 blob 옆 tokens.json 에 저장 → 재시작해도 이미 나간 QR 링크가 TTL 까지 유효.
+    상대 경로 root_dir 는 실행 위치(CWD)가 아니라 앱 폴더 기준.
+    """
+
+    def __init__(
+        self,
+        root_dir: str = "share",
+        host: str = "0.0.0.0",
+        port: int = 8765,
+        public_host: str = "",
+        token_ttl: int = 24 * 3600,
+        max_concurrent: int = 8,
+        mirror=None,
+    ):
+        self.root_dir = os.path.join(APP_DIR, root_dir)  # 절대 경로면 그대로
+        os.makedirs(self.root_dir, exist_ok=True)
+        self.host = host
+        self.port = port
+        self.public_host = public_host
+        self.token_ttl = token_ttl
+        self.mirror = mirror
+
+        self._tokens_path = os.path.join(self.root_dir, "tokens.json")
+        self._lock = threading.Lock()
+        # {token: {sha, filename, content_type, created, expires, mirror_url}}
+        self._tokens = self._load_tokens()
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._mirror_pool = ThreadPoolExecutor(max_workers=1) if mirror else None
+        self._httpd = None
+        self._thread = None
+
+    # --- 서버 수명 ---
+    def start(self):
+        if self._httpd is not None:
+            return
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _ShareHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.share = self
+        self.port = self._httpd.server_address[1]  # port=0 이면 실제 할당된 포트
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="share-server", daemon=True
+        )
+        self._thread.start()
+        print(f"🌐 share server → {self.base_url()}")
+
+    def stop(self):
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
+        if self._mirror_pool:
+            self._mirror_pool.shutdown(wait=False)
+
+    def base_url(self) -> str:
+        return f"http://{self.public_host or lan_ip()}:{self.port}"
+
+    # --- 저장소/토큰 ---
+    def blob_path(self, sha: str) -> str:
+        return os.path.join(self.root_dir, sha)
+
+    def _load_tokens(self) -> dict:
+        try:
+            with open(self._tokens_path, encoding="UTF-8-sig") as f:
+                tokens = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print("[share] tokens.json 읽기 실패:", e)
+            return {}
+        now = time.time()
+        return {t: r for t, r in tokens.items() if r.get("expires", 0) > now}
+
+    def _save_tokens(self):
+        """self._lock 잡은 상태에서 호출"""
+        try:
+            write_json_atomic(self._tokens_path, self._tokens)
+        except OSError as e:
+            print("[share] tokens.json 저장 실패:", e)
+
+    def lookup(self, token: str):
+        with self._lock:
+            return self._tokens.get(token)
+
+    def publish(
+        self, data: bytes, filename: str, content_type: str = "image/jpeg"
+    ) -> str:
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(sha)
+        if not os.path.exists(path):
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        else:
+            os.utime(path)  # 다시 공유된 blob 은 mtime 기준 정리에서도 새것으로
+
+        token = secrets.token_urlsafe(12)
+        now = time.time()
+        with self._lock:
+            self._tokens[token] = {
+                "sha": sha,
+                "filename": filename,
+                "content_type": content_type,
+                "created": now,
+                "expires": now + self.token_ttl,
+                "mirror_url": None,
+            }
+        self._purge_expired()  # 토큰 표 저장 포함
+
+        if self._mirror_pool:
+            self._mirror_pool.submit(self._mirror_one, token, data, filename)
+        return f"{self.base_url()}/s/{token}/{quote(filename)}"
+
+    def mirror_url(self, token: str):
+        rec = self.lookup(token)
+        return rec["mirror_url"] if rec else None
+
+    def _mirror_one(self, token: str, data: bytes, filename: str):
+        try:
+            url = self.mirror(data, filename)
+            with self._lock:
+                if token in self._tokens:
+                    self._tokens[token]["mirror_url"] = url
+                    self._save_tokens()
+            print(f"[share] mirrored {token} → {url}")
+        except Exception as e:
+            print(f"[share] mirror failed ({token}):", e)
+
+    def _purge_expired(self):
+        """만료 토큰 정리 후, 살아있는 토큰이 없고 TTL 보다 오래된 blob 만 삭제
+        (tokens.json 이 없어졌어도 TTL 안의 파일은 지우지 않음)"""
+        now = time.time()
+        with self._lock:
+            for t in [t for t, r in self._tokens.items() if r["expires"] <= now]:
+                del self._tokens[t]
+            live = {r["sha"] for r in self._tokens.values()}
+            self._save_tokens()
+        for name in os.listdir(self.root_dir):
+            if len(name) != 64 or name in live:
+                continue
+            path = os.path.join(self.root_dir, name)
+            try:
+                if os.path.getmtime(path) <= now - self.token_ttl:
+                    os.remove(path)
+            except OSError:
+                pass
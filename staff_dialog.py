@@ -0,0 +1,146 @@
+import time
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QImage, QPixmap
+
+
+class StaffDialog(QtWidgets.QDialog):
+    """
+    스태프용 지난 세션 찾기/재인쇄 화면.
+    SessionIndex로 검색하고, 합성본은 SessionStore에서 바로 읽어서 스풀러로 보냄
+    (AgeJob/PoseJob 다시 돌리지 않음).
+    """
+
+    def __init__(self, index, store, spooler, qr=None, layout=None, copies=1, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("지난 세션 찾기 / 재인쇄")
+        self.index = index
+        self.store = store
+        self.spooler = spooler
+        self.qr = qr
+        self.layout_ = layout
+        self._rows = []
+        self._image = QImage()
+
+        self.search_edit = QtWidgets.QLineEdit()
+        self.search_edit.setPlaceholderText("세션 ID / 날짜(2026-10-19 14:) / 공유 URL")
+        self.mode_combo = QtWidgets.QComboBox()
+        self.mode_combo.addItem("전체", None)
+        self.mode_combo.addItem("과거", "past")
+        self.mode_combo.addItem("미래", "future")
+
+        self.table = QtWidgets.QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["시간", "모드", "프레임", "공유 URL"])
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+
+        self.preview = QtWidgets.QLabel("세션을 선택하세요")
+        self.preview.setAlignment(Qt.AlignCenter)
+        self.preview.setFixedSize(300, 444)
+        self.qr_label = QtWidgets.QLabel()
+        self.qr_label.setAlignment(Qt.AlignCenter)
+        self.qr_label.setFixedSize(160, 160)
+
+        self.copies_spin = QtWidgets.QSpinBox()
+        self.copies_spin.setRange(1, 20)
+        self.copies_spin.setValue(max(1, copies))
+        self.btn_print = QtWidgets.QPushButton("재인쇄")
+        self.btn_print.setEnabled(False)
+        self.status_label = QtWidgets.QLabel()
+        btn_close = QtWidgets.QPushButton("닫기")
+
+        top = QtWidgets.QHBoxLayout()
+        top.addWidget(self.search_edit, 1)
+        top.addWidget(self.mode_combo)
+        side = QtWidgets.QVBoxLayout()
+        side.addWidget(self.preview)
+        side.addWidget(self.qr_label, 0, Qt.AlignHCenter)
+        side.addStretch(1)
+        mid = QtWidgets.QHBoxLayout()
+        mid.addWidget(self.table, 1)
+        mid.addLayout(side)
+        bottom = QtWidgets.QHBoxLayout()
+        bottom.addWidget(self.status_label, 1)
+        bottom.addWidget(QtWidgets.QLabel("매수"))
+        bottom.addWidget(self.copies_spin)
+        bottom.addWidget(self.btn_print)
+        bottom.addWidget(btn_close)
+        root = QtWidgets.QVBoxLayout(self)
+        root.addLayout(top)
+        root.addLayout(mid, 1)
+        root.addLayout(bottom)
+        self.resize(1000, 640)
+
+        # 타이핑이 멈추면 검색 (한 글자마다 쿼리하지 않음)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self.refresh)
+        self.search_edit.textChanged.connect(lambda _: self._search_timer.start())
+        self.mode_combo.currentIndexChanged.connect(lambda _: self.refresh())
+        self.table.itemSelectionChanged.connect(self._on_select)
+        self.btn_print.clicked.connect(self._reprint)
+        btn_close.clicked.connect(self.reject)
+
+        self.refresh()
+
+    def refresh(self):
+        t0 = time.perf_counter()
+        self._rows = self.index.search(self.search_edit.text(), self.mode_combo.currentData())
+        self.table.setRowCount(len(self._rows))
+        for r, row in enumerate(self._rows):
+            cells = [
+                time.strftime("%m-%d %H:%M:%S", time.localtime(row["created"])),
+                {"past": "과거", "future": "미래"}.get(row["mode"], row["mode"] or ""),
+                "" if row["frame"] is None else str(row["frame"] + 1),
+                row["share_url"] or "",
+            ]
+            for c, text in enumerate(cells):
+                self.table.setItem(r, c, QtWidgets.QTableWidgetItem(text))
+        self.table.resizeColumnsToContents()
+        ms = (time.perf_counter() - t0) * 1000
+        self.status_label.setText(f"{len(self._rows)}건 ({ms:.1f} ms)")
+        self._on_select()
+
+    def _current(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self._rows[rows[0].row()]
+
+    def _on_select(self):
+        row = self._current()
+        self._image = QImage()
+        self.qr_label.clear()
+        if row is None:
+            self.preview.setText("세션을 선택하세요")
+            self.btn_print.setEnabled(False)
+            return
+
+        data = self.store.read_blob(row["composite_sha"]) if row["composite_sha"] else None
+        if data:
+            self._image = QImage.fromData(data)
+        if self._image.isNull():
+            self.preview.setText("합성 이미지가 없습니다")
+        else:
+            self.preview.setPixmap(
+                QPixmap.fromImage(
+                    self._image.scaled(self.preview.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                )
+            )
+        if self.qr is not None and row["share_url"]:
+            self.qr_label.setPixmap(QPixmap.fromImage(self.qr.make_qr_image(row["share_url"], 160)))
+            self.qr_label.setToolTip(row["share_url"])
+        self.btn_print.setEnabled(not self._image.isNull())
+
+    def _reprint(self):
+        row = self._current()
+        if row is None or self._image.isNull():
+            return
+        job = self.spooler.submit(
+            self._image, copies=self.copies_spin.value(), layout=self.layout_, session_id=row["id"]
+        )
+        self.status_label.setText(f"재인쇄 요청: {row['id']} (작업 {job.id})")
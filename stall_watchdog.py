@@ -0,0 +1,124 @@
+"""
+GUI 이벤트 루프 멈춤 감시.
+
+GUI 스레드의 QTimer 가 주기적으로 심장박동을 남기고, 감시 스레드가 박동이 끊긴 시간을 잼.
+한도를 넘으면 그 순간의 메인 스레드 스택(sys._current_frames)과 페이지 번호를 트레이스에
+바로 기록하고(루프가 끝내 안 돌아와도 남도록), 루프가 돌아오면 멈춘 시간을 span 으로 기록.
+
+    trace: event "gui.stall"           {page, stack, waited_ms}  — 감지 시점
+           span  "gui.stall"           {page, stack}             — 회복 시점 (ms = 멈춘 시간)
+           event "gui.stall_histogram" {buckets: {"<=250": n, ...}}
+"""
+
+import os, sys, time, threading, traceback
+from PyQt5.QtCore import QObject, QTimer
+
+from tracing import tracer
+
+STALL_BUCKETS_MS = (250, 500, 1000, 2000, 5000, 10000)
+
+
+def format_stack(frame, limit: int = 40):
+    """프레임 → ["main.py:961 _show_progress", ...] (바깥 → 안쪽)"""
+    out = []
+    for fs in traceback.extract_stack(frame, limit=limit):
+        out.append(f"{os.path.basename(fs.filename)}:{fs.lineno} {fs.name}")
+    return out
+
+
+class StallWatchdog(QObject):
+    def __init__(self, threshold_ms: int = 250, beat_ms: int = 50, context=None, parent=None):
+        """
+        context: GUI 스레드에서 박동마다 부르는 fn() -> dict (예: {"page": 2, "session": sid}).
+        감시 스레드에서 위젯을 건드리지 않도록 값만 받아 둠.
+        """
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.beat = beat_ms / 1000
+        self.context = context
+        self._main_ident = threading.main_thread().ident
+        self._last_beat = time.monotonic()
+        self._ctx = {}
+        self._stall = None  # 감지된 멈춤 {"stack", "ctx"}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.histogram = {b: 0 for b in STALL_BUCKETS_MS}
+        self.histogram[None] = 0  # 가장 큰 구간 초과
+        self.stalls = 0
+        self.worst_ms = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(beat_ms)
+        self._timer.timeout.connect(self._on_beat)
+        self._thread = threading.Thread(target=self._watch, name="gui-watchdog", daemon=True)
+
+    def start(self):
+        self._last_beat = time.monotonic()
+        self._timer.start()
+        if not self._thread.is_alive():
+            self._thread.start()
+        print(f"🐶 GUI watchdog (threshold {self.threshold * 1000:.0f} ms)")
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+
+    # --- GUI 스레드 ---
+    def _on_beat(self):
+        now = time.monotonic()
+        if self.context is not None:
+            try:
+                self._ctx = dict(self.context())
+            except Exception:
+                pass
+        with self._lock:
+            gap = now - self._last_beat
+            self._last_beat = now
+            stall, self._stall = self._stall, None
+        blocked = gap - self.beat
+        if blocked < self.threshold:
+            return
+        ms = blocked * 1000
+        self.stalls += 1
+        self.worst_ms = max(self.worst_ms, ms)
+        for b in STALL_BUCKETS_MS:
+            if ms <= b:
+                self.histogram[b] += 1
+                break
+        else:
+            self.histogram[None] += 1
+
+        info = stall or {"stack": [], "ctx": self._ctx}
+        tracer.record(
+            "gui.stall",
+            now - blocked,
+            blocked,
+            session=info["ctx"].get("session"),
+            page=info["ctx"].get("page"),
+            stack=info["stack"],
+        )
+        tracer.event("gui.stall_histogram", buckets=self.histogram_dict(), stalls=self.stalls)
+
+    def histogram_dict(self) -> dict:
+        return {(f"<={b}" if b is not None else f">{STALL_BUCKETS_MS[-1]}"): n for b, n in self.histogram.items()}
+
+    # --- 감시 스레드 ---
+    def _watch(self):
+        poll = min(self.threshold / 2, 0.05)
+        while not self._stop.wait(poll):
+            with self._lock:
+                waited = time.monotonic() - self._last_beat - self.beat
+                if waited < self.threshold or self._stall is not None:
+                    continue
+                frame = sys._current_frames().get(self._main_ident)
+                stack = format_stack(frame) if frame is not None else []
+                ctx = dict(self._ctx)
+                self._stall = {"stack": stack, "ctx": ctx}
+            tracer.event(
+                "gui.stall",
+                session=ctx.get("session"),
+                page=ctx.get("page"),
+                waited_ms=round(waited * 1000, 1),
+                stack=stack,
+            )
+            print(f"⚠️ GUI stalled >{waited * 1000:.0f} ms on page {ctx.get('page')}: {stack[-1] if stack else '?'}")
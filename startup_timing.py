@@ -0,0 +1,83 @@
+"""
+부스 시작 시간 측정 (첫 화면이 실제로 그려질 때까지).
+main.py 가 가장 먼저 import 해서 기준 시각을 잡고, 구간마다 mark() → 첫 페인트에서 report().
+
+    ⏱️ startup 402 ms (process 655 ms) → imports 170 | qapplication 25 | settings 1 | ...
+
+각 구간은 startup.<이름> span 으로 트레이스에도 남음 (python tracing.py report).
+process: 프로세스 생성부터 (인터프리터 시작/PyInstaller 모듈 로드 포함, 알 수 있는 OS 에서만).
+onefile 빌드의 압축 해제는 부트로더 프로세스에서 먼저 일어나서 여기에는 포함되지 않음.
+"""
+
+import os, sys, time
+
+
+def process_age_ms():
+    """프로세스 생성 → 지금 (ms), 알 수 없으면 None"""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/stat") as f:
+                start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+            with open("/proc/uptime") as f:
+                uptime = float(f.read().split()[0])
+            return (uptime - start_ticks / os.sysconf("SC_CLK_TCK")) * 1000
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            ft = [wintypes.FILETIME() for _ in range(4)]
+            k32 = ctypes.windll.kernel32
+            if not k32.GetProcessTimes(k32.GetCurrentProcess(), *[ctypes.byref(x) for x in ft]):
+                return None
+            now = wintypes.FILETIME()
+            k32.GetSystemTimeAsFileTime(ctypes.byref(now))
+
+            def val(x):
+                return (x.dwHighDateTime << 32) | x.dwLowDateTime
+
+            return (val(now) - val(ft[0])) / 10_000  # 100 ns 단위
+    except Exception:
+        pass
+    return None
+
+
+class StartupTimer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.before_ms = process_age_ms()  # main.py 시작 전까지 걸린 시간
+        self._last = self.t0
+        self.phases = []  # [(이름, 시작 perf_counter, ms)]
+        self.reported = False
+
+    def mark(self, name: str):
+        """직전 mark 이후 지금까지를 name 구간으로"""
+        now = time.perf_counter()
+        self.phases.append((name, self._last, (now - self._last) * 1000))
+        self._last = now
+
+    def total_ms(self) -> float:
+        return (self._last - self.t0) * 1000
+
+    def report(self, tracer=None) -> dict:
+        """한 번만 출력 + 트레이스 기록. {"total_ms", "process_ms", "phases": {이름: ms}}"""
+        out = {
+            "total_ms": round(self.total_ms(), 1),
+            "process_ms": None if self.before_ms is None else round(self.before_ms + self.total_ms(), 1),
+            "phases": {name: round(ms, 1) for name, _, ms in self.phases},
+        }
+        if self.reported:
+            return out
+        self.reported = True
+        parts = " | ".join(f"{name} {ms:.0f}" for name, _, ms in self.phases)
+        proc = "" if out["process_ms"] is None else f" (process {out['process_ms']:.0f} ms)"
+        print(f"⏱️ startup {out['total_ms']:.0f} ms{proc} → {parts}")
+        if tracer is not None:
+            # perf_counter 기준 → tracer 의 monotonic 기준으로 옮겨서 기록
+            shift = time.monotonic() - time.perf_counter()
+            for name, start, ms in self.phases:
+                tracer.record(f"startup.{name}", start + shift, ms / 1000)
+            tracer.event("startup", **{k: v for k, v in out.items() if k != "phases"})
+        return out
+
+
+timer = StartupTimer()
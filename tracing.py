@@ -0,0 +1,256 @@
+"""
+세션 단계별 트레이스 (JSONL). 기록은 큐에 넣기만 하고 파일 쓰기는 전용 스레드에서.
+
+    from tracing import tracer
+    with tracer.span("compose", session=sid, frame=idx):
+        ...
+    with tracer.bind(sid, index=i):      # 워커 스레드: 이 안의 span 에 세션/속성 자동 부착
+        run_pose(...)
+
+한 줄 = {"kind": "span"|"event", "name", "sid", "t"(epoch), "mono", "ms", "thread", ...속성}
+
+통계:
+    python tracing.py report logs/trace.jsonl [--since 24] [--json]
+"""
+
+import os, sys, json, time, queue, argparse, threading
+from contextlib import contextmanager
+
+
+class Span:
+    __slots__ = ("tracer", "name", "session", "attrs", "t", "mono", "ended")
+
+    def __init__(self, tracer, name: str, session, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.session = session
+        self.attrs = attrs
+        self.t = time.time()
+        self.mono = time.monotonic()
+        self.ended = False
+
+    def end(self, **attrs):
+        """비동기 단계용 (시작/끝 스레드가 달라도 됨). 두 번 호출해도 한 번만 기록"""
+        if self.ended:
+            return
+        self.ended = True
+        self.attrs.update(attrs)
+        self.tracer._emit("span", self.name, self.session, self.t, self.mono, time.monotonic() - self.mono, self.attrs)
+
+
+class Tracer:
+    def __init__(self, path: str = "logs/trace.jsonl", enabled: bool = True, max_bytes: int = 20 * 1024 * 1024):
+        self.path = os.path.abspath(path)
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._q = queue.Queue(maxsize=20000)
+        self._ctx = threading.local()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._listeners = []  # 기록마다 호출 (rec dict), 메트릭 집계 등
+
+    def configure(self, path: str = None, enabled: bool = None):
+        if path:
+            self.path = os.path.abspath(path)
+        if enabled is not None:
+            self.enabled = enabled
+
+    def add_listener(self, fn):
+        """기록 직전 호출 스레드에서 fn(rec) (가볍게 유지할 것)"""
+        self._listeners.append(fn)
+
+    # --- 세션 문맥 (스레드별) ---
+    @contextmanager
+    def bind(self, session=None, **attrs):
+        prev = getattr(self._ctx, "v", None)
+        base = dict(prev[1]) if prev else {}
+        base.update(attrs)
+        self._ctx.v = (session if session is not None else (prev[0] if prev else None), base)
+        try:
+            yield
+        finally:
+            self._ctx.v = prev
+
+    def current_session(self):
+        v = getattr(self._ctx, "v", None)
+        return v[0] if v else None
+
+    # --- 기록 ---
+    def start(self, name: str, session=None, **attrs) -> Span:
+        v = getattr(self._ctx, "v", None)
+        if v:
+            attrs = {**v[1], **attrs}
+            if session is None:
+                session = v[0]
+        return Span(self, name, session, attrs)
+
+    @contextmanager
+    def span(self, name: str, session=None, **attrs):
+        sp = self.start(name, session, **attrs)
+        try:
+            yield sp
+        except BaseException as e:
+            sp.attrs["error"] = type(e).__name__
+            raise
+        finally:
+            sp.end()
+
+    def record(self, name: str, mono_start: float, seconds: float, session=None, **attrs):
+        """이미 잰 구간을 나중에 기록 (예: 세션 id 가 생기기 전에 끝난 단계)"""
+        t = time.time() - (time.monotonic() - mono_start)
+        self._emit("span", name, session, t, mono_start, seconds, attrs)
+
+    def event(self, name: str, session=None, **attrs):
+        v = getattr(self._ctx, "v", None)
+        if v:
+            attrs = {**v[1], **attrs}
+            if session is None:
+                session = v[0]
+        self._emit("event", name, session, time.time(), time.monotonic(), None, attrs)
+
+    def _emit(self, kind, name, session, t, mono, seconds, attrs):
+        if not self.enabled and not self._listeners:
+            return
+        rec = {
+            "kind": kind,
+            "name": name,
+            "sid": session,
+            "t": round(t, 3),
+            "mono": round(mono, 4),
+            "ms": None if seconds is None else round(seconds * 1000, 2),
+            "thread": threading.current_thread().name,
+        }
+        if attrs:
+            rec.update(attrs)
+        for fn in self._listeners:
+            try:
+                fn(rec)
+            except Exception:
+                pass
+        if not self.enabled:
+            return
+        self._ensure_writer()
+        try:
+            self._q.put_nowait(rec)
+        except queue.Full:
+            self.dropped += 1  # GUI 스레드를 절대 막지 않음
+
+    # --- writer 스레드 ---
+    def _ensure_writer(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._writer, name="trace-writer", daemon=True)
+                    self._thread.start()
+
+    def flush(self, timeout: float = 5.0):
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._q.put(done)
+        done.wait(timeout)
+
+    def _writer(self):
+        while True:
+            batch = [self._q.get()]
+            while True:  # 쌓인 만큼 한 번에 쓰기
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            barriers = []
+            for rec in batch:
+                if isinstance(rec, threading.Event):
+                    barriers.append(rec)
+                else:
+                    lines.append(json.dumps(rec, ensure_ascii=False, default=str))
+            if lines:
+                try:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                        os.replace(self.path, self.path + ".1")  # 한 세대만 보관
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+                except OSError as e:
+                    print("[trace] write failed:", e)
+            for ev in barriers:
+                ev.set()
+
+
+tracer = Tracer()
+
+
+# --- 리포트 ---
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    v = sorted(values)
+    k = (len(v) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(v) - 1)
+    return v[lo] + (v[hi] - v[lo]) * (k - lo)
+
+
+def load_records(paths, since_hours: float = 0):
+    cutoff = time.time() - since_hours * 3600 if since_hours else 0
+    for path in paths:
+        try:
+            f = open(path, "r", encoding="utf-8")
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # 기록 중 잘린 줄
+                if rec.get("t", 0) >= cutoff:
+                    yield rec
+
+
+def report(records) -> dict:
+    """단계(span 이름)별 count / p50 / p95 / p99 / max (ms) + 세션 수"""
+    by_stage = {}
+    sessions = set()
+    for rec in records:
+        if rec.get("kind") != "span" or rec.get("ms") is None:
+            continue
+        by_stage.setdefault(rec["name"], []).append(rec["ms"])
+        if rec.get("sid"):
+            sessions.add(rec["sid"])
+    out = {}
+    for name, ms in sorted(by_stage.items()):
+        out[name] = {
+            "count": len(ms),
+            "p50": round(percentile(ms, 0.50), 1),
+            "p95": round(percentile(ms, 0.95), 1),
+            "p99": round(percentile(ms, 0.99), 1),
+            "max": round(max(ms), 1),
+        }
+    return {"sessions": len(sessions), "stages": out}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="트레이스 로그 분석")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rp = sub.add_parser("report", help="단계별 p50/p95/p99")
+    rp.add_argument("paths", nargs="*", default=["logs/trace.jsonl.1", "logs/trace.jsonl"])
+    rp.add_argument("--since", type=float, default=0, help="최근 N시간만")
+    rp.add_argument("--json", action="store_true")
+    args = ap.parse_args(argv)
+
+    r = report(load_records(args.paths, args.since))
+    if args.json:
+        print(json.dumps(r, ensure_ascii=False, indent=1))
+        return 0
+    print(f"sessions: {r['sessions']}")
+    print(f"{'stage':<24}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for name, s in r["stages"].items():
+        print(f"{name:<24}{s['count']:>7}{s['p50']:>10}{s['p95']:>10}{s['p99']:>10}{s['max']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
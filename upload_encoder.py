@@ -0,0 +1,136 @@
+import hashlib, threading
+from collections import OrderedDict
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt5.QtGui import QImage, QImageWriter
+
+
+def encode_image(img: QImage, fmt: str, quality: int) -> bytes:
+    qba = QByteArray()
+    buf = QBuffer(qba)
+    buf.open(QIODevice.WriteOnly)
+    img.save(buf, fmt, quality)
+    buf.close()
+    return bytes(qba)
+
+
+def content_key(img: QImage) -> str:
+    """픽셀 내용 기준 해시 (같은 합성 결과면 같은 키)"""
+    ptr = img.constBits()
+    ptr.setsize(img.sizeInBytes())
+    h = hashlib.sha256(bytes(ptr))
+    h.update(f"{img.width()}x{img.height()}:{int(img.format())}".encode())
+    return h.hexdigest()
+
+
+class AdaptiveEncoder:
+    """
+    업로드용 인코더. 목표 바이트 수 안에서 가장 높은 품질을 이진 탐색으로 찾고
+    (try_webp 이고 Qt가 WebP를 지원하면 JPEG/WebP 중 더 높은 품질이 나오는 쪽),
+    같은 내용이면 찾은 설정을 재사용.
+    목표 바이트는 측정된 업링크 속도 × 허용 업로드 시간으로 계산.
+    """
+
+    MIN_Q, MAX_Q = 40, 92
+    # 업로드 전 다운스케일 단계 (긴 변 px). 품질이 너무 낮게 나오면 한 단계 내리고,
+    # 예산이 넉넉해서 높게 나오면 한 단계 올림
+    SIDE_LADDER = (720, 900, 1080, 1440)
+    LOW_Q, HIGH_Q = 60, 85
+
+    def __init__(
+        self,
+        target_seconds: float = 2.0,
+        min_bytes: int = 120 * 1024,
+        max_bytes: int = 1536 * 1024,
+        default_bps: float = 4e6,
+        try_webp: bool = False,
+        max_cached: int = 64,
+    ):
+        self.target_seconds = target_seconds
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.bandwidth_bps = default_bps  # EWMA (bit/s)
+        supported = {bytes(f).decode().lower() for f in QImageWriter.supportedImageFormats()}
+        self.formats = ["JPG"] + (["WEBP"] if try_webp and "webp" in supported else [])
+        self._settings = OrderedDict()  # {content_key: (fmt, quality)}
+        self._max_cached = max_cached
+        self._side_idx = self.SIDE_LADDER.index(1080)
+        self._lock = threading.Lock()
+
+    # --- 대역폭 ---
+    def record_throughput(self, nbytes: int, seconds: float, alpha: float = 0.3):
+        if nbytes <= 0 or seconds <= 0:
+            return
+        bps = nbytes * 8 / seconds
+        with self._lock:
+            self.bandwidth_bps = (1 - alpha) * self.bandwidth_bps + alpha * bps
+
+    def recommend_max_side(self) -> int:
+        return self.SIDE_LADDER[self._side_idx]
+
+    def _adapt_side(self, quality: int):
+        with self._lock:
+            if quality < self.LOW_Q and self._side_idx > 0:
+                self._side_idx -= 1
+            elif quality >= self.HIGH_Q and self._side_idx < len(self.SIDE_LADDER) - 1:
+                self._side_idx += 1
+
+    def target_bytes(self) -> int:
+        want = int(self.bandwidth_bps / 8 * self.target_seconds)
+        return max(self.min_bytes, min(self.max_bytes, want))
+
+    # --- 인코딩 ---
+    def encode(self, img: QImage, target_bytes: int = None):
+        """return: (bytes, fmt, quality)"""
+        target = target_bytes or self.target_bytes()
+        # 대역폭 추정이 조금씩 흔들려도 같은 설정을 재사용하도록 64KB 단위로 내림
+        target = max(self.min_bytes, target - target % (64 * 1024))
+        key = content_key(img) + f":{target}"
+        with self._lock:
+            cached = self._settings.get(key)
+            if cached:
+                self._settings.move_to_end(key)
+        if cached:
+            fmt, q = cached
+            return encode_image(img, fmt, q), fmt, q
+
+        best = None  # (quality, -size, data, fmt)
+        for fmt in self.formats:
+            data, q = self._search_quality(img, fmt, target)
+            cand = (q, -len(data), data, fmt)
+            if best is None or cand[:2] > best[:2]:
+                best = cand
+        q, _, data, fmt = best
+
+        with self._lock:
+            self._settings[key] = (fmt, q)
+            while len(self._settings) > self._max_cached:
+                self._settings.popitem(last=False)
+        self._adapt_side(q)
+        return data, fmt, q
+
+    def _search_quality(self, img: QImage, fmt: str, target: int):
+        """target 이하가 되는 가장 높은 quality (없으면 MIN_Q 결과)"""
+        lo, hi = self.MIN_Q, self.MAX_Q
+        best_q, best = None, None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            data = encode_image(img, fmt, mid)
+            if len(data) <= target:
+                best_q, best = mid, data
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        if best is None:
+            best_q = self.MIN_Q
+            best = encode_image(img, fmt, best_q)
+        return best, best_q
+
+
+def ext_and_mime(fmt: str):
+    f = fmt.upper()
+    if f == "WEBP":
+        return "webp", "image/webp"
+    if f in ("JPG", "JPEG"):
+        return "jpg", "image/jpeg"
+    return f.lower(), f"image/{f.lower()}"
+
@@ -0,0 +1,134 @@
+import os, time, random, secrets
+
+
+class UploadCancelled(Exception):
+    """is_cancelled 콜백으로 중단된 업로드"""
+
+
+class _MultipartStream:
+    """
+    multipart/form-data 본문을 한 번에 만들지 않고 read() 할 때마다 조각으로 내보냄.
+    __len__ 이 있어서 requests가 Content-Length를 붙이고 chunked 전송을 하지 않음.
+    """
+
+    def __init__(self, file_bytes: bytes, filename: str, field: str, on_read=None):
+        self.boundary = "----lifephoto" + secrets.token_hex(12)
+        # urllib3/requests와 같은 HTML5 방식 (UTF-8 그대로, 따옴표/개행만 이스케이프)
+        safe_name = (
+            filename.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+        )
+        head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; '
+            f'filename="{safe_name}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8")
+        tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+        self._parts = [memoryview(head), memoryview(file_bytes), memoryview(tail)]
+        self._total = len(head) + len(file_bytes) + len(tail)
+        self._part = 0
+        self._off = 0
+        self.sent = 0
+        self.on_read = on_read
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self._total
+
+    def read(self, n: int = -1) -> bytes:
+        if n is None or n < 0:
+            n = self._total - self.sent
+        out = []
+        while n > 0 and self._part < len(self._parts):
+            mv = self._parts[self._part]
+            take = min(n, len(mv) - self._off)
+            out.append(mv[self._off : self._off + take])
+            self._off += take
+            n -= take
+            if self._off >= len(mv):
+                self._part += 1
+                self._off = 0
+        chunk = b"".join(out)
+        self.sent += len(chunk)
+        if self.on_read and chunk:
+            self.on_read(self.sent, self._total)
+        return chunk
+
+
+class StreamingUploader:
+    """
+    0x0.st 호환 업로더. 본문을 조각으로 보내며 progress(sent, total) 콜백,
+    전송 완료마다 처리량을 on_sample(nbytes, seconds) 로 알림 (인코더 대역폭 추정).
+    재시도는 지수 백오프 + 지터, 대기 중에도 is_cancelled 확인.
+    """
+
+    def __init__(
+        self,
+        session,
+        url: str = "https://0x0.st",
+        expect_prefix: str = "https://0x0.st/",
+        tries: int = 3,
+        timeout=(5, 40),
+        on_sample=None,
+    ):
+        self.session = session
+        self.url = os.environ.get("LIFEPHOTO_UPLOAD_URL", url)
+        self.expect_prefix = expect_prefix
+        self.tries = tries
+        self.timeout = timeout
+        self.on_sample = on_sample  # (nbytes, seconds) → 예: 인코더 대역폭 갱신
+
+    def upload(self, file_bytes: bytes, filename: str, progress=None, is_cancelled=None) -> str:
+        import requests  # 세션은 호출 쪽(QRCODE)이 만들어 둠, 여기서는 예외 타입만
+
+        last_err = None
+        for attempt in range(self.tries):
+            if is_cancelled and is_cancelled():
+                raise UploadCancelled()
+
+            t_first = []
+
+            def on_read(sent, total):
+                if not t_first:
+                    t_first.append(time.monotonic())
+                if is_cancelled and is_cancelled():
+                    raise UploadCancelled()
+                if progress:
+                    progress(sent, total)
+
+            body = _MultipartStream(file_bytes, filename, "file", on_read)
+            try:
+                r = self.session.post(
+                    self.url,
+                    data=body,
+                    timeout=self.timeout,
+                    headers={
+                        "User-Agent": "qr-uploader/1.0",
+                        "Content-Type": body.content_type,
+                    },
+                )
+                elapsed = time.monotonic() - (t_first[0] if t_first else time.monotonic())
+                r.raise_for_status()
+                if self.on_sample:
+                    self.on_sample(len(body), elapsed)
+                url = r.text.strip()
+                if url.startswith(self.expect_prefix):
+                    return url
+                raise RuntimeError(f"upload failed: {r.status_code} {r.text[:200]!r}")
+            except requests.exceptions.RequestException as e:
+                last_err = e
+                if attempt < self.tries - 1:  # 마지막 시도 뒤에는 기다리지 않고 바로 실패
+                    self._backoff(attempt, is_cancelled)
+        raise last_err if last_err else RuntimeError("upload unknown error")
+
+    @staticmethod
+    def _backoff(attempt: int, is_cancelled=None):
+        delay = min(8.0, 0.5 * (2**attempt)) * random.uniform(0.7, 1.3)
+        end = time.monotonic() + delay
+        while time.monotonic() < end:
+            if is_cancelled and is_cancelled():
+                raise UploadCancelled()
+            time.sleep(0.05)